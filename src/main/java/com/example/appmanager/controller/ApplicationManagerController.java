@@ -2,27 +2,22 @@ package com.example.appmanager.controller;
 
 import com.example.appmanager.model.ApplicationFile;
 import com.example.appmanager.repository.ApplicationFileRepository;
-import com.example.appmanager.service.DuplicateDetectorService;
-import com.example.appmanager.service.FileScannerService;
-import com.example.appmanager.service.RuleCategorizationService;
+import com.example.appmanager.service.DuplicateReportCache;
+import com.example.appmanager.service.ScanJob;
+import com.example.appmanager.service.ScanJobService;
 import org.springframework.beans.factory.annotation.Autowired;
 import org.springframework.stereotype.Controller;
 import org.springframework.ui.Model;
 import org.springframework.web.bind.annotation.*;
 
-import java.io.File;
-import java.io.IOException;
-import java.security.NoSuchAlgorithmException;
 import java.util.*;
 
 @Controller
 public class ApplicationManagerController {
     @Autowired
-    private FileScannerService fileScannerService;
+    private ScanJobService scanJobService;
     @Autowired
-    private DuplicateDetectorService duplicateDetectorService;
-    @Autowired
-    private RuleCategorizationService ruleCategorizationService;
+    private DuplicateReportCache duplicateReportCache;
     @Autowired
     private ApplicationFileRepository applicationFileRepository;
 
@@ -31,88 +26,44 @@ public class ApplicationManagerController {
         return "index";
     }
 
+    // Starts a background scan and sends the browser to its progress page
     @PostMapping("/scan")
     public String scanDirectory(@RequestParam("directory") String directory, 
                                @RequestParam(value = "enableCategorization", required = false) Boolean enableCategorization,
-                               @RequestParam(value = "categories", required = false) List<String> categories,
-                               Model model) {
-        try {
-            List<ApplicationFile> files = fileScannerService.scanDirectory(directory);
-            
-            // Apply categorization if enabled
-            if (enableCategorization != null && enableCategorization && categories != null && !categories.isEmpty()) {
-                categorizeAndOrganizeFiles(files, directory, categories);
-            }
-            
-            ruleCategorizationService.categorize(files);
-            applicationFileRepository.deleteAll();
-            applicationFileRepository.saveAll(files);
-            model.addAttribute("files", files);
-            model.addAttribute("categorizationEnabled", enableCategorization);
-            model.addAttribute("selectedCategories", categories);
-            return "scan-result";
-        } catch (IOException | NoSuchAlgorithmException e) {
-            model.addAttribute("error", e.getMessage());
-            return "index";
-        }
+                               @RequestParam(value = "categories", required = false) List<String> categories) {
+        ScanJob job = scanJobService.submit(directory, Boolean.TRUE.equals(enableCategorization), categories);
+        return "redirect:/scan-jobs/" + job.getId();
     }
 
-    private void categorizeAndOrganizeFiles(List<ApplicationFile> files, String baseDirectory, List<String> categories) {
-        // Define file extensions for each category
-        Map<String, List<String>> categoryExtensions = new HashMap<>();
-        categoryExtensions.put("photos", Arrays.asList("jpg", "jpeg", "png", "gif", "bmp", "tiff", "webp"));
-        categoryExtensions.put("documents", Arrays.asList("doc", "docx", "pdf", "txt", "rtf", "odt", "pages"));
-        categoryExtensions.put("videos", Arrays.asList("mp4", "avi", "mov", "mkv", "wmv", "flv", "webm"));
-        categoryExtensions.put("music", Arrays.asList("mp3", "wav", "flac", "aac", "ogg", "wma"));
-        categoryExtensions.put("archives", Arrays.asList("zip", "rar", "7z", "tar", "gz", "bz2"));
-        categoryExtensions.put("applications", Arrays.asList("exe", "msi", "apk", "jar", "dmg", "deb", "rpm"));
-
-        // Create category folders and move files
-        for (String category : categories) {
-            if (categoryExtensions.containsKey(category)) {
-                String categoryFolder = baseDirectory + File.separator + category;
-                File folder = new File(categoryFolder);
-                if (!folder.exists()) {
-                    folder.mkdirs();
-                }
-
-                List<String> extensions = categoryExtensions.get(category);
-                for (ApplicationFile file : files) {
-                    String fileExtension = getFileExtension(file.getName()).toLowerCase();
-                    if (extensions.contains(fileExtension)) {
-                        try {
-                            File sourceFile = new File(file.getPath());
-                            File destFile = new File(categoryFolder + File.separator + file.getName());
-                            
-                            // Only move if file exists and destination doesn't exist
-                            if (sourceFile.exists() && !destFile.exists()) {
-                                java.nio.file.Files.move(sourceFile.toPath(), destFile.toPath());
-                                // Update the file path in our model
-                                file.setPath(destFile.getAbsolutePath());
-                            }
-                        } catch (Exception e) {
-                            // Log error but continue with other files
-                            System.err.println("Error moving file " + file.getName() + ": " + e.getMessage());
-                        }
-                    }
-                }
-            }
+    // Progress while the job runs (the page polls the scan job API), results once it has completed
+    @GetMapping("/scan-jobs/{id}")
+    public String showScanJob(@PathVariable("id") String id, Model model) {
+        ScanJob job = scanJobService.get(id);
+        if (job == null) {
+            model.addAttribute("error", "Unknown scan job " + id);
+            return "index";
+        }
+        switch (job.getStatus()) {
+            case COMPLETED:
+                // Only the totals are rendered; the file table loads its rows page by page from /api/files
+                model.addAttribute("fileCount", applicationFileRepository.countByScanJobIsNull());
+                model.addAttribute("categorizedCount", applicationFileRepository.countByScanJobIsNullAndCategoryIsNotNull());
+                model.addAttribute("totalSize", applicationFileRepository.totalSize());
+                model.addAttribute("categorizationEnabled", job.isCategorizationEnabled());
+                model.addAttribute("selectedCategories", job.getCategories());
+                return "scan-result";
+            case FAILED:
+                model.addAttribute("error", job.getError());
+                return "index";
+            default:
+                model.addAttribute("jobId", job.getId());
+                return "index";
         }
-    }
-
-    private String getFileExtension(String fileName) {
-        int lastDot = fileName.lastIndexOf('.');
-        return (lastDot == -1) ? "" : fileName.substring(lastDot + 1);
     }
 
     @GetMapping("/duplicates")
-    public String showDuplicates(Model model) {
-        List<ApplicationFile> files = applicationFileRepository.findAll();
-        Map<String, List<ApplicationFile>> duplicates = duplicateDetectorService.findDuplicates(files);
-        if (duplicates == null) {
-            duplicates = new HashMap<>();
-        }
-        model.addAttribute("duplicates", duplicates);
+    public String showDuplicates() {
+        // Groups load page by page from /api/duplicates, which builds the report on first use
         return "duplicates";
     }
 
@@ -132,7 +83,8 @@ public class ApplicationManagerController {
                     // Log error if needed
                 }
             }
-            applicationFileRepository.deleteAllById(fileIds);
+            applicationFileRepository.deleteAllByIdInBatch(fileIds);
+            duplicateReportCache.removed(fileIds);
             redirectAttributes.addFlashAttribute("message", "Selected duplicates removed successfully.");
         } else {
             redirectAttributes.addFlashAttribute("message", "No files selected for removal.");
@@ -0,0 +1,40 @@
+package com.example.appmanager.controller;
+
+import com.example.appmanager.service.DuplicateGroup;
+import com.example.appmanager.service.FileRow;
+import com.example.appmanager.service.ResultPage;
+import com.example.appmanager.service.ResultPageService;
+import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.http.ResponseEntity;
+import org.springframework.web.bind.annotation.*;
+
+// JSON pages of the scan results and duplicate groups; pass the returned "next" cursor as "after"
+@RestController
+@RequestMapping("/api")
+public class ResultApiController {
+    @Autowired
+    private ResultPageService resultPageService;
+
+    @GetMapping("/files")
+    public ResponseEntity<ResultPage<FileRow>> files(@RequestParam(value = "sort", defaultValue = "path") String sort,
+                                                     @RequestParam(value = "direction", defaultValue = "asc") String direction,
+                                                     @RequestParam(value = "after", required = false) String after,
+                                                     @RequestParam(value = "limit", defaultValue = "100") int limit) {
+        try {
+            return ResponseEntity.ok(resultPageService.files(sort, "desc".equalsIgnoreCase(direction), after, limit));
+        } catch (IllegalArgumentException e) {
+            return ResponseEntity.badRequest().build();
+        }
+    }
+
+    @GetMapping("/duplicates")
+    public ResponseEntity<ResultPage<DuplicateGroup>> duplicates(@RequestParam(value = "sort", defaultValue = "key") String sort,
+                                                                 @RequestParam(value = "after", required = false) String after,
+                                                                 @RequestParam(value = "limit", defaultValue = "50") int limit) {
+        try {
+            return ResponseEntity.ok(resultPageService.duplicates(sort, after, limit));
+        } catch (IllegalArgumentException e) {
+            return ResponseEntity.badRequest().build();
+        }
+    }
+}
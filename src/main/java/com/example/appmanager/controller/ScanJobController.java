@@ -0,0 +1,43 @@
+package com.example.appmanager.controller;
+
+import com.example.appmanager.service.ScanJob;
+import com.example.appmanager.service.ScanJobService;
+import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.http.HttpStatus;
+import org.springframework.http.ResponseEntity;
+import org.springframework.web.bind.annotation.*;
+
+import java.util.List;
+
+// JSON API for background scans: start a job, poll its counters, cancel it
+@RestController
+@RequestMapping("/api/scan-jobs")
+public class ScanJobController {
+    @Autowired
+    private ScanJobService scanJobService;
+
+    @PostMapping
+    public ResponseEntity<ScanJob> start(@RequestParam("directory") String directory,
+                                         @RequestParam(value = "enableCategorization", required = false) Boolean enableCategorization,
+                                         @RequestParam(value = "categories", required = false) List<String> categories) {
+        ScanJob job = scanJobService.submit(directory, Boolean.TRUE.equals(enableCategorization), categories);
+        return ResponseEntity.status(HttpStatus.ACCEPTED).body(job);
+    }
+
+    @GetMapping
+    public List<ScanJob> list() {
+        return scanJobService.list();
+    }
+
+    @GetMapping("/{id}")
+    public ResponseEntity<ScanJob> status(@PathVariable("id") String id) {
+        ScanJob job = scanJobService.get(id);
+        return job != null ? ResponseEntity.ok(job) : ResponseEntity.notFound().build();
+    }
+
+    @PostMapping("/{id}/cancel")
+    public ResponseEntity<ScanJob> cancel(@PathVariable("id") String id) {
+        ScanJob job = scanJobService.cancel(id);
+        return job != null ? ResponseEntity.accepted().body(job) : ResponseEntity.notFound().build();
+    }
+}
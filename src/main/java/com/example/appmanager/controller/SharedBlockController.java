@@ -0,0 +1,20 @@
+package com.example.appmanager.controller;
+
+import com.example.appmanager.service.ChunkIndexService;
+import com.example.appmanager.service.SharedBlockReport;
+import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.web.bind.annotation.*;
+
+// JSON report of block-level overlap between scanned files and what block dedup would save
+@RestController
+@RequestMapping("/api/shared-blocks")
+public class SharedBlockController {
+    @Autowired
+    private ChunkIndexService chunkIndexService;
+
+    @GetMapping
+    public SharedBlockReport report(@RequestParam("directory") String directory,
+                                    @RequestParam(value = "limit", defaultValue = "50") int limit) {
+        return chunkIndexService.report(directory, Math.max(0, limit));
+    }
+}
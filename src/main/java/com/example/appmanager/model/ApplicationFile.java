@@ -3,9 +3,19 @@ package com.example.appmanager.model;
 import jakarta.persistence.*;
 
 @Entity
+// hash serves the duplicate grouping queries, path the default result order, scanJob the publish step
+@Table(indexes = {
+        @Index(name = "idx_application_file_hash", columnList = "hash"),
+        @Index(name = "idx_application_file_size", columnList = "size"),
+        @Index(name = "idx_application_file_type", columnList = "fileType"),
+        @Index(name = "idx_application_file_path", columnList = "path"),
+        @Index(name = "idx_application_file_scan_job", columnList = "scanJob")
+})
 public class ApplicationFile {
     @Id
-    @GeneratedValue(strategy = GenerationType.IDENTITY)
+    // Sequence ids are allocated in blocks, which lets Hibernate batch the inserts (IDENTITY cannot)
+    @GeneratedValue(strategy = GenerationType.SEQUENCE, generator = "application_file_seq")
+    @SequenceGenerator(name = "application_file_seq", sequenceName = "application_file_seq", allocationSize = 50)
     private Long id;
 
     private String name;
@@ -16,6 +26,21 @@ public class ApplicationFile {
     private double entropy; // Shannon entropy for file content
     private String ssdeepHash;
     private double similarityScore; // Percentage similarity (0-100)
+    @Lob
+    @Convert(converter = LongArrayConverter.class)
+    private long[] textTokens; // Sorted word hashes of text files, see TextShingles
+    @Lob
+    private byte[] audioFingerprint; // Chroma codes of decodable audio, see AudioFingerprint
+    @Lob
+    @Convert(converter = LongArrayConverter.class)
+    private long[] videoHash; // Per-frame perceptual hashes of sampled frames, see VideoHash
+    @Convert(converter = LongArrayConverter.class)
+    private long[] imageHash; // Average, difference and DCT hashes of decodable images, see ImageHash
+    @Lob
+    @Convert(converter = LongArrayConverter.class)
+    private long[] archiveMembers; // Member CRC/size keys of zip-format archives, see ArchiveManifest
+    private Integer chunkCount; // Distinct content-defined chunks in the chunk index, null if not chunked
+    private String scanJob; // Id of the scan still writing this row, null once the results are published
 
     @ManyToOne
     private Category category;
@@ -37,6 +62,20 @@ public class ApplicationFile {
     public void setEntropy(double entropy) { this.entropy = entropy; }
     public String getSsdeepHash() { return ssdeepHash; }
     public void setSsdeepHash(String ssdeepHash) { this.ssdeepHash = ssdeepHash; }
+    public long[] getTextTokens() { return textTokens; }
+    public void setTextTokens(long[] textTokens) { this.textTokens = textTokens; }
+    public byte[] getAudioFingerprint() { return audioFingerprint; }
+    public void setAudioFingerprint(byte[] audioFingerprint) { this.audioFingerprint = audioFingerprint; }
+    public long[] getVideoHash() { return videoHash; }
+    public void setVideoHash(long[] videoHash) { this.videoHash = videoHash; }
+    public long[] getImageHash() { return imageHash; }
+    public void setImageHash(long[] imageHash) { this.imageHash = imageHash; }
+    public long[] getArchiveMembers() { return archiveMembers; }
+    public void setArchiveMembers(long[] archiveMembers) { this.archiveMembers = archiveMembers; }
+    public Integer getChunkCount() { return chunkCount; }
+    public void setChunkCount(Integer chunkCount) { this.chunkCount = chunkCount; }
+    public String getScanJob() { return scanJob; }
+    public void setScanJob(String scanJob) { this.scanJob = scanJob; }
     public double getSimilarityScore() { return similarityScore; }
     public void setSimilarityScore(double similarityScore) { this.similarityScore = similarityScore; }
     public Category getCategory() { return category; }
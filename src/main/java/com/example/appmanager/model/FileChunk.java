@@ -0,0 +1,34 @@
+package com.example.appmanager.model;
+
+import jakarta.persistence.*;
+
+// One distinct content-defined chunk of a scanned file; the global chunk index lives in this table
+@Entity
+@Table(indexes = {
+        @Index(name = "idx_file_chunk_hash", columnList = "hash"),
+        @Index(name = "idx_file_chunk_path", columnList = "path")
+})
+public class FileChunk {
+    @Id
+    @GeneratedValue(strategy = GenerationType.SEQUENCE, generator = "file_chunk_seq")
+    @SequenceGenerator(name = "file_chunk_seq", sequenceName = "file_chunk_seq", allocationSize = 500)
+    private Long id;
+
+    @Column(length = 4096)
+    private String path;
+    private long hash; // See ContentChunker
+    private int size;
+    private int occurrences; // Times the chunk appears in the file
+
+    // Getters and setters
+    public Long getId() { return id; }
+    public void setId(Long id) { this.id = id; }
+    public String getPath() { return path; }
+    public void setPath(String path) { this.path = path; }
+    public long getHash() { return hash; }
+    public void setHash(long hash) { this.hash = hash; }
+    public int getSize() { return size; }
+    public void setSize(int size) { this.size = size; }
+    public int getOccurrences() { return occurrences; }
+    public void setOccurrences(int occurrences) { this.occurrences = occurrences; }
+}
@@ -0,0 +1,66 @@
+package com.example.appmanager.model;
+
+import jakarta.persistence.*;
+
+@Entity
+@Table(indexes = @Index(name = "idx_file_signature_path", columnList = "path", unique = true))
+public class FileSignature {
+    @Id
+    // Sequence ids are allocated in blocks, which lets Hibernate batch the inserts (IDENTITY cannot)
+    @GeneratedValue(strategy = GenerationType.SEQUENCE, generator = "file_signature_seq")
+    @SequenceGenerator(name = "file_signature_seq", sequenceName = "file_signature_seq", allocationSize = 50)
+    private Long id;
+
+    @Column(length = 4096)
+    private String path;
+    private long size;
+    private long lastModified; // mtime in milliseconds
+    private String fileKey; // device/inode identity where the platform provides one
+    private String hash;
+    private String ssdeepHash;
+    private double entropy;
+    @Lob
+    @Convert(converter = LongArrayConverter.class)
+    private long[] textTokens;
+    @Lob
+    private byte[] audioFingerprint;
+    @Lob
+    @Convert(converter = LongArrayConverter.class)
+    private long[] videoHash;
+    @Convert(converter = LongArrayConverter.class)
+    private long[] imageHash;
+    @Lob
+    @Convert(converter = LongArrayConverter.class)
+    private long[] archiveMembers;
+    private Integer chunkCount;
+
+    // Getters and setters
+    public Long getId() { return id; }
+    public void setId(Long id) { this.id = id; }
+    public String getPath() { return path; }
+    public void setPath(String path) { this.path = path; }
+    public long getSize() { return size; }
+    public void setSize(long size) { this.size = size; }
+    public long getLastModified() { return lastModified; }
+    public void setLastModified(long lastModified) { this.lastModified = lastModified; }
+    public String getFileKey() { return fileKey; }
+    public void setFileKey(String fileKey) { this.fileKey = fileKey; }
+    public String getHash() { return hash; }
+    public void setHash(String hash) { this.hash = hash; }
+    public String getSsdeepHash() { return ssdeepHash; }
+    public void setSsdeepHash(String ssdeepHash) { this.ssdeepHash = ssdeepHash; }
+    public double getEntropy() { return entropy; }
+    public void setEntropy(double entropy) { this.entropy = entropy; }
+    public long[] getTextTokens() { return textTokens; }
+    public void setTextTokens(long[] textTokens) { this.textTokens = textTokens; }
+    public byte[] getAudioFingerprint() { return audioFingerprint; }
+    public void setAudioFingerprint(byte[] audioFingerprint) { this.audioFingerprint = audioFingerprint; }
+    public long[] getVideoHash() { return videoHash; }
+    public void setVideoHash(long[] videoHash) { this.videoHash = videoHash; }
+    public long[] getImageHash() { return imageHash; }
+    public void setImageHash(long[] imageHash) { this.imageHash = imageHash; }
+    public long[] getArchiveMembers() { return archiveMembers; }
+    public void setArchiveMembers(long[] archiveMembers) { this.archiveMembers = archiveMembers; }
+    public Integer getChunkCount() { return chunkCount; }
+    public void setChunkCount(Integer chunkCount) { this.chunkCount = chunkCount; }
+}
@@ -0,0 +1,26 @@
+package com.example.appmanager.model;
+
+import jakarta.persistence.AttributeConverter;
+import jakarta.persistence.Converter;
+
+import java.nio.ByteBuffer;
+
+// Stores a long[] as a compact big-endian byte array
+@Converter
+public class LongArrayConverter implements AttributeConverter<long[], byte[]> {
+    @Override
+    public byte[] convertToDatabaseColumn(long[] values) {
+        if (values == null) return null;
+        ByteBuffer buffer = ByteBuffer.allocate(values.length * Long.BYTES);
+        buffer.asLongBuffer().put(values);
+        return buffer.array();
+    }
+
+    @Override
+    public long[] convertToEntityAttribute(byte[] bytes) {
+        if (bytes == null) return null;
+        long[] values = new long[bytes.length / Long.BYTES];
+        ByteBuffer.wrap(bytes).asLongBuffer().get(values);
+        return values;
+    }
+}
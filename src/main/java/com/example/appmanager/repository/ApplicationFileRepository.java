@@ -1,9 +1,61 @@
 package com.example.appmanager.repository;
 
 import com.example.appmanager.model.ApplicationFile;
+import org.springframework.data.domain.Limit;
+import org.springframework.data.domain.ScrollPosition;
+import org.springframework.data.domain.Sort;
+import org.springframework.data.domain.Window;
 import org.springframework.data.jpa.repository.JpaRepository;
+import org.springframework.data.jpa.repository.Modifying;
+import org.springframework.data.jpa.repository.Query;
+import org.springframework.data.repository.query.Param;
 import java.util.List;
 
+// Rows with a scanJob are staged by a scan that is still running and are left out of every result query
+
 public interface ApplicationFileRepository extends JpaRepository<ApplicationFile, Long> {
     List<ApplicationFile> findByHash(String hash);
-}
\ No newline at end of file
+
+    // Keyset scrolling: each page continues after the sort keys of the previous one, so deep pages cost
+    // the same as the first. Only the listed columns are read, not the fingerprint LOBs.
+    Window<FileRowView> findByScanJobIsNull(ScrollPosition position, Sort sort, Limit limit);
+
+    long countByScanJobIsNull();
+
+    long countByScanJobIsNullAndCategoryIsNotNull();
+
+    @Query("select coalesce(sum(f.size), 0) from ApplicationFile f where f.scanJob is null")
+    long totalSize();
+
+    // Exact duplicates found by the database: only files whose hash occurs more than once, grouped by hash
+    @Query("select f.id as id, f.name as name, f.path as path, f.hash as hash, f.size as size, f.fileType as fileType "
+            + "from ApplicationFile f where f.scanJob is null and f.hash in "
+            + "(select d.hash from ApplicationFile d where d.scanJob is null group by d.hash having count(d) > 1) "
+            + "order by f.hash, f.path")
+    List<DuplicateFileView> findExactDuplicates();
+
+    // Files with a hash of their own, the only ones the near-duplicate pass compares
+    @Query("select f from ApplicationFile f where f.scanJob is null and f.hash in "
+            + "(select d.hash from ApplicationFile d where d.scanJob is null group by d.hash having count(d) = 1) "
+            + "order by f.path")
+    List<ApplicationFile> findUniqueHashFiles();
+
+    // Staged rows of one scan in id order, for the passes that run after the walk
+    List<ApplicationFile> findByScanJobAndIdGreaterThanOrderById(String scanJob, Long id, Limit limit);
+
+    @Modifying
+    @Query("delete from ApplicationFile f where f.scanJob is null")
+    int deletePublished();
+
+    @Modifying
+    @Query("update ApplicationFile f set f.scanJob = null where f.scanJob = :scanJob")
+    int publish(@Param("scanJob") String scanJob);
+
+    @Modifying
+    @Query("delete from ApplicationFile f where f.scanJob = :scanJob")
+    int deleteStaged(@Param("scanJob") String scanJob);
+
+    @Modifying
+    @Query("delete from ApplicationFile f where f.scanJob is not null")
+    int deleteAllStaged();
+}
@@ -0,0 +1,11 @@
+package com.example.appmanager.repository;
+
+// Columns of a file the exact duplicate report needs, read without loading the entity or its category
+public interface DuplicateFileView {
+    Long getId();
+    String getName();
+    String getPath();
+    String getHash();
+    long getSize();
+    String getFileType();
+}
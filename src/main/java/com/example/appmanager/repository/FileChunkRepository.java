@@ -0,0 +1,50 @@
+package com.example.appmanager.repository;
+
+import com.example.appmanager.model.FileChunk;
+import org.springframework.data.jpa.repository.JpaRepository;
+import org.springframework.data.jpa.repository.Modifying;
+import org.springframework.data.jpa.repository.Query;
+import org.springframework.data.repository.query.Param;
+
+import java.util.Collection;
+import java.util.List;
+
+// Aggregates run in the database, so reports over the chunk index do not load it into memory. Directory
+// queries take a LIKE pattern with a literal prefix (see ChunkIndexService.prefixPattern), which the database
+// answers with a range scan of idx_file_chunk_path.
+public interface FileChunkRepository extends JpaRepository<FileChunk, Long> {
+    @Modifying
+    @Query("delete from FileChunk c where c.path in :paths")
+    void deleteByPathIn(@Param("paths") Collection<String> paths);
+
+    @Modifying
+    @Query("update FileChunk c set c.path = :newPath where c.path = :oldPath")
+    void updatePath(@Param("oldPath") String oldPath, @Param("newPath") String newPath);
+
+    // Bytes of all files under the prefix, chunk repeats included
+    @Query(value = "SELECT COALESCE(SUM(CAST(size AS BIGINT) * occurrences), 0) FROM file_chunk "
+            + "WHERE path LIKE :pattern ESCAPE '\\'", nativeQuery = true)
+    long totalBytes(@Param("pattern") String pattern);
+
+    // Bytes left if every distinct chunk under the prefix were stored once
+    @Query(value = "SELECT COALESCE(SUM(chunk_size), 0) FROM (SELECT MAX(size) AS chunk_size FROM file_chunk "
+            + "WHERE path LIKE :pattern ESCAPE '\\' GROUP BY hash) distinct_chunks", nativeQuery = true)
+    long uniqueBytes(@Param("pattern") String pattern);
+
+    // [path a, path b, shared bytes] for the file pairs under the prefix sharing the most chunk bytes. Chunks
+    // held by more than maxFiles files there (e.g. runs of zeros) are left out: each would add maxFiles^2 / 2
+    // rows to the self-join while saying little about which files are related.
+    @Query(value = "SELECT a.path, b.path, SUM(CAST(a.size AS BIGINT) * LEAST(a.occurrences, b.occurrences)) AS shared "
+            + "FROM file_chunk a JOIN file_chunk b ON a.hash = b.hash AND a.path < b.path "
+            + "WHERE a.path LIKE :pattern ESCAPE '\\' AND b.path LIKE :pattern ESCAPE '\\' "
+            + "AND a.hash IN (SELECT hash FROM file_chunk WHERE path LIKE :pattern ESCAPE '\\' "
+            + "GROUP BY hash HAVING COUNT(*) <= :maxFiles) "
+            + "GROUP BY a.path, b.path ORDER BY shared DESC LIMIT :limit", nativeQuery = true)
+    List<Object[]> topSharedPairs(@Param("pattern") String pattern, @Param("maxFiles") int maxFiles,
+                                  @Param("limit") int limit);
+
+    // [path, bytes] for each of the given files
+    @Query(value = "SELECT path, SUM(CAST(size AS BIGINT) * occurrences) FROM file_chunk "
+            + "WHERE path IN (:paths) GROUP BY path", nativeQuery = true)
+    List<Object[]> fileBytes(@Param("paths") Collection<String> paths);
+}
@@ -0,0 +1,17 @@
+package com.example.appmanager.repository;
+
+// Columns of a file the result list shows, read without its fingerprints
+public interface FileRowView {
+    Long getId();
+    String getName();
+    String getPath();
+    long getSize();
+    String getFileType();
+    String getHash();
+    double getSimilarityScore();
+    CategoryName getCategory();
+
+    interface CategoryName {
+        String getName();
+    }
+}
@@ -0,0 +1,12 @@
+package com.example.appmanager.repository;
+
+import com.example.appmanager.model.FileSignature;
+import org.springframework.data.jpa.repository.JpaRepository;
+import java.util.Collection;
+import java.util.List;
+
+public interface FileSignatureRepository extends JpaRepository<FileSignature, Long> {
+    List<FileStampView> findByPathStartingWith(String pathPrefix);
+
+    List<FileSignature> findByPathIn(Collection<String> paths);
+}
@@ -0,0 +1,10 @@
+package com.example.appmanager.repository;
+
+// What a scan compares to tell whether a file changed, read without the signature LOBs
+public interface FileStampView {
+    Long getId();
+    String getPath();
+    long getSize();
+    long getLastModified();
+    String getFileKey();
+}
@@ -0,0 +1,90 @@
+package com.example.appmanager.service;
+
+import java.io.File;
+import java.io.IOException;
+import java.io.InputStream;
+import java.util.Map;
+import java.util.TreeMap;
+import java.util.zip.CRC32;
+import java.util.zip.ZipEntry;
+import java.util.zip.ZipException;
+import java.util.zip.ZipFile;
+
+// Content manifest of a zip-format archive (zip, jar, apk, ...) taken from its central directory. Every
+// member is identified by its stored CRC-32 and uncompressed size, so nothing is inflated and the result
+// does not depend on member names, order, timestamps or compression level. Encoded as sorted
+// (key, weight) pairs where weight is the total size + 1 of the members with that key.
+public class ArchiveManifest {
+    // Empty when the file is not a readable zip archive, so the scan index does not retry it
+    public static long[] compute(File file) throws IOException {
+        Map<Long, Long> weights = new TreeMap<>();
+        try (ZipFile zip = new ZipFile(file)) {
+            var entries = zip.entries();
+            while (entries.hasMoreElements()) {
+                ZipEntry entry = entries.nextElement();
+                if (entry.isDirectory()) continue;
+                long crc = entry.getCrc();
+                long size = entry.getSize();
+                if (crc == -1 || size == -1) {
+                    // Only inflate members whose central directory record lacks them
+                    long[] computed = inflate(zip, entry);
+                    crc = computed[0];
+                    size = computed[1];
+                }
+                weights.merge((crc << 32) | (size & 0xFFFFFFFFL), size + 1, Long::sum);
+            }
+        } catch (ZipException e) {
+            return new long[0];
+        }
+        long[] manifest = new long[weights.size() * 2];
+        int i = 0;
+        for (Map.Entry<Long, Long> member : weights.entrySet()) {
+            manifest[i++] = member.getKey();
+            manifest[i++] = member.getValue();
+        }
+        return manifest;
+    }
+
+    private static long[] inflate(ZipFile zip, ZipEntry entry) throws IOException {
+        CRC32 crc = new CRC32();
+        long size = 0;
+        byte[] buffer = new byte[64 * 1024];
+        try (InputStream in = zip.getInputStream(entry)) {
+            int read;
+            while ((read = in.read(buffer)) != -1) {
+                crc.update(buffer, 0, read);
+                size += read;
+            }
+        }
+        return new long[] { crc.getValue(), size };
+    }
+
+    // Weighted Jaccard similarity 0-1: bytes of shared members over bytes of all members
+    public static double overlap(long[] a, long[] b) {
+        long common = 0, total = 0;
+        int i = 0, j = 0;
+        while (i < a.length && j < b.length) {
+            if (a[i] == b[j]) {
+                common += Math.min(a[i + 1], b[j + 1]);
+                total += Math.max(a[i + 1], b[j + 1]);
+                i += 2;
+                j += 2;
+            } else if (a[i] < b[j]) {
+                total += a[i + 1];
+                i += 2;
+            } else {
+                total += b[j + 1];
+                j += 2;
+            }
+        }
+        for (; i < a.length; i += 2) total += a[i + 1];
+        for (; j < b.length; j += 2) total += b[j + 1];
+        return total == 0 ? 0.0 : (double) common / total;
+    }
+
+    public static long totalWeight(long[] manifest) {
+        long total = 0;
+        for (int i = 1; i < manifest.length; i += 2) total += manifest[i];
+        return total;
+    }
+}
@@ -0,0 +1,288 @@
+package com.example.appmanager.service;
+
+import javax.sound.sampled.AudioFormat;
+import javax.sound.sampled.AudioInputStream;
+import javax.sound.sampled.AudioSystem;
+import javax.sound.sampled.UnsupportedAudioFileException;
+import java.io.File;
+import java.io.IOException;
+import java.nio.ByteBuffer;
+import java.util.HashSet;
+import java.util.Set;
+
+// Perceptual audio fingerprint: the decoded PCM is cut into back-to-back 0.1 s frames and each frame is
+// reduced to a 12-bit chroma code, one bit per pitch class carrying at least half of the strongest class's
+// energy. A frame is 0.1 s of samples at any sample rate, zero-padded to a power of two for the FFT, so
+// codes do not depend on volume, octave, file format or sample rate. Each code takes two bytes, the top
+// four bits holding the fingerprint VERSION.
+public class AudioFingerprint {
+    private static final double FRAME_SECONDS = 0.1;
+    // Bumped whenever the framing or the codes change; fingerprints of other versions are recomputed
+    private static final int VERSION = 1;
+    private static final double MIN_FREQUENCY = 55.0;
+    private static final double MAX_FREQUENCY = 5000.0;
+    private static final double SILENCE_RMS = 0.001;
+    // Frames sharing less than this much of the shorter fingerprint are not compared
+    private static final double MIN_OVERLAP = 0.8;
+    private static final int MIN_FRAMES = 4;
+    private static final int KEY_LENGTH = 3;
+
+    // Decodes the file with javax.sound (WAV, AIFF and AU, whatever the extension says). Returns an empty
+    // fingerprint for audio that cannot be decoded or read (including truncated and corrupt files), so the
+    // scan index does not retry it every time.
+    public static byte[] compute(File file) {
+        try (AudioInputStream in = pcm(AudioSystem.getAudioInputStream(file))) {
+            return compute(in);
+        } catch (UnsupportedAudioFileException | IOException | IllegalArgumentException e) {
+            return new byte[0];
+        }
+    }
+
+    private static AudioInputStream pcm(AudioInputStream in) {
+        AudioFormat.Encoding encoding = in.getFormat().getEncoding();
+        if (encoding.equals(AudioFormat.Encoding.PCM_SIGNED) || encoding.equals(AudioFormat.Encoding.PCM_UNSIGNED)) {
+            return in;
+        }
+        return AudioSystem.getAudioInputStream(AudioFormat.Encoding.PCM_SIGNED, in);
+    }
+
+    private static byte[] compute(AudioInputStream in) throws IOException {
+        AudioFormat format = in.getFormat();
+        int channels = format.getChannels();
+        int bytesPerSample = (format.getSampleSizeInBits() + 7) / 8;
+        int frameBytes = format.getFrameSize();
+        if (channels < 1 || bytesPerSample < 1 || bytesPerSample > 4 || frameBytes != channels * bytesPerSample) {
+            return new byte[0];
+        }
+        float sampleRate = format.getSampleRate();
+        int frameLength = Math.max(64, (int) Math.round(sampleRate * FRAME_SECONDS));
+        int fftSize = Integer.highestOneBit(frameLength - 1) << 1;
+        int[] pitchClass = pitchClasses(fftSize, sampleRate);
+
+        ByteBuffer codes = ByteBuffer.allocate(1024);
+        double[] samples = new double[frameLength];
+        int filled = 0;
+        byte[] buffer = new byte[frameBytes * 4096];
+        int carry = 0;
+        int read;
+        while ((read = in.read(buffer, carry, buffer.length - carry)) != -1) {
+            int available = carry + read;
+            int whole = available - available % frameBytes;
+            for (int offset = 0; offset < whole; offset += frameBytes) {
+                double mono = 0;
+                for (int c = 0; c < channels; c++) {
+                    mono += sample(buffer, offset + c * bytesPerSample, bytesPerSample, format);
+                }
+                samples[filled++] = mono / channels;
+                if (filled == frameLength) {
+                    if (codes.remaining() < 2) {
+                        codes = grow(codes);
+                    }
+                    codes.putShort((short) (VERSION << 12 | frameCode(samples, fftSize, pitchClass)));
+                    filled = 0;
+                }
+            }
+            carry = available - whole;
+            System.arraycopy(buffer, whole, buffer, 0, carry);
+        }
+        byte[] fingerprint = new byte[codes.position()];
+        codes.flip();
+        codes.get(fingerprint);
+        return fingerprint;
+    }
+
+    private static ByteBuffer grow(ByteBuffer codes) {
+        ByteBuffer larger = ByteBuffer.allocate(codes.capacity() * 2);
+        codes.flip();
+        larger.put(codes);
+        return larger;
+    }
+
+    // One PCM sample scaled to [-1, 1]
+    private static double sample(byte[] buffer, int offset, int bytes, AudioFormat format) {
+        long value = 0;
+        for (int i = 0; i < bytes; i++) {
+            int b = buffer[offset + (format.isBigEndian() ? i : bytes - 1 - i)] & 0xFF;
+            value = (value << 8) | b;
+        }
+        int bits = bytes * 8;
+        if (format.getEncoding().equals(AudioFormat.Encoding.PCM_UNSIGNED)) {
+            value -= 1L << (bits - 1);
+        } else if ((value & (1L << (bits - 1))) != 0) {
+            value -= 1L << bits;
+        }
+        return value / (double) (1L << (bits - 1));
+    }
+
+    // Pitch class (C = 0) of every FFT bin inside the analysed range, -1 outside it
+    private static int[] pitchClasses(int fftSize, float sampleRate) {
+        int[] pitchClass = new int[fftSize / 2];
+        for (int k = 0; k < pitchClass.length; k++) {
+            double frequency = k * (double) sampleRate / fftSize;
+            if (frequency < MIN_FREQUENCY || frequency > MAX_FREQUENCY) {
+                pitchClass[k] = -1;
+            } else {
+                long semitone = Math.round(12 * Math.log(frequency / 440.0) / Math.log(2));
+                pitchClass[k] = (int) Math.floorMod(semitone + 9, 12);
+            }
+        }
+        return pitchClass;
+    }
+
+    // The Hann window spans the frame's own samples; the rest of the FFT input is zero padding
+    private static int frameCode(double[] samples, int fftSize, int[] pitchClass) {
+        int n = samples.length;
+        double energy = 0;
+        double[] re = new double[fftSize];
+        double[] im = new double[fftSize];
+        for (int i = 0; i < n; i++) {
+            energy += samples[i] * samples[i];
+            // Hann window
+            re[i] = samples[i] * (0.5 - 0.5 * Math.cos(2 * Math.PI * i / (n - 1)));
+        }
+        if (Math.sqrt(energy / n) < SILENCE_RMS) return 0;
+        fft(re, im);
+
+        double[] chroma = new double[12];
+        for (int k = 0; k < pitchClass.length; k++) {
+            if (pitchClass[k] >= 0) {
+                chroma[pitchClass[k]] += re[k] * re[k] + im[k] * im[k];
+            }
+        }
+        double max = 0;
+        for (double c : chroma) max = Math.max(max, c);
+        if (max == 0) return 0;
+        int code = 0;
+        for (int pc = 0; pc < 12; pc++) {
+            if (chroma[pc] >= 0.5 * max) code |= 1 << pc;
+        }
+        return code;
+    }
+
+    // In-place iterative radix-2 FFT; n must be a power of two
+    private static void fft(double[] re, double[] im) {
+        int n = re.length;
+        for (int i = 1, j = 0; i < n; i++) {
+            int bit = n >> 1;
+            for (; (j & bit) != 0; bit >>= 1) j ^= bit;
+            j ^= bit;
+            if (i < j) {
+                double t = re[i]; re[i] = re[j]; re[j] = t;
+                t = im[i]; im[i] = im[j]; im[j] = t;
+            }
+        }
+        for (int len = 2; len <= n; len <<= 1) {
+            double angle = -2 * Math.PI / len;
+            double wRe = Math.cos(angle);
+            double wIm = Math.sin(angle);
+            for (int i = 0; i < n; i += len) {
+                double curRe = 1, curIm = 0;
+                for (int j = 0; j < len / 2; j++) {
+                    int a = i + j, b = i + j + len / 2;
+                    double tRe = re[b] * curRe - im[b] * curIm;
+                    double tIm = re[b] * curIm + im[b] * curRe;
+                    re[b] = re[a] - tRe;
+                    im[b] = im[a] - tIm;
+                    re[a] += tRe;
+                    im[a] += tIm;
+                    double nextRe = curRe * wRe - curIm * wIm;
+                    curIm = curRe * wIm + curIm * wRe;
+                    curRe = nextRe;
+                }
+            }
+        }
+    }
+
+    // Similarity 0-100: the best mean per-frame agreement over all alignments that overlap most of the
+    // shorter fingerprint. Also tried at half the frame rate of either side, which covers copies
+    // resampled by a factor of two without their header being updated (played at half or double speed).
+    public static int compare(byte[] fingerprintA, byte[] fingerprintB) {
+        int[] a = codes(fingerprintA);
+        int[] b = codes(fingerprintB);
+        if (a.length < MIN_FRAMES || b.length < MIN_FRAMES) return 0;
+        double best = align(a, b);
+        best = Math.max(best, align(a, decimate(b)));
+        best = Math.max(best, align(decimate(a), b));
+        return (int) Math.round(best * 100);
+    }
+
+    // False for fingerprints computed with an older framing, which cannot be compared with current ones
+    public static boolean isCurrent(byte[] fingerprint) {
+        return fingerprint.length < 2 || (fingerprint[0] & 0xF0) >>> 4 == VERSION;
+    }
+
+    // Inverted-index keys: runs of KEY_LENGTH successive distinct non-silent codes, which survive a change
+    // of tempo or length. The keys are exact codes, so blocking on them is lossy: two fingerprints can score
+    // above the audio threshold without sharing a run, e.g. when re-encoding flips one chroma bit in every
+    // few frames. Such a pair is scored only if the ssdeep join happens to pair it, or if the run index is
+    // turned off (fileguard.detection.audio-run-keys).
+    public static Set<Long> blockingKeys(byte[] fingerprint) {
+        Set<Long> keys = new HashSet<>();
+        int[] distinct = collapse(codes(fingerprint));
+        if (distinct.length > 0 && distinct.length < KEY_LENGTH) {
+            // Too short for a run: the whole sequence, flagged so it cannot equal a run key
+            long key = 0;
+            for (int code : distinct) key = (key << 12) | code;
+            keys.add(key | (1L << 62));
+        }
+        for (int i = 0; i + KEY_LENGTH <= distinct.length; i++) {
+            long key = 0;
+            for (int j = 0; j < KEY_LENGTH; j++) key = (key << 12) | distinct[i + j];
+            keys.add(key);
+        }
+        return keys;
+    }
+
+    private static int[] codes(byte[] fingerprint) {
+        if (fingerprint == null) return new int[0];
+        int[] codes = new int[fingerprint.length / 2];
+        ByteBuffer buffer = ByteBuffer.wrap(fingerprint);
+        for (int i = 0; i < codes.length; i++) {
+            codes[i] = buffer.getShort() & 0xFFF;
+        }
+        return codes;
+    }
+
+    // Drops silent frames and repeats of the previous code
+    private static int[] collapse(int[] codes) {
+        int[] distinct = new int[codes.length];
+        int count = 0;
+        for (int code : codes) {
+            if (code != 0 && (count == 0 || distinct[count - 1] != code)) {
+                distinct[count++] = code;
+            }
+        }
+        return java.util.Arrays.copyOf(distinct, count);
+    }
+
+    private static int[] decimate(int[] codes) {
+        int[] half = new int[(codes.length + 1) / 2];
+        for (int i = 0; i < half.length; i++) half[i] = codes[2 * i];
+        return half;
+    }
+
+    // Slides the shorter sequence along the longer one
+    private static double align(int[] a, int[] b) {
+        int[] shorter = a.length <= b.length ? a : b;
+        int[] longer = a.length <= b.length ? b : a;
+        if (shorter.length < MIN_FRAMES) return 0;
+        int minOverlap = (int) Math.ceil(shorter.length * MIN_OVERLAP);
+        double best = 0;
+        for (int offset = minOverlap - shorter.length; offset <= longer.length - minOverlap; offset++) {
+            int from = Math.max(0, -offset);
+            int to = Math.min(shorter.length, longer.length - offset);
+            double total = 0;
+            for (int i = from; i < to; i++) {
+                total += frameSimilarity(shorter[i], longer[i + offset]);
+            }
+            // Frames of the shorter sequence that hang over an end count as mismatches
+            best = Math.max(best, total / shorter.length);
+        }
+        return best;
+    }
+
+    private static double frameSimilarity(int a, int b) {
+        if (a == 0 || b == 0) return a == b ? 1 : 0;
+        return (double) Integer.bitCount(a & b) / Integer.bitCount(a | b);
+    }
+}
@@ -0,0 +1,64 @@
+package com.example.appmanager.service;
+
+import java.util.ArrayDeque;
+import java.util.Deque;
+import java.util.HashMap;
+import java.util.Map;
+import java.util.function.IntConsumer;
+import java.util.function.ToIntBiFunction;
+
+// Burkhard-Keller tree over a metric: a radius query only descends into children whose edge distance
+// lies within radius of the query's distance to their parent, which skips most of the tree.
+public class BkTree<T> {
+    private final ToIntBiFunction<T, T> distance;
+    private Node<T> root;
+
+    public BkTree(ToIntBiFunction<T, T> distance) {
+        this.distance = distance;
+    }
+
+    public void add(T value, int id) {
+        if (root == null) {
+            root = new Node<>(value, id);
+            return;
+        }
+        Node<T> node = root;
+        while (true) {
+            int d = distance.applyAsInt(value, node.value);
+            Node<T> child = node.children.get(d);
+            if (child == null) {
+                node.children.put(d, new Node<>(value, id));
+                return;
+            }
+            node = child;
+        }
+    }
+
+    // Reports the id of every value within radius of the query
+    public void query(T value, int radius, IntConsumer matches) {
+        if (root == null) return;
+        Deque<Node<T>> pending = new ArrayDeque<>();
+        pending.push(root);
+        while (!pending.isEmpty()) {
+            Node<T> node = pending.pop();
+            int d = distance.applyAsInt(value, node.value);
+            if (d <= radius) matches.accept(node.id);
+            for (Map.Entry<Integer, Node<T>> child : node.children.entrySet()) {
+                if (Math.abs(child.getKey() - d) <= radius) {
+                    pending.push(child.getValue());
+                }
+            }
+        }
+    }
+
+    private static final class Node<T> {
+        private final T value;
+        private final int id;
+        private final Map<Integer, Node<T>> children = new HashMap<>();
+
+        private Node(T value, int id) {
+            this.value = value;
+            this.id = id;
+        }
+    }
+}
@@ -0,0 +1,368 @@
+package com.example.appmanager.service;
+
+import com.example.appmanager.model.ApplicationFile;
+
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.Comparator;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.function.Function;
+import java.util.function.IntConsumer;
+import java.util.function.IntUnaryOperator;
+import java.util.function.ToIntBiFunction;
+
+// Blocking stage for the hybrid near-duplicate pass. Pairs left out here score at or below their threshold
+// in DuplicateDetectorService.calculateSimilarity, with two exceptions. Text pairs come from a MinHash LSH
+// index, which misses a pair above the threshold only with a small probability set by the number of bands
+// and rows. Audio pairs with fingerprints on both sides are joined through an inverted index of exact
+// chroma code runs, which can miss a close pair (see AudioFingerprint.blockingKeys). With LSH and the run
+// index both disabled, the groups equal those of scoring every pair. Video and image pairs
+// with perceptual signatures are joined through BK-tree radius searches. Zip-format archives are joined by
+// prefix filtering on their member manifests, which is exact for the overlap threshold. Images, archives
+// and other binary files are also scored against each other by ssdeep, so they share one ssdeep join
+// across the three families.
+//
+// The constructor only builds the indexes: key postings (one long per key and file), BK-trees and
+// entropy-sorted arrays, all linear in the number of files. Candidate pairs are never collected; each
+// file's row is generated by candidates(i) when it is scored, so at most one row per scoring thread exists.
+public class CandidateBlocker {
+    // Entropy differences below which the audio/video heuristics score above their thresholds
+    private static final double AUDIO_ENTROPY_BAND = 0.1;
+    private static final double VIDEO_ENTROPY_BAND = 0.2;
+    // General fallback: same type and size, entropy within 0.01
+    private static final double BINARY_ENTROPY_BAND = 0.01;
+
+    private final List<ApplicationFile> files;
+    private final FileFamily[] family;
+    private final IntUnaryOperator videoRadius;
+    private final IntUnaryOperator imageRadius;
+
+    // LSH band keys of every text file, or null for text files without words
+    private final long[][] textKeys;
+    private final KeyIndex textIndex = new KeyIndex();
+    // Every text file, ascending, when LSH is disabled
+    private int[] textMembers;
+    private final KeyIndex audioIndex = new KeyIndex();
+    // Every audio file with a fingerprint, ascending, when the run index is disabled
+    private int[] audioMembers;
+    private final KeyIndex audioSsdeepIndex = new KeyIndex();
+    private final KeyIndex videoSsdeepIndex = new KeyIndex();
+    // Images, archives and other binaries
+    private final KeyIndex binarySsdeepIndex = new KeyIndex();
+    // Member keys each archive is indexed under
+    private final long[][] archivePrefixes;
+    private final KeyIndex archiveIndex = new KeyIndex();
+    private final Map<Integer, BkTree<long[]>> videoTrees = new HashMap<>();
+    private final Map<Integer, BkTree<long[]>> imageTrees = new HashMap<>();
+    private final EntropyBands audioBands;
+    private final EntropyBands videoBands;
+    // Images, archives and binaries in (type, size, entropy) order, and each one's place in that order
+    private final int[] bySizeOrder;
+    private final int[] bySizeRank;
+
+    // textBands = 0 disables LSH and pairs every text file with every other one. audioRunKeys = false
+    // pairs every fingerprinted audio file with every other one.
+    // videoRadius(frames) and imageRadius(hashes) are the largest signature distances that can still clear
+    // the video and image thresholds.
+    // archiveOverlap is the member overlap (0-1) an archive pair has to exceed.
+    public CandidateBlocker(List<ApplicationFile> files, int textBands, int textRows, boolean audioRunKeys,
+                            IntUnaryOperator videoRadius, IntUnaryOperator imageRadius, double archiveOverlap) {
+        this.files = files;
+        this.videoRadius = videoRadius;
+        this.imageRadius = imageRadius;
+        int n = files.size();
+        family = new FileFamily[n];
+        textKeys = new long[n][];
+        archivePrefixes = new long[n][];
+        Map<FileFamily, List<Integer>> byFamily = new HashMap<>();
+        for (int i = 0; i < n; i++) {
+            family[i] = FileFamily.of(files.get(i).getFileType());
+            byFamily.computeIfAbsent(family[i], k -> new ArrayList<>()).add(i);
+        }
+
+        List<Integer> bySize = new ArrayList<>();
+        for (int i = 0; i < n; i++) {
+            ApplicationFile file = files.get(i);
+            switch (family[i]) {
+                case TEXT:
+                    if (textBands > 0 && textRows > 0) indexText(i, textBands, textRows);
+                    break;
+                case AUDIO:
+                    if (audioRunKeys) {
+                        for (long key : AudioFingerprint.blockingKeys(file.getAudioFingerprint())) audioIndex.add(key, i);
+                    }
+                    indexSsdeep(audioSsdeepIndex, i);
+                    break;
+                case VIDEO:
+                    addToTree(videoTrees, file.getVideoHash(), VideoHash::distance, i);
+                    indexSsdeep(videoSsdeepIndex, i);
+                    break;
+                case IMAGE:
+                    addToTree(imageTrees, file.getImageHash(), ImageHash::distance, i);
+                    indexSsdeep(binarySsdeepIndex, i);
+                    bySize.add(i);
+                    break;
+                case ARCHIVE:
+                    indexSsdeep(binarySsdeepIndex, i);
+                    bySize.add(i);
+                    break;
+                default:
+                    indexSsdeep(binarySsdeepIndex, i);
+                    bySize.add(i);
+                    break;
+            }
+        }
+        if (!(textBands > 0 && textRows > 0)) {
+            textMembers = byFamily.getOrDefault(FileFamily.TEXT, List.of()).stream().mapToInt(Integer::intValue).toArray();
+        }
+        if (!audioRunKeys) {
+            audioMembers = byFamily.getOrDefault(FileFamily.AUDIO, List.of()).stream()
+                    .filter(i -> hasFingerprint(files.get(i))).mapToInt(Integer::intValue).toArray();
+        }
+        indexArchivePrefixes(byFamily.getOrDefault(FileFamily.ARCHIVE, List.of()), archiveOverlap);
+        textIndex.build();
+        audioIndex.build();
+        audioSsdeepIndex.build();
+        videoSsdeepIndex.build();
+        binarySsdeepIndex.build();
+        archiveIndex.build();
+        audioBands = new EntropyBands(files, byFamily.getOrDefault(FileFamily.AUDIO, List.of()), AUDIO_ENTROPY_BAND,
+                file -> hasFingerprint(file) ? 0 : null);
+        // Hashes of different lengths (other frame counts) are not comparable
+        videoBands = new EntropyBands(files, byFamily.getOrDefault(FileFamily.VIDEO, List.of()), VIDEO_ENTROPY_BAND,
+                file -> file.getVideoHash() != null && file.getVideoHash().length > 0 ? file.getVideoHash().length : null);
+
+        bySize.sort(Comparator.<Integer, String>comparing(i -> files.get(i).getFileType())
+                .thenComparingLong(i -> files.get(i).getSize())
+                .thenComparingDouble(i -> files.get(i).getEntropy()));
+        bySizeOrder = bySize.stream().mapToInt(Integer::intValue).toArray();
+        bySizeRank = new int[n];
+        for (int r = 0; r < bySizeOrder.length; r++) bySizeRank[bySizeOrder[r]] = r;
+    }
+
+    // The ascending, distinct indices above i worth scoring against file i. Safe to call from several
+    // threads at once.
+    public int[] candidates(int i) {
+        Row row = new Row();
+        ApplicationFile file = files.get(i);
+        switch (family[i]) {
+            case TEXT:
+                if (textMembers != null) {
+                    int from = Arrays.binarySearch(textMembers, i) + 1;
+                    return Arrays.copyOfRange(textMembers, from, textMembers.length);
+                }
+                if (textKeys[i] != null) {
+                    for (long key : textKeys[i]) textIndex.after(key, i, row);
+                }
+                break;
+            case AUDIO:
+                if (audioMembers == null) {
+                    for (long key : AudioFingerprint.blockingKeys(file.getAudioFingerprint())) audioIndex.after(key, i, row);
+                } else if (hasFingerprint(file)) {
+                    for (int k = Arrays.binarySearch(audioMembers, i) + 1; k < audioMembers.length; k++) {
+                        row.accept(audioMembers[k]);
+                    }
+                }
+                ssdeepAfter(audioSsdeepIndex, i, row);
+                audioBands.after(i, row);
+                break;
+            case VIDEO:
+                treeAfter(videoTrees, file.getVideoHash(), videoRadius, i, row);
+                ssdeepAfter(videoSsdeepIndex, i, row);
+                videoBands.after(i, row);
+                break;
+            case IMAGE:
+                treeAfter(imageTrees, file.getImageHash(), imageRadius, i, row);
+                ssdeepAfter(binarySsdeepIndex, i, row);
+                sameSizeAfter(i, row);
+                break;
+            case ARCHIVE:
+                if (archivePrefixes[i] != null) {
+                    for (long key : archivePrefixes[i]) archiveIndex.after(key, i, row);
+                }
+                ssdeepAfter(binarySsdeepIndex, i, row);
+                sameSizeAfter(i, row);
+                break;
+            default:
+                ssdeepAfter(binarySsdeepIndex, i, row);
+                sameSizeAfter(i, row);
+                break;
+        }
+        return row.sortedDistinct();
+    }
+
+    // LSH banding: files whose signatures agree on every row of at least one band become candidates.
+    // A pair with Jaccard similarity s is found with probability 1 - (1 - s^rows)^bands.
+    private void indexText(int i, int bands, int rows) {
+        long[] tokens = files.get(i).getTextTokens();
+        // Without words there is nothing to be similar to (Jaccard is 0)
+        if (tokens == null || tokens.length == 0) return;
+        long[] signature = MinHash.signature(tokens, bands * rows);
+        textKeys[i] = new long[bands];
+        for (int band = 0; band < bands; band++) {
+            textKeys[i][band] = MinHash.bandKey(signature, band, rows);
+            textIndex.add(textKeys[i][band], i);
+        }
+    }
+
+    private void indexSsdeep(KeyIndex index, int i) {
+        if (!hasSsdeep(files.get(i))) return;
+        for (String key : Ssdeep.blockingKeys(files.get(i).getSsdeepHash())) {
+            index.add(TextShingles.hash(key), i);
+        }
+    }
+
+    private void ssdeepAfter(KeyIndex index, int i, IntConsumer row) {
+        if (!hasSsdeep(files.get(i))) return;
+        for (String key : Ssdeep.blockingKeys(files.get(i).getSsdeepHash())) {
+            index.after(TextShingles.hash(key), i, row);
+        }
+    }
+
+    // Signatures of different lengths (e.g. sampled with another frame count) live in separate trees
+    private static void addToTree(Map<Integer, BkTree<long[]>> trees, long[] signature,
+                                  ToIntBiFunction<long[], long[]> distance, int i) {
+        if (signature == null || signature.length == 0) return;
+        trees.computeIfAbsent(signature.length, k -> new BkTree<>(distance)).add(signature, i);
+    }
+
+    private static void treeAfter(Map<Integer, BkTree<long[]>> trees, long[] signature, IntUnaryOperator radiusFor,
+                                  int i, IntConsumer row) {
+        if (signature == null || signature.length == 0) return;
+        trees.get(signature.length).query(signature, radiusFor.applyAsInt(signature.length), match -> {
+            if (match > i) row.accept(match);
+        });
+    }
+
+    // With members ordered rarest first, the first member two archives share lies, in each of them, before
+    // more than (1 - overlap) of its weight has gone by; otherwise the overlap could not exceed the
+    // threshold. Indexing only those prefixes keeps common members (e.g. identical manifests) out.
+    private void indexArchivePrefixes(List<Integer> members, double overlap) {
+        Map<Long, Integer> frequency = new HashMap<>();
+        for (int index : members) {
+            long[] manifest = files.get(index).getArchiveMembers();
+            if (manifest == null) continue;
+            for (int i = 0; i < manifest.length; i += 2) frequency.merge(manifest[i], 1, Integer::sum);
+        }
+        for (int index : members) {
+            long[] manifest = files.get(index).getArchiveMembers();
+            if (manifest == null || manifest.length == 0) continue;
+            Integer[] order = new Integer[manifest.length / 2];
+            for (int i = 0; i < order.length; i++) order[i] = i;
+            Arrays.sort(order, Comparator.<Integer>comparingInt(i -> frequency.get(manifest[2 * i]))
+                    .thenComparingLong(i -> manifest[2 * i]));
+            double budget = (1.0 - overlap) * ArchiveManifest.totalWeight(manifest);
+            long seen = 0;
+            int prefix = 0;
+            for (int i : order) {
+                if (seen >= budget && seen > 0) break;
+                seen += manifest[2 * i + 1];
+                prefix++;
+            }
+            archivePrefixes[index] = new long[prefix];
+            for (int k = 0; k < prefix; k++) {
+                archivePrefixes[index][k] = manifest[2 * order[k]];
+                archiveIndex.add(archivePrefixes[index][k], index);
+            }
+        }
+    }
+
+    // Binary pairs missing an ssdeep hash fall back to exact type and size plus near-equal entropy. The
+    // files within the band sit next to i in (type, size, entropy) order, on either side.
+    private void sameSizeAfter(int i, IntConsumer row) {
+        ApplicationFile file = files.get(i);
+        int rank = bySizeRank[i];
+        for (int step = -1; step <= 1; step += 2) {
+            for (int r = rank + step; r >= 0 && r < bySizeOrder.length; r += step) {
+                ApplicationFile other = files.get(bySizeOrder[r]);
+                if (!other.getFileType().equals(file.getFileType()) || other.getSize() != file.getSize()
+                        || Math.abs(other.getEntropy() - file.getEntropy()) >= BINARY_ENTROPY_BAND) break;
+                if (bySizeOrder[r] > i && (!hasSsdeep(file) || !hasSsdeep(other))) row.accept(bySizeOrder[r]);
+            }
+        }
+    }
+
+    private static boolean hasSsdeep(ApplicationFile file) {
+        return file.getSsdeepHash() != null && !file.getSsdeepHash().isEmpty();
+    }
+
+    private static boolean hasFingerprint(ApplicationFile file) {
+        return file.getAudioFingerprint() != null && file.getAudioFingerprint().length > 0;
+    }
+
+    // The size/entropy heuristics only score pairs that cannot be compared by perceptual signature. Files
+    // with the same signatureClass (non-null) are compared by signature alone, so only pairs with an
+    // unsigned side, or signatures of different classes, are joined on the entropy band.
+    private static final class EntropyBands {
+        private final double band;
+        private final double[] entropy;
+        private final Integer[] signatureClass;
+        // One entropy-sorted array per class; the key null holds the unsigned files
+        private final Map<Integer, int[]> sorted = new HashMap<>();
+        private final Map<Integer, double[]> sortedEntropy = new HashMap<>();
+
+        EntropyBands(List<ApplicationFile> files, List<Integer> members, double band,
+                     Function<ApplicationFile, Integer> classOf) {
+            this.band = band;
+            entropy = new double[files.size()];
+            signatureClass = new Integer[files.size()];
+            Map<Integer, List<Integer>> byClass = new HashMap<>();
+            for (int index : members) {
+                entropy[index] = files.get(index).getEntropy();
+                signatureClass[index] = classOf.apply(files.get(index));
+                byClass.computeIfAbsent(signatureClass[index], k -> new ArrayList<>()).add(index);
+            }
+            for (Map.Entry<Integer, List<Integer>> entry : byClass.entrySet()) {
+                int[] ids = entry.getValue().stream().mapToInt(Integer::intValue).toArray();
+                ids = Arrays.stream(ids).boxed().sorted(Comparator.comparingDouble(k -> entropy[k]))
+                        .mapToInt(Integer::intValue).toArray();
+                double[] values = new double[ids.length];
+                for (int k = 0; k < ids.length; k++) values[k] = entropy[ids[k]];
+                sorted.put(entry.getKey(), ids);
+                sortedEntropy.put(entry.getKey(), values);
+            }
+        }
+
+        // Searching each class once keeps the work to the pairs found rather than |members|
+        void after(int i, IntConsumer row) {
+            Integer own = signatureClass[i];
+            for (Map.Entry<Integer, int[]> entry : sorted.entrySet()) {
+                if (own != null && own.equals(entry.getKey())) continue;
+                int[] ids = entry.getValue();
+                double[] values = sortedEntropy.get(entry.getKey());
+                // First entry more than band below, then forward while still less than band above
+                int lo = 0, hi = values.length;
+                while (lo < hi) {
+                    int mid = (lo + hi) >>> 1;
+                    if (entropy[i] - values[mid] >= band) lo = mid + 1; else hi = mid;
+                }
+                for (int k = lo; k < values.length && values[k] - entropy[i] < band; k++) {
+                    if (ids[k] > i) row.accept(ids[k]);
+                }
+            }
+        }
+    }
+
+    // One file's candidates while they are collected; repeats are removed at the end
+    private static final class Row implements IntConsumer {
+        private int[] ids = new int[16];
+        private int count;
+
+        @Override
+        public void accept(int id) {
+            if (count == ids.length) ids = Arrays.copyOf(ids, count * 2);
+            ids[count++] = id;
+        }
+
+        int[] sortedDistinct() {
+            Arrays.sort(ids, 0, count);
+            int distinct = 0;
+            for (int k = 0; k < count; k++) {
+                if (distinct == 0 || ids[distinct - 1] != ids[k]) ids[distinct++] = ids[k];
+            }
+            return Arrays.copyOf(ids, distinct);
+        }
+    }
+}
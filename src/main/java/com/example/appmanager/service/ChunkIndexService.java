@@ -0,0 +1,95 @@
+package com.example.appmanager.service;
+
+import com.example.appmanager.model.FileChunk;
+import com.example.appmanager.repository.FileChunkRepository;
+import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Service;
+import org.springframework.transaction.annotation.Transactional;
+
+import java.io.File;
+import java.nio.file.Paths;
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.HashSet;
+import java.util.List;
+import java.util.Map;
+import java.util.Set;
+
+// Global chunk index kept in the database, so it is bounded by disk rather than heap. The scanner writes
+// each file's chunks as soon as the file is hashed and the index prune drops files that have gone.
+@Service
+public class ChunkIndexService {
+    private static final int DELETE_BATCH_SIZE = 1000;
+
+    @Autowired
+    private FileChunkRepository fileChunkRepository;
+    @Value("${fileguard.detection.shared-pair-max-files:100}")
+    private int sharedPairMaxFiles;
+
+    // chunks as returned by ContentChunker.finish
+    @Transactional
+    public void replace(String path, long[] chunks) {
+        fileChunkRepository.deleteByPathIn(List.of(path));
+        List<FileChunk> rows = new ArrayList<>(chunks.length / 3);
+        for (int i = 0; i < chunks.length; i += 3) {
+            FileChunk chunk = new FileChunk();
+            chunk.setPath(path);
+            chunk.setHash(chunks[i]);
+            chunk.setSize((int) chunks[i + 1]);
+            chunk.setOccurrences((int) chunks[i + 2]);
+            rows.add(chunk);
+        }
+        fileChunkRepository.saveAll(rows);
+    }
+
+    @Transactional
+    public void remove(List<String> paths) {
+        for (int i = 0; i < paths.size(); i += DELETE_BATCH_SIZE) {
+            fileChunkRepository.deleteByPathIn(paths.subList(i, Math.min(i + DELETE_BATCH_SIZE, paths.size())));
+        }
+    }
+
+    // Old path to new path of files that were moved
+    @Transactional
+    public void moved(Map<String, String> paths) {
+        paths.forEach(fileChunkRepository::updatePath);
+    }
+
+    // Totals for the directory and the limit file pairs sharing the most bytes
+    @Transactional(readOnly = true)
+    public SharedBlockReport report(String directory, int limit) {
+        String prefix = Paths.get(directory).toAbsolutePath().toString();
+        if (!prefix.endsWith(File.separator)) {
+            prefix = prefix + File.separator;
+        }
+        String pattern = prefixPattern(prefix);
+        List<Object[]> shared = fileChunkRepository.topSharedPairs(pattern, sharedPairMaxFiles, limit);
+        Set<String> paths = new HashSet<>();
+        for (Object[] row : shared) {
+            paths.add((String) row[0]);
+            paths.add((String) row[1]);
+        }
+        Map<String, Long> bytes = new HashMap<>();
+        if (!paths.isEmpty()) {
+            for (Object[] row : fileChunkRepository.fileBytes(paths)) {
+                bytes.put((String) row[0], ((Number) row[1]).longValue());
+            }
+        }
+        List<SharedBlockReport.Pair> pairs = new ArrayList<>(shared.size());
+        for (Object[] row : shared) {
+            String a = (String) row[0];
+            String b = (String) row[1];
+            pairs.add(new SharedBlockReport.Pair(a, b, ((Number) row[2]).longValue(),
+                    bytes.getOrDefault(a, 0L), bytes.getOrDefault(b, 0L)));
+        }
+        return new SharedBlockReport(directory, fileChunkRepository.totalBytes(pattern),
+                fileChunkRepository.uniqueBytes(pattern), pairs);
+    }
+
+    // LIKE pattern for every path starting with prefix; wildcards in the prefix (e.g. "_" in a directory
+    // name) are escaped with a backslash, the escape character the queries declare
+    static String prefixPattern(String prefix) {
+        return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%";
+    }
+}
@@ -0,0 +1,89 @@
+package com.example.appmanager.service;
+
+import java.nio.ByteBuffer;
+import java.util.HashMap;
+import java.util.Map;
+
+// Content-defined chunking: a gear rolling hash over the stream picks chunk boundaries from the bytes
+// themselves, so inserting or removing data only changes the chunks around the edit and two files that
+// share a run of bytes share the chunks inside it, wherever the run sits. Boundaries use a stricter mask
+// below the average size and a looser one above it, which keeps chunk sizes close to the average.
+// Every chunk is identified by a 64-bit FNV-1a hash of its bytes.
+public class ContentChunker {
+    private static final long FNV_OFFSET = 0xcbf29ce484222325L;
+    private static final long FNV_PRIME = 0x100000001b3L;
+    private static final long[] GEAR = new long[256];
+
+    static {
+        long seed = 0x2545F4914F6CDD1DL;
+        for (int i = 0; i < GEAR.length; i++) {
+            seed += 0x9E3779B97F4A7C15L;
+            GEAR[i] = mix(seed);
+        }
+    }
+
+    private final int minSize;
+    private final int averageSize;
+    private final int maxSize;
+    // The gear hash shifts left, so its top bits depend on the most bytes
+    private final long strictMask;
+    private final long looseMask;
+    private final Map<Long, long[]> chunks = new HashMap<>();
+    private long fingerprint;
+    private long hash = FNV_OFFSET;
+    private int length;
+
+    // averageSize is rounded down to a power of two; chunks are between a quarter and four times of it
+    public ContentChunker(int averageSize) {
+        this.averageSize = Integer.highestOneBit(Math.max(256, averageSize));
+        this.minSize = this.averageSize / 4;
+        this.maxSize = this.averageSize * 4;
+        int bits = Integer.numberOfTrailingZeros(this.averageSize);
+        this.strictMask = -1L << (64 - (bits + 1));
+        this.looseMask = -1L << (64 - (bits - 1));
+    }
+
+    public void update(ByteBuffer buffer) {
+        int end = buffer.limit();
+        for (int i = buffer.position(); i < end; i++) {
+            int b = buffer.get(i) & 0xFF;
+            hash = (hash ^ b) * FNV_PRIME;
+            length++;
+            // No boundary can fall inside the minimum size, so the rolling hash starts after it
+            if (length < minSize) continue;
+            fingerprint = (fingerprint << 1) + GEAR[b];
+            long mask = length < averageSize ? strictMask : looseMask;
+            if ((fingerprint & mask) == 0 || length >= maxSize) {
+                cut();
+            }
+        }
+    }
+
+    // Distinct chunks as (hash, size, occurrences) triples; a chunk repeated inside the file is counted
+    public long[] finish() {
+        if (length > 0) cut();
+        long[] result = new long[chunks.size() * 3];
+        int i = 0;
+        for (Map.Entry<Long, long[]> chunk : chunks.entrySet()) {
+            result[i++] = chunk.getKey();
+            result[i++] = chunk.getValue()[0];
+            result[i++] = chunk.getValue()[1];
+        }
+        return result;
+    }
+
+    private void cut() {
+        long key = mix(hash ^ length);
+        long[] chunk = chunks.computeIfAbsent(key, k -> new long[] { length, 0 });
+        chunk[1]++;
+        fingerprint = 0;
+        hash = FNV_OFFSET;
+        length = 0;
+    }
+
+    private static long mix(long z) {
+        z = (z ^ (z >>> 30)) * 0xBF58476D1CE4E5B9L;
+        z = (z ^ (z >>> 27)) * 0x94D049BB133111EBL;
+        return z ^ (z >>> 31);
+    }
+}
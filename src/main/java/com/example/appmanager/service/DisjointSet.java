@@ -0,0 +1,44 @@
+package com.example.appmanager.service;
+
+// Union-find over 0..n-1 with union by size and path halving, so grouping files by their matching
+// pairs takes near-constant time per pair and memory proportional to the number of files
+public class DisjointSet {
+    private final int[] parent;
+    private final int[] size;
+
+    public DisjointSet(int n) {
+        parent = new int[n];
+        size = new int[n];
+        for (int i = 0; i < n; i++) {
+            parent[i] = i;
+            size[i] = 1;
+        }
+    }
+
+    public int find(int x) {
+        while (parent[x] != x) {
+            parent[x] = parent[parent[x]];
+            x = parent[x];
+        }
+        return x;
+    }
+
+    // Returns false if a and b were already in the same set
+    public boolean union(int a, int b) {
+        int rootA = find(a);
+        int rootB = find(b);
+        if (rootA == rootB) return false;
+        if (size[rootA] < size[rootB]) {
+            int t = rootA;
+            rootA = rootB;
+            rootB = t;
+        }
+        parent[rootB] = rootA;
+        size[rootA] += size[rootB];
+        return true;
+    }
+
+    public int size(int x) {
+        return size[find(x)];
+    }
+}
@@ -1,15 +1,54 @@
 package com.example.appmanager.service;
 
 import com.example.appmanager.model.ApplicationFile;
+import jakarta.annotation.PostConstruct;
+import jakarta.annotation.PreDestroy;
+import org.springframework.beans.factory.annotation.Value;
 import org.springframework.stereotype.Service;
 
 import java.util.HashMap;
 import java.util.List;
 import java.util.Map;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ForkJoinPool;
+import java.util.concurrent.ForkJoinTask;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.TimeoutException;
+import java.util.concurrent.atomic.AtomicBoolean;
 import java.util.stream.Collectors;
+import java.util.stream.IntStream;
 
 @Service
 public class DuplicateDetectorService {
+    @Value("${fileguard.detection.near-duplicates:true}")
+    private boolean nearDuplicates;
+    // MinHash LSH for text: more bands or fewer rows per band raise recall and the number of pairs scored
+    @Value("${fileguard.detection.text-lsh.bands:20}")
+    private int textBands;
+    @Value("${fileguard.detection.text-lsh.rows:5}")
+    private int textRows;
+    // Audio candidates from shared chroma code runs; false scores every pair of fingerprinted audio files
+    @Value("${fileguard.detection.audio-run-keys:true}")
+    private boolean audioRunKeys;
+    // Threads scoring candidate pairs; 0 means one per available processor
+    @Value("${fileguard.detection.threads:0}")
+    private int detectionThreads;
+    // Wall-clock budget for scoring candidate pairs; groups found so far are returned once it runs out. 0 = none
+    @Value("${fileguard.detection.timeout-seconds:300}")
+    private long timeoutSeconds;
+
+    private ForkJoinPool pool;
+
+    @PostConstruct
+    void startPool() {
+        pool = new ForkJoinPool(detectionThreads > 0 ? detectionThreads : Runtime.getRuntime().availableProcessors());
+    }
+
+    @PreDestroy
+    void stopPool() {
+        pool.shutdownNow();
+    }
+
     public Map<String, List<ApplicationFile>> findDuplicates(List<ApplicationFile> files) {
         Map<String, List<ApplicationFile>> groupedByHash = files.stream()
                 .collect(Collectors.groupingBy(ApplicationFile::getHash));
@@ -24,50 +63,120 @@ public class DuplicateDetectorService {
             }
         }
 
+        if (!nearDuplicates) {
+            return duplicates;
+        }
+
         // Hybrid: For files with unique hashes, check for further similarity
         List<ApplicationFile> nonDuplicateFiles = files.stream()
                 .filter(f -> groupedByHash.get(f.getHash()).size() == 1)
                 .collect(Collectors.toList());
         Map<String, List<ApplicationFile>> hybridDuplicates = new HashMap<>();
-        boolean[] visited = new boolean[nonDuplicateFiles.size()];
-        for (int i = 0; i < nonDuplicateFiles.size(); i++) {
-            if (visited[i]) continue;
-            ApplicationFile fileA = nonDuplicateFiles.get(i);
-            List<ApplicationFile> group = new java.util.ArrayList<>();
-            group.add(fileA);
-            for (int j = i + 1; j < nonDuplicateFiles.size(); j++) {
-                if (visited[j]) continue;
-                ApplicationFile fileB = nonDuplicateFiles.get(j);
-                double similarity = calculateSimilarity(fileA, fileB);
-                if (similarity > getSimilarityThreshold(fileA.getFileType())) {
-                    fileB.setSimilarityScore(similarity);
-                    group.add(fileB);
-                    visited[j] = true;
+        // Only pairs that can clear their threshold are scored, still in ascending j order
+        for (ApplicationFile file : nonDuplicateFiles) {
+            if (file.getFileType().equals("txt")) {
+                try {
+                    textTokens(file);
+                } catch (Exception e) {
+                    System.err.println("Error reading text file " + file.getName() + ": " + e.getMessage());
                 }
             }
-            if (group.size() > 1) {
-                // Set similarity for the first file based on the group
-                double avgSimilarity = group.stream()
-                    .mapToDouble(ApplicationFile::getSimilarityScore)
-                    .average()
-                    .orElse(0.0);
-                fileA.setSimilarityScore(avgSimilarity);
-                
-                // Use a synthetic key for hybrid groups
-                String key = "hybrid-" + fileA.getName() + "-" + fileA.getSize();
-                hybridDuplicates.put(key, group);
-            }
+        }
+        CandidateBlocker blocker = new CandidateBlocker(nonDuplicateFiles, textBands, textRows, audioRunKeys,
+                frames -> VideoHash.radius(getSimilarityThreshold("mp4"), frames),
+                hashes -> ImageHash.radius(getSimilarityThreshold("jpg"), hashes),
+                getSimilarityThreshold("zip") / 100.0);
+        // Matching pairs are merged as rows finish, so a group holds every file reachable through matches
+        // whatever the list order or the order rows finished in. Each file keeps the score of its best match.
+        DisjointSet groups = new DisjointSet(nonDuplicateFiles.size());
+        double[] bestScore = new double[nonDuplicateFiles.size()];
+        scoreCandidates(nonDuplicateFiles, blocker, groups, bestScore);
+        // Components in order of their first file, members in list order
+        Map<Integer, List<ApplicationFile>> components = new java.util.LinkedHashMap<>();
+        for (int i = 0; i < nonDuplicateFiles.size(); i++) {
+            if (groups.size(i) < 2) continue;
+            ApplicationFile file = nonDuplicateFiles.get(i);
+            file.setSimilarityScore(bestScore[i]);
+            components.computeIfAbsent(groups.find(i), k -> new java.util.ArrayList<>()).add(file);
+        }
+        for (List<ApplicationFile> group : components.values()) {
+            // Use a synthetic key for hybrid groups: the first file's id, which no other group can contain
+            hybridDuplicates.put("hybrid-" + group.get(0).getId(), group);
         }
         // Merge SHA and hybrid duplicates
         duplicates.putAll(hybridDuplicates);
         return duplicates;
     }
 
+    // Rows (a file and its later candidates) are generated and scored on the work-stealing pool. Each row's
+    // matches are merged into groups and bestScore as soon as the row is done, so only rows in flight hold
+    // their candidates and matches. Rows not reached within the time budget are left out.
+    private void scoreCandidates(List<ApplicationFile> files, CandidateBlocker blocker, DisjointSet groups,
+                                 double[] bestScore) {
+        // Set while holding the groups lock: once it is set no row merges any more, so the caller can
+        // read the results while cancelled rows are still winding down
+        AtomicBoolean stop = new AtomicBoolean();
+        ForkJoinTask<?> task = pool.submit(() -> IntStream.range(0, files.size()).parallel().forEach(i -> {
+            if (stop.get()) return;
+            double[] row = scoreRow(files, blocker.candidates(i), i);
+            if (row.length == 0) return;
+            synchronized (groups) {
+                if (stop.get()) return;
+                for (int m = 0; m < row.length; m += 2) {
+                    int j = (int) row[m];
+                    double similarity = row[m + 1];
+                    groups.union(i, j);
+                    bestScore[i] = Math.max(bestScore[i], similarity);
+                    bestScore[j] = Math.max(bestScore[j], similarity);
+                }
+            }
+        }));
+        try {
+            if (timeoutSeconds > 0) {
+                task.get(timeoutSeconds, TimeUnit.SECONDS);
+            } else {
+                task.get();
+            }
+        } catch (TimeoutException e) {
+            stopScoring(groups, stop, task);
+            System.err.println("Near-duplicate scoring stopped after " + timeoutSeconds + " s; groups are incomplete");
+        } catch (InterruptedException e) {
+            stopScoring(groups, stop, task);
+            Thread.currentThread().interrupt();
+        } catch (ExecutionException e) {
+            if (e.getCause() instanceof RuntimeException) throw (RuntimeException) e.getCause();
+            throw new IllegalStateException(e.getCause());
+        }
+    }
+
+    private void stopScoring(DisjointSet groups, AtomicBoolean stop, ForkJoinTask<?> task) {
+        synchronized (groups) {
+            stop.set(true);
+        }
+        task.cancel(true);
+    }
+
+    private double[] scoreRow(List<ApplicationFile> files, int[] candidates, int i) {
+        ApplicationFile fileA = files.get(i);
+        // (j, similarity) pairs; the buffer doubles when full
+        double[] row = new double[8];
+        int length = 0;
+        for (int j : candidates) {
+            double similarity = calculateSimilarity(fileA, files.get(j));
+            if (similarity > getSimilarityThreshold(fileA.getFileType())) {
+                if (length == row.length) row = java.util.Arrays.copyOf(row, 2 * length);
+                row[length++] = j;
+                row[length++] = similarity;
+            }
+        }
+        return java.util.Arrays.copyOf(row, length);
+    }
+
     private double calculateSimilarity(ApplicationFile a, ApplicationFile b) {
         // Text file similarity
         if (a.getFileType().equals("txt") && b.getFileType().equals("txt")) {
             try {
-                double jaccard = jaccardSimilarity(a.getPath(), b.getPath());
+                double jaccard = jaccardSimilarity(a, b);
                 return jaccard * 100.0; // Convert to percentage
             } catch (Exception e) { 
                 System.err.println("Error calculating Jaccard similarity: " + e.getMessage());
@@ -77,6 +186,11 @@ public class DuplicateDetectorService {
         
         // Audio file similarity (wav, mp3, flac, etc.)
         if (isAudioFile(a.getFileType()) && isAudioFile(b.getFileType())) {
+            // Decoded audio is compared by what it sounds like, whatever the container and byte layout
+            if (hasAudioFingerprint(a) && hasAudioFingerprint(b)) {
+                return AudioFingerprint.compare(a.getAudioFingerprint(), b.getAudioFingerprint());
+            }
+
             // First try ssdeep comparison
             if (a.getSsdeepHash() != null && b.getSsdeepHash() != null && 
                 !a.getSsdeepHash().isEmpty() && !b.getSsdeepHash().isEmpty()) {
@@ -105,6 +219,11 @@ public class DuplicateDetectorService {
         
         // Video file similarity (mp4, avi, mov, mkv, etc.)
         if (isVideoFile(a.getFileType()) && isVideoFile(b.getFileType())) {
+            // Sampled frames are compared by how they look, whatever the container and encoding
+            if (hasVideoHash(a) && hasVideoHash(b) && a.getVideoHash().length == b.getVideoHash().length) {
+                return VideoHash.compare(a.getVideoHash(), b.getVideoHash());
+            }
+
             // First try ssdeep comparison for video files
             if (a.getSsdeepHash() != null && b.getSsdeepHash() != null && 
                 !a.getSsdeepHash().isEmpty() && !b.getSsdeepHash().isEmpty()) {
@@ -132,6 +251,16 @@ public class DuplicateDetectorService {
             }
         }
         
+        // Image similarity: resized and re-encoded copies keep their perceptual hashes
+        if (isImageFile(a.getFileType()) && isImageFile(b.getFileType()) && hasImageHash(a) && hasImageHash(b)) {
+            return ImageHash.compare(a.getImageHash(), b.getImageHash());
+        }
+
+        // Archive similarity: share of member bytes that are identical, whatever the members are called
+        if (isArchiveFile(a.getFileType()) && isArchiveFile(b.getFileType()) && hasArchiveMembers(a) && hasArchiveMembers(b)) {
+            return ArchiveManifest.overlap(a.getArchiveMembers(), b.getArchiveMembers()) * 100.0;
+        }
+
         // Binary file similarity (non-audio, non-video, non-text)
         if (!a.getFileType().equals("txt") && !b.getFileType().equals("txt") && 
             !isAudioFile(a.getFileType()) && !isAudioFile(b.getFileType()) &&
@@ -158,30 +287,50 @@ public class DuplicateDetectorService {
     }
     
     private boolean isAudioFile(String fileType) {
-        return fileType.equals("wav") || fileType.equals("mp3") || fileType.equals("flac") || 
-               fileType.equals("aac") || fileType.equals("ogg") || fileType.equals("m4a") ||
-               fileType.equals("wma") || fileType.equals("aiff");
+        return FileFamily.of(fileType) == FileFamily.AUDIO;
     }
     
+    private boolean hasAudioFingerprint(ApplicationFile file) {
+        return file.getAudioFingerprint() != null && file.getAudioFingerprint().length > 0;
+    }
+
+    private boolean hasVideoHash(ApplicationFile file) {
+        return file.getVideoHash() != null && file.getVideoHash().length > 0;
+    }
+
+    private boolean isImageFile(String fileType) {
+        return FileFamily.of(fileType) == FileFamily.IMAGE;
+    }
+
+    private boolean hasImageHash(ApplicationFile file) {
+        return file.getImageHash() != null && file.getImageHash().length > 0;
+    }
+
+    private boolean isArchiveFile(String fileType) {
+        return FileFamily.of(fileType) == FileFamily.ARCHIVE;
+    }
+
+    private boolean hasArchiveMembers(ApplicationFile file) {
+        return file.getArchiveMembers() != null && file.getArchiveMembers().length > 0;
+    }
+
     private boolean isVideoFile(String fileType) {
-        return fileType.equals("mp4") || fileType.equals("avi") || fileType.equals("mov") || 
-               fileType.equals("mkv") || fileType.equals("wmv") || fileType.equals("flv") ||
-               fileType.equals("webm") || fileType.equals("m4v") || fileType.equals("3gp") ||
-               fileType.equals("ogv") || fileType.equals("ts") || fileType.equals("mts");
+        return FileFamily.of(fileType) == FileFamily.VIDEO;
     }
 
     private double getSimilarityThreshold(String fileType) {
         if (fileType.equals("txt")) return 80.0; // 80% for text files
         if (isAudioFile(fileType)) return 70.0; // 70% for audio files (more lenient)
         if (isVideoFile(fileType)) return 60.0; // 60% for video files (very lenient due to compression differences)
-        return 90.0; // 90% for other binary files
+        if (isImageFile(fileType)) return 85.0; // 85% for images (perceptual hashes, under 5 of 64 bits apart)
+        return 90.0; // 90% for archives (of member bytes) and other binary files
     }
 
     // Hybrid similarity: size, type, and entropy must match closely
     private boolean isSimilar(ApplicationFile a, ApplicationFile b) {
         if (a.getFileType().equals("txt") && b.getFileType().equals("txt")) {
             try {
-                double jaccard = jaccardSimilarity(a.getPath(), b.getPath());
+                double jaccard = jaccardSimilarity(a, b);
                 if (jaccard > 0.8) return true; // threshold for near-duplicate
             } catch (Exception e) { /* ignore */ }
         }
@@ -199,55 +348,20 @@ public class DuplicateDetectorService {
         return Math.abs(a.getEntropy() - b.getEntropy()) < 0.01;
     }
 
-    private double jaccardSimilarity(String pathA, String pathB) throws java.io.IOException {
-        java.util.Set<String> setA = new java.util.HashSet<>(java.util.Arrays.asList(
-            new String(java.nio.file.Files.readAllBytes(java.nio.file.Paths.get(pathA)))
-                .toLowerCase().replaceAll("[^a-z0-9 ]", " ").split("\\s+")
-        ));
-        java.util.Set<String> setB = new java.util.HashSet<>(java.util.Arrays.asList(
-            new String(java.nio.file.Files.readAllBytes(java.nio.file.Paths.get(pathB)))
-                .toLowerCase().replaceAll("[^a-z0-9 ]", " ").split("\\s+")
-        ));
-        java.util.Set<String> intersection = new java.util.HashSet<>(setA);
-        intersection.retainAll(setB);
-        java.util.Set<String> union = new java.util.HashSet<>(setA);
-        union.addAll(setB);
-        return union.isEmpty() ? 0.0 : (double) intersection.size() / union.size();
+    // In-memory Jaccard over the word fingerprints taken at scan time
+    private double jaccardSimilarity(ApplicationFile a, ApplicationFile b) throws java.io.IOException {
+        return TextShingles.jaccard(textTokens(a), textTokens(b));
     }
 
-    private int ssdeepCompare(String hashA, String hashB) throws java.io.IOException, InterruptedException {
-        try {
-            // Use ssdeep -v for comparison
-            ProcessBuilder pb = new ProcessBuilder("ssdeep", "-v", hashA, hashB);
-            pb.redirectErrorStream(true);
-            Process process = pb.start();
-            java.io.BufferedReader reader = new java.io.BufferedReader(new java.io.InputStreamReader(process.getInputStream()));
-            String line;
-            int score = 0;
-            while ((line = reader.readLine()) != null) {
-                if (line.contains(":")) {
-                    // Expected format: "hash1:hash2:score"
-                    String[] parts = line.split(":");
-                    if (parts.length == 3) {
-                        try {
-                            score = Integer.parseInt(parts[2].trim());
-                            break;
-                        } catch (NumberFormatException e) {
-                            // Try alternative parsing
-                            String scoreStr = parts[2].replaceAll("[^0-9]", "");
-                            if (!scoreStr.isEmpty()) {
-                                score = Integer.parseInt(scoreStr);
-                                break;
-                            }
-                        }
-                    }
-                }
-            }
-            process.waitFor();
-            return score;
-        } catch (Exception e) {
-            System.err.println("Error in ssdeep comparison: " + e.getMessage());
-            return 0;
+    // Results saved before fingerprints were stored are tokenised once from disk and kept on the file
+    private long[] textTokens(ApplicationFile file) throws java.io.IOException {
+        if (file.getTextTokens() == null) {
+            file.setTextTokens(TextShingles.tokenHashes(java.nio.file.Files.readAllBytes(java.nio.file.Paths.get(file.getPath()))));
         }
+        return file.getTextTokens();
+    }
+
+    private int ssdeepCompare(String hashA, String hashB) {
+        return Ssdeep.compare(hashA, hashB);
     }
-}
\ No newline at end of file
+}
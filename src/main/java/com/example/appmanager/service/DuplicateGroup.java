@@ -0,0 +1,20 @@
+package com.example.appmanager.service;
+
+import java.util.List;
+
+// One group of the duplicate report as served by the result API
+public class DuplicateGroup {
+    private final String key;
+    private final List<FileRow> files;
+    private final long totalSize;
+
+    public DuplicateGroup(String key, List<FileRow> files, long totalSize) {
+        this.key = key;
+        this.files = files;
+        this.totalSize = totalSize;
+    }
+
+    public String getKey() { return key; }
+    public List<FileRow> getFiles() { return files; }
+    public long getTotalSize() { return totalSize; }
+}
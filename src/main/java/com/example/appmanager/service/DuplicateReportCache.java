@@ -0,0 +1,129 @@
+package com.example.appmanager.service;
+
+import com.example.appmanager.model.ApplicationFile;
+import com.example.appmanager.repository.ApplicationFileRepository;
+import com.example.appmanager.repository.DuplicateFileView;
+import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Service;
+
+import java.util.ArrayList;
+import java.util.Collection;
+import java.util.HashSet;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.Set;
+import java.util.concurrent.atomic.AtomicLong;
+
+// The last duplicate report, valid for one generation of the stored scan results. Scans bump the
+// generation whenever they change the results; removals derive a new report from the cached one.
+@Service
+public class DuplicateReportCache {
+    @Autowired
+    private ApplicationFileRepository applicationFileRepository;
+    @Autowired
+    private DuplicateDetectorService duplicateDetectorService;
+    @Value("${fileguard.detection.near-duplicates:true}")
+    private boolean nearDuplicates;
+
+    private final AtomicLong generation = new AtomicLong();
+    private Map<String, List<ApplicationFile>> report;
+    private long reportGeneration = -1;
+
+    public void invalidate() {
+        generation.incrementAndGet();
+    }
+
+    public long getGeneration() {
+        return generation.get();
+    }
+
+    // The cached report if the results have not changed since it was built, otherwise a fresh one.
+    // Reports are replaced, never modified, so callers may keep reading the one they got.
+    public synchronized Map<String, List<ApplicationFile>> get() {
+        long current = generation.get();
+        if (report == null || reportGeneration != current) {
+            Map<String, List<ApplicationFile>> duplicates = exactDuplicates();
+            if (nearDuplicates) {
+                // Only files with a hash of their own are loaded in full, in path order for stable groups
+                duplicates.putAll(duplicateDetectorService.findDuplicates(applicationFileRepository.findUniqueHashFiles()));
+            }
+            report = duplicates;
+            reportGeneration = current;
+        }
+        return report;
+    }
+
+    // Grouped by the database, so the work grows with the number of duplicates, not of scanned files
+    private Map<String, List<ApplicationFile>> exactDuplicates() {
+        Map<String, List<ApplicationFile>> groups = new LinkedHashMap<>();
+        for (DuplicateFileView view : applicationFileRepository.findExactDuplicates()) {
+            ApplicationFile file = new ApplicationFile();
+            file.setId(view.getId());
+            file.setName(view.getName());
+            file.setPath(view.getPath());
+            file.setHash(view.getHash());
+            file.setSize(view.getSize());
+            file.setFileType(view.getFileType());
+            file.setSimilarityScore(100.0);
+            groups.computeIfAbsent(view.getHash(), k -> new ArrayList<>()).add(file);
+        }
+        return groups;
+    }
+
+    // Called after the given files were deleted. Only the groups that contained them are touched: exact
+    // groups lose those members and near-duplicate groups are regrouped from their remaining members, as
+    // a removed file may have been the only link between the others. If an exact group is left with one
+    // file, that file now takes part in near-duplicate matching against everything, so the next request
+    // rebuilds the report instead.
+    public synchronized void removed(Collection<Long> fileIds) {
+        long current = generation.incrementAndGet();
+        if (report == null || reportGeneration != current - 1) return;
+        Set<Long> ids = new HashSet<>(fileIds);
+        Map<String, List<ApplicationFile>> updated = new LinkedHashMap<>();
+        for (Map.Entry<String, List<ApplicationFile>> group : report.entrySet()) {
+            List<ApplicationFile> remaining = new ArrayList<>();
+            for (ApplicationFile file : group.getValue()) {
+                if (!ids.contains(file.getId())) remaining.add(file);
+            }
+            if (remaining.size() == group.getValue().size()) {
+                updated.put(group.getKey(), group.getValue());
+            } else if (!group.getKey().startsWith("hybrid-")) {
+                if (remaining.size() == 1) return;
+                if (remaining.size() > 1) updated.put(group.getKey(), remaining);
+            } else if (remaining.size() > 1) {
+                // Regrouping sets similarity scores, so it works on copies rather than on the files of the
+                // report callers may still be reading
+                List<ApplicationFile> copies = new ArrayList<>(remaining.size());
+                for (ApplicationFile file : remaining) copies.add(copy(file));
+                updated.putAll(duplicateDetectorService.findDuplicates(copies));
+            }
+        }
+        report = updated;
+        reportGeneration = current;
+    }
+
+    // Shares the signature arrays, which nothing modifies
+    private static ApplicationFile copy(ApplicationFile file) {
+        ApplicationFile copy = new ApplicationFile();
+        copy.setId(file.getId());
+        copy.setName(file.getName());
+        copy.setPath(file.getPath());
+        copy.setHash(file.getHash());
+        copy.setSize(file.getSize());
+        copy.setFileType(file.getFileType());
+        copy.setEntropy(file.getEntropy());
+        copy.setSsdeepHash(file.getSsdeepHash());
+        copy.setSimilarityScore(file.getSimilarityScore());
+        copy.setTextTokens(file.getTextTokens());
+        copy.setAudioFingerprint(file.getAudioFingerprint());
+        copy.setVideoHash(file.getVideoHash());
+        copy.setImageHash(file.getImageHash());
+        copy.setArchiveMembers(file.getArchiveMembers());
+        copy.setChunkCount(file.getChunkCount());
+        copy.setScanJob(file.getScanJob());
+        copy.setCategory(file.getCategory());
+        return copy;
+    }
+}
@@ -0,0 +1,24 @@
+package com.example.appmanager.service;
+
+import java.util.Set;
+
+// Groups file extensions by the similarity rules DuplicateDetectorService applies to them
+public enum FileFamily {
+    TEXT, AUDIO, VIDEO, IMAGE, ARCHIVE, BINARY;
+
+    private static final Set<String> AUDIO_TYPES = Set.of("wav", "mp3", "flac", "aac", "ogg", "m4a", "wma", "aiff");
+    private static final Set<String> VIDEO_TYPES = Set.of("mp4", "avi", "mov", "mkv", "wmv", "flv", "webm", "m4v",
+            "3gp", "ogv", "ts", "mts");
+    private static final Set<String> IMAGE_TYPES = Set.of("jpg", "jpeg", "png", "gif", "bmp", "tiff", "tif", "webp");
+    // Zip-format containers, compared by the members listed in their central directory
+    private static final Set<String> ARCHIVE_TYPES = Set.of("zip", "jar", "apk", "war", "ear", "aar");
+
+    public static FileFamily of(String fileType) {
+        if (fileType.equals("txt")) return TEXT;
+        if (AUDIO_TYPES.contains(fileType)) return AUDIO;
+        if (VIDEO_TYPES.contains(fileType)) return VIDEO;
+        if (IMAGE_TYPES.contains(fileType)) return IMAGE;
+        if (ARCHIVE_TYPES.contains(fileType)) return ARCHIVE;
+        return BINARY;
+    }
+}
@@ -0,0 +1,47 @@
+package com.example.appmanager.service;
+
+import com.example.appmanager.model.ApplicationFile;
+import com.example.appmanager.repository.FileRowView;
+
+// What the result pages show of a scanned file, without its fingerprints. Serialized by the result API.
+public class FileRow {
+    private final Long id;
+    private final String name;
+    private final String path;
+    private final long size;
+    private final String fileType;
+    private final String hash;
+    private final double similarityScore;
+    private final String category;
+
+    public FileRow(ApplicationFile file) {
+        this.id = file.getId();
+        this.name = file.getName();
+        this.path = file.getPath();
+        this.size = file.getSize();
+        this.fileType = file.getFileType();
+        this.hash = file.getHash();
+        this.similarityScore = file.getSimilarityScore();
+        this.category = file.getCategory() != null ? file.getCategory().getName() : null;
+    }
+
+    public FileRow(FileRowView file) {
+        this.id = file.getId();
+        this.name = file.getName();
+        this.path = file.getPath();
+        this.size = file.getSize();
+        this.fileType = file.getFileType();
+        this.hash = file.getHash();
+        this.similarityScore = file.getSimilarityScore();
+        this.category = file.getCategory() != null ? file.getCategory().getName() : null;
+    }
+
+    public Long getId() { return id; }
+    public String getName() { return name; }
+    public String getPath() { return path; }
+    public long getSize() { return size; }
+    public String getFileType() { return fileType; }
+    public String getHash() { return hash; }
+    public double getSimilarityScore() { return similarityScore; }
+    public String getCategory() { return category; }
+}
@@ -1,99 +1,542 @@
 package com.example.appmanager.service;
 
 import com.example.appmanager.model.ApplicationFile;
-import org.apache.commons.io.FileUtils;
+import com.example.appmanager.model.FileSignature;
+import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.beans.factory.annotation.Value;
 import org.springframework.stereotype.Service;
 
 import java.io.File;
-import java.io.FileInputStream;
 import java.io.IOException;
+import java.io.InterruptedIOException;
+import java.nio.ByteBuffer;
+import java.nio.channels.FileChannel;
+import java.nio.file.FileSystemLoopException;
+import java.nio.file.FileVisitOption;
+import java.nio.file.FileVisitResult;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.Paths;
+import java.nio.file.SimpleFileVisitor;
+import java.nio.file.StandardOpenOption;
+import java.nio.file.attribute.BasicFileAttributes;
 import java.security.MessageDigest;
 import java.security.NoSuchAlgorithmException;
 import java.util.ArrayList;
-import java.util.Collection;
+import java.util.Collections;
+import java.util.Comparator;
+import java.util.EnumSet;
+import java.util.HashMap;
 import java.util.List;
+import java.util.Map;
+import java.util.Set;
+import java.util.concurrent.ArrayBlockingQueue;
+import java.util.concurrent.CancellationException;
+import java.util.concurrent.CompletableFuture;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.Semaphore;
+import java.util.concurrent.ThreadPoolExecutor;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicInteger;
+import java.util.concurrent.atomic.AtomicReference;
+import java.util.function.Consumer;
 
 @Service
 public class FileScannerService {
+    private static final int READ_BUFFER_SIZE = 1 << 20;
+    private static final ThreadLocal<ByteBuffer> READ_BUFFER =
+            ThreadLocal.withInitial(() -> ByteBuffer.allocateDirect(READ_BUFFER_SIZE));
+    // Bytes hashed from each end of a file when same-size files are compared before a full read
+    private static final int PARTIAL_HASH_BYTES = 4096;
+
+    @Autowired
+    private ScanIndexService scanIndexService;
+    @Autowired
+    private ChunkIndexService chunkIndexService;
+
+    // Cross-check the in-process ssdeep hash against the external ssdeep binary
+    @Value("${fileguard.ssdeep.verify:false}")
+    private boolean verifySsdeep;
+
+    // Hashing threads; 0 means one per available processor
+    @Value("${fileguard.scan.threads:0}")
+    private int scanThreads;
+    // Files waiting for a hashing thread before the walker starts hashing files itself
+    @Value("${fileguard.scan.queue-capacity:1024}")
+    private int queueCapacity;
+    // Files read concurrently from one device; 0 means no limit beyond the thread count
+    @Value("${fileguard.scan.device-concurrency:0}")
+    private int deviceConcurrency;
+    // Per-device overrides as "<file store name>=<limit>,...", e.g. "/dev/sda1=1,/dev/nvme0n1p2=16"
+    @Value("${fileguard.scan.device-limits:}")
+    private String deviceLimits;
+    // false: exact duplicates only. Files are grouped by size, then by a hash of their first and last
+    // few KB, and only files that still collide are read in full; no ssdeep hash or entropy is computed.
+    @Value("${fileguard.detection.near-duplicates:true}")
+    private boolean nearDuplicates;
+    // Decode audio at scan time and store a chroma fingerprint for perceptual matching
+    @Value("${fileguard.detection.audio-fingerprint:true}")
+    private boolean audioFingerprints;
+    // Sample this many frames per video with ffmpeg for a perceptual signature; 0 turns video hashing off
+    @Value("${fileguard.detection.video-hash.frames:8}")
+    private int videoHashFrames;
+    // Decode images (subsampled) at scan time for perceptual hashing
+    @Value("${fileguard.detection.image-hash:true}")
+    private boolean imageHashes;
+    // Read the member list of zip, jar, apk, ... archives at scan time for member-level comparison
+    @Value("${fileguard.detection.archive-members:true}")
+    private boolean archiveMembers;
+    // Average content-defined chunk size in bytes for the shared block index; 0 turns chunking off
+    @Value("${fileguard.detection.chunk-size:65536}")
+    private int chunkSize;
+    @Value("${fileguard.ffmpeg.path:ffmpeg}")
+    private String ffmpegPath;
+    @Value("${fileguard.ffprobe.path:ffprobe}")
+    private String ffprobePath;
+
     public List<ApplicationFile> scanDirectory(String directoryPath) throws IOException, NoSuchAlgorithmException {
-        List<ApplicationFile> applicationFiles = new ArrayList<>();
-        Collection<File> files = FileUtils.listFiles(new File(directoryPath), null, true);
-        for (File file : files) {
-            ApplicationFile appFile = new ApplicationFile();
-            appFile.setName(file.getName());
-            appFile.setPath(file.getAbsolutePath());
-            appFile.setSize(file.length());
-            appFile.setFileType(getFileExtension(file));
-            if (appFile.getFileType().equals("txt")) {
-                appFile.setHash(computeNormalizedTextHash(file));
+        List<ApplicationFile> applicationFiles = Collections.synchronizedList(new ArrayList<>());
+        scanDirectory(directoryPath, applicationFiles::add);
+        // Workers finish in any order; keep the result stable between scans
+        applicationFiles.sort(Comparator.comparing(ApplicationFile::getPath));
+        return applicationFiles;
+    }
+
+    // Walks the tree on the calling thread while a bounded pool hashes the files it finds. Results are
+    // handed to the sink from worker threads as soon as each file is done. When the work queue is full the
+    // walker hashes the next file itself, which throttles discovery to the speed of the disks.
+    // Files whose path, size, mtime and inode match the signature index are not read at all.
+    public void scanDirectory(String directoryPath, Consumer<ApplicationFile> sink) throws IOException, NoSuchAlgorithmException {
+        scanDirectory(directoryPath, sink, new ScanProgress());
+    }
+
+    // Same as above, reporting live counters to progress. Once progress is cancelled the walk stops, queued
+    // files are skipped and a CancellationException is thrown after in-flight files have finished.
+    public void scanDirectory(String directoryPath, Consumer<ApplicationFile> sink, ScanProgress progress)
+            throws IOException, NoSuchAlgorithmException {
+        Consumer<ApplicationFile> results = appFile -> {
+            progress.fileHashed();
+            sink.accept(appFile);
+        };
+        Path root = Paths.get(directoryPath).toAbsolutePath();
+        ScanIndex index = scanIndexService.open(root);
+        int threads = scanThreads > 0 ? scanThreads : Runtime.getRuntime().availableProcessors();
+        AtomicInteger workerCount = new AtomicInteger();
+        ThreadPoolExecutor executor = new ThreadPoolExecutor(threads, threads, 0L, TimeUnit.MILLISECONDS,
+                new ArrayBlockingQueue<>(Math.max(1, queueCapacity)),
+                r -> new Thread(r, "scan-worker-" + workerCount.incrementAndGet()),
+                new ThreadPoolExecutor.CallerRunsPolicy());
+        Map<Object, Semaphore> devices = new ConcurrentHashMap<>();
+        AtomicReference<Exception> failure = new AtomicReference<>();
+        List<PendingFile> pending = new ArrayList<>();
+        Set<Long> knownSizes = ConcurrentHashMap.newKeySet();
+
+        try {
+            Files.walkFileTree(root, EnumSet.of(FileVisitOption.FOLLOW_LINKS), Integer.MAX_VALUE,
+                    new SimpleFileVisitor<Path>() {
+                        private final Map<Path, Semaphore> directoryDevices = new HashMap<>();
+
+                        @Override
+                        public FileVisitResult preVisitDirectory(Path dir, BasicFileAttributes attrs) {
+                            directoryDevices.put(dir, deviceSemaphore(dir, devices, threads));
+                            return proceed();
+                        }
+
+                        @Override
+                        public FileVisitResult visitFile(Path file, BasicFileAttributes attrs) {
+                            if (!attrs.isRegularFile()) return FileVisitResult.CONTINUE;
+                            progress.fileDiscovered();
+                            Semaphore device = directoryDevices.get(file.getParent());
+                            Semaphore limit = device != null ? device : deviceSemaphore(file, devices, threads);
+                            if (!nearDuplicates && !isText(file.toFile())) {
+                                File f = file.toFile();
+                                FileSignature known = index.lookup(f.getAbsolutePath(), attrs, signature -> true);
+                                if (known != null) {
+                                    knownSizes.add(attrs.size());
+                                    results.accept(fromSignature(f, known));
+                                } else {
+                                    pending.add(new PendingFile(file, attrs, limit));
+                                }
+                                return proceed();
+                            }
+                            executor.execute(() -> hashFile(file, attrs, limit, index, results, failure, progress));
+                            return proceed();
+                        }
+
+                        private FileVisitResult proceed() {
+                            return failure.get() == null && !progress.isCancelled()
+                                    ? FileVisitResult.CONTINUE : FileVisitResult.TERMINATE;
+                        }
+
+                        // An unreadable file or directory (permissions, deleted mid-walk) is logged and
+                        // counted, and the walk goes on without it
+                        @Override
+                        public FileVisitResult visitFileFailed(Path file, IOException exc) {
+                            if (exc instanceof FileSystemLoopException) {
+                                System.err.println("Skipping symbolic link cycle at " + file);
+                                return FileVisitResult.SKIP_SUBTREE;
+                            }
+                            System.err.println("Skipping unreadable " + file + ": " + exc);
+                            progress.fileSkipped();
+                            return proceed();
+                        }
+
+                        @Override
+                        public FileVisitResult postVisitDirectory(Path dir, IOException exc) {
+                            directoryDevices.remove(dir);
+                            if (exc != null) {
+                                System.err.println("Listing of " + dir + " stopped early: " + exc);
+                                progress.fileSkipped();
+                            }
+                            return proceed();
+                        }
+                    });
+            if (!nearDuplicates && failure.get() == null && !progress.isCancelled()) {
+                stageExactMatches(pending, knownSizes, index, executor, results, failure, progress);
+            }
+        } catch (IOException e) {
+            failure.compareAndSet(null, e);
+        } finally {
+            executor.shutdown();
+        }
+
+        try {
+            while (!executor.awaitTermination(1, TimeUnit.MINUTES)) {
+                // keep waiting for in-flight files
+            }
+        } catch (InterruptedException e) {
+            executor.shutdownNow();
+            Thread.currentThread().interrupt();
+            throw new InterruptedIOException("Scan of " + directoryPath + " interrupted");
+        }
+        // Signatures under a skipped directory were not seen, but the files may still be there
+        scanIndexService.commit(index, failure.get() == null && !progress.isCancelled() && progress.getFilesSkipped() == 0);
+
+        Exception e = failure.get();
+        if (e instanceof IOException) throw (IOException) e;
+        if (e instanceof NoSuchAlgorithmException) throw (NoSuchAlgorithmException) e;
+        if (e instanceof RuntimeException) throw (RuntimeException) e;
+        if (progress.isCancelled()) throw new CancellationException("Scan of " + directoryPath + " cancelled");
+    }
+
+    private void hashFile(Path path, BasicFileAttributes attrs, Semaphore device, ScanIndex index,
+                          Consumer<ApplicationFile> sink, AtomicReference<Exception> failure, ScanProgress progress) {
+        if (failure.get() != null || progress.isCancelled()) return;
+        File file = path.toFile();
+        FileFamily family = FileFamily.of(getFileExtension(file));
+        FileSignature known = index.lookup(file.getAbsolutePath(), attrs, signature -> isComplete(signature, family));
+        if (known != null) {
+            sink.accept(fromSignature(file, known));
+            return;
+        }
+        try {
+            device.acquire();
+            try {
+                ApplicationFile appFile = scanFile(file, progress);
+                index.record(appFile, attrs);
+                sink.accept(appFile);
+            } finally {
+                device.release();
+            }
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+        } catch (IOException | NoSuchAlgorithmException | RuntimeException e) {
+            // A parser bug on one file must fail the scan, not vanish into the pool's uncaught handler
+            failure.compareAndSet(null, e);
+        }
+    }
+
+    // Signatures written by an exact-only scan, or before a family's similarity data was introduced, lack
+    // that data and are rehashed when near-duplicate detection needs it
+    private boolean isComplete(FileSignature signature, FileFamily family) {
+        if (!nearDuplicates) return true;
+        if (chunkSize > 0 && signature.getChunkCount() == null) return false;
+        switch (family) {
+            case TEXT:
+                return signature.getTextTokens() != null;
+            case AUDIO:
+                return signature.getSsdeepHash() != null && (!audioFingerprints || (signature.getAudioFingerprint() != null
+                        && AudioFingerprint.isCurrent(signature.getAudioFingerprint())));
+            case VIDEO:
+                return signature.getSsdeepHash() != null && (videoHashFrames <= 0 || signature.getVideoHash() != null);
+            case IMAGE:
+                return signature.getSsdeepHash() != null && (!imageHashes || signature.getImageHash() != null);
+            case ARCHIVE:
+                return signature.getSsdeepHash() != null && (!archiveMembers || signature.getArchiveMembers() != null);
+            default:
+                return signature.getSsdeepHash() != null;
+        }
+    }
+
+    // Exact-only mode: unique sizes and unique head/tail hashes cannot have an exact duplicate, so only
+    // files that still collide (or share a size with an unchanged indexed file) are read in full
+    private void stageExactMatches(List<PendingFile> pending, Set<Long> knownSizes, ScanIndex index,
+                                   ThreadPoolExecutor executor, Consumer<ApplicationFile> sink,
+                                   AtomicReference<Exception> failure, ScanProgress progress) {
+        Map<Long, List<PendingFile>> bySize = new HashMap<>();
+        for (PendingFile file : pending) {
+            bySize.computeIfAbsent(file.attrs.size(), k -> new ArrayList<>()).add(file);
+        }
+        List<PendingFile> partial = new ArrayList<>();
+        List<PendingFile> full = new ArrayList<>();
+        for (Map.Entry<Long, List<PendingFile>> entry : bySize.entrySet()) {
+            List<PendingFile> group = entry.getValue();
+            if (knownSizes.contains(entry.getKey())) {
+                full.addAll(group);
+            } else if (group.size() > 1) {
+                partial.addAll(group);
             } else {
-                appFile.setHash(computeSHA256(file));
+                sink.accept(uniqueFile(group.get(0), "size:" + entry.getKey()));
             }
-            if (!appFile.getFileType().equals("txt")) {
-                appFile.setSsdeepHash(computeSsdeepHash(file));
+        }
+
+        runStage(partial, executor, failure, progress,
+                file -> file.partialHash = computePartialHash(file.path, file.attrs.size(), progress));
+        if (failure.get() != null || progress.isCancelled()) return;
+        Map<String, List<PendingFile>> byPartialHash = new HashMap<>();
+        for (PendingFile file : partial) {
+            byPartialHash.computeIfAbsent(file.attrs.size() + ":" + file.partialHash, k -> new ArrayList<>()).add(file);
+        }
+        for (Map.Entry<String, List<PendingFile>> entry : byPartialHash.entrySet()) {
+            if (entry.getValue().size() > 1) {
+                full.addAll(entry.getValue());
+            } else {
+                sink.accept(uniqueFile(entry.getValue().get(0), "partial:" + entry.getKey()));
             }
-            appFile.setEntropy(calculateEntropy(file));
-            applicationFiles.add(appFile);
         }
-        return applicationFiles;
+
+        runStage(full, executor, failure, progress, file -> {
+            ApplicationFile appFile = describe(file.path.toFile());
+            appFile.setHash(readOnce(file.path.toFile(), false, null, progress).sha256Hex());
+            index.record(appFile, file.attrs);
+            sink.accept(appFile);
+        });
+    }
+
+    private void runStage(List<PendingFile> files, ThreadPoolExecutor executor, AtomicReference<Exception> failure,
+                          ScanProgress progress, StageTask task) {
+        List<CompletableFuture<Void>> futures = new ArrayList<>(files.size());
+        for (PendingFile file : files) {
+            futures.add(CompletableFuture.runAsync(() -> {
+                if (failure.get() != null || progress.isCancelled()) return;
+                try {
+                    file.device.acquire();
+                    try {
+                        task.run(file);
+                    } finally {
+                        file.device.release();
+                    }
+                } catch (InterruptedException e) {
+                    Thread.currentThread().interrupt();
+                } catch (IOException | NoSuchAlgorithmException | RuntimeException e) {
+                    failure.compareAndSet(null, e);
+                }
+            }, executor));
+        }
+        CompletableFuture.allOf(futures.toArray(new CompletableFuture[0])).join();
     }
 
-    private String computeSHA256(File file) throws IOException, NoSuchAlgorithmException {
+    // Placeholder keys are unique per file and never equal a SHA-256, so such files form no exact group
+    private ApplicationFile uniqueFile(PendingFile file, String key) {
+        ApplicationFile appFile = describe(file.path.toFile());
+        appFile.setHash(key);
+        return appFile;
+    }
+
+    private String computePartialHash(Path path, long size, ScanProgress progress) throws IOException, NoSuchAlgorithmException {
         MessageDigest digest = MessageDigest.getInstance("SHA-256");
-        try (FileInputStream fis = new FileInputStream(file)) {
-            byte[] byteArray = new byte[1024];
-            int bytesCount;
-            while ((bytesCount = fis.read(byteArray)) != -1) {
-                digest.update(byteArray, 0, bytesCount);
+        ByteBuffer buffer = ByteBuffer.allocate(PARTIAL_HASH_BYTES);
+        try (FileChannel channel = FileChannel.open(path, StandardOpenOption.READ)) {
+            progress.bytesRead(readRegion(channel, buffer, 0, digest));
+            if (size > PARTIAL_HASH_BYTES) {
+                progress.bytesRead(readRegion(channel, buffer, Math.max(PARTIAL_HASH_BYTES, size - PARTIAL_HASH_BYTES), digest));
             }
         }
-        byte[] bytes = digest.digest();
-        StringBuilder sb = new StringBuilder();
-        for (byte b : bytes) {
-            sb.append(String.format("%02x", b));
+        return StreamingDigest.toHex(digest.digest());
+    }
+
+    private int readRegion(FileChannel channel, ByteBuffer buffer, long position, MessageDigest digest) throws IOException {
+        buffer.clear();
+        while (buffer.hasRemaining()) {
+            if (channel.read(buffer, position + buffer.position()) == -1) break;
+        }
+        buffer.flip();
+        int read = buffer.remaining();
+        digest.update(buffer);
+        return read;
+    }
+
+    private interface StageTask {
+        void run(PendingFile file) throws IOException, NoSuchAlgorithmException;
+    }
+
+    private static final class PendingFile {
+        private final Path path;
+        private final BasicFileAttributes attrs;
+        private final Semaphore device;
+        private String partialHash;
+
+        private PendingFile(Path path, BasicFileAttributes attrs, Semaphore device) {
+            this.path = path;
+            this.attrs = attrs;
+            this.device = device;
         }
-        return sb.toString();
     }
 
-    private String getFileExtension(File file) {
-        String name = file.getName();
-        int lastDot = name.lastIndexOf('.');
-        return (lastDot == -1) ? "unknown" : name.substring(lastDot + 1).toLowerCase();
+    // One semaphore per physical device, so slow disks get few readers and fast ones get many
+    private Semaphore deviceSemaphore(Path path, Map<Object, Semaphore> devices, int threads) {
+        return devices.computeIfAbsent(deviceKey(path), key -> new Semaphore(deviceLimit(path, threads)));
     }
 
-    private double calculateEntropy(File file) throws IOException {
-        int[] freq = new int[256];
-        int total = 0;
-        try (FileInputStream fis = new FileInputStream(file)) {
-            int b;
-            while ((b = fis.read()) != -1) {
-                freq[b & 0xFF]++;
-                total++;
+    private Object deviceKey(Path path) {
+        try {
+            return Files.getAttribute(path, "unix:dev");
+        } catch (UnsupportedOperationException | IllegalArgumentException | IOException e) {
+            return path.toAbsolutePath().getRoot();
+        }
+    }
+
+    private int deviceLimit(Path path, int threads) {
+        int limit = deviceConcurrency > 0 ? Math.min(deviceConcurrency, threads) : threads;
+        if (deviceLimits == null || deviceLimits.isBlank()) return limit;
+        String store;
+        try {
+            store = Files.getFileStore(path).name();
+        } catch (IOException e) {
+            return limit;
+        }
+        for (String entry : deviceLimits.split(",")) {
+            int eq = entry.lastIndexOf('=');
+            if (eq > 0 && entry.substring(0, eq).trim().equals(store)) {
+                try {
+                    return Math.max(1, Integer.parseInt(entry.substring(eq + 1).trim()));
+                } catch (NumberFormatException e) {
+                    System.err.println("Ignoring invalid device limit: " + entry);
+                }
             }
         }
-        double entropy = 0.0;
-        for (int f : freq) {
-            if (f > 0) {
-                double p = (double) f / total;
-                entropy -= p * (Math.log(p) / Math.log(2));
+        return limit;
+    }
+
+    public ApplicationFile scanFile(File file) throws IOException, NoSuchAlgorithmException {
+        return scanFile(file, new ScanProgress());
+    }
+
+    private ApplicationFile scanFile(File file, ScanProgress progress) throws IOException, NoSuchAlgorithmException {
+        ApplicationFile appFile = describe(file);
+        boolean text = appFile.getFileType().equals("txt");
+        StreamingDigest digest = readOnce(file, text, text ? null : new Ssdeep(appFile.getSize()),
+                nearDuplicates && chunkSize > 0 ? new ContentChunker(chunkSize) : null, progress);
+        long[] chunks = digest.chunks();
+        if (chunks != null) {
+            chunkIndexService.replace(appFile.getPath(), chunks);
+            appFile.setChunkCount(chunks.length / 3);
+        }
+        if (text) {
+            appFile.setHash(computeNormalizedTextHash(digest.getContent()));
+            appFile.setTextTokens(TextShingles.tokenHashes(digest.getContent()));
+        } else {
+            appFile.setHash(digest.sha256Hex());
+            appFile.setSsdeepHash(digest.fuzzyHash());
+            if (verifySsdeep) {
+                verifySsdeepHash(file, appFile.getSsdeepHash());
+            }
+            if (audioFingerprints && FileFamily.of(appFile.getFileType()) == FileFamily.AUDIO) {
+                // Decoding needs its own pass; the bytes were just read, so it is served from the page cache
+                appFile.setAudioFingerprint(AudioFingerprint.compute(file));
+            }
+            if (videoHashFrames > 0 && FileFamily.of(appFile.getFileType()) == FileFamily.VIDEO) {
+                appFile.setVideoHash(VideoHash.compute(file, videoHashFrames, ffmpegPath, ffprobePath));
+            }
+            if (imageHashes && FileFamily.of(appFile.getFileType()) == FileFamily.IMAGE) {
+                appFile.setImageHash(ImageHash.compute(file));
+            }
+            if (archiveMembers && FileFamily.of(appFile.getFileType()) == FileFamily.ARCHIVE) {
+                // Only the central directory is read; members are not inflated
+                appFile.setArchiveMembers(ArchiveManifest.compute(file));
+            }
+        }
+        appFile.setEntropy(digest.entropy());
+        return appFile;
+    }
+
+    private ApplicationFile describe(File file) {
+        ApplicationFile appFile = new ApplicationFile();
+        appFile.setName(file.getName());
+        appFile.setPath(file.getAbsolutePath());
+        appFile.setSize(file.length());
+        appFile.setFileType(getFileExtension(file));
+        return appFile;
+    }
+
+    private ApplicationFile fromSignature(File file, FileSignature signature) {
+        ApplicationFile appFile = new ApplicationFile();
+        appFile.setName(file.getName());
+        appFile.setPath(signature.getPath());
+        appFile.setSize(signature.getSize());
+        appFile.setFileType(getFileExtension(file));
+        appFile.setHash(signature.getHash());
+        appFile.setSsdeepHash(signature.getSsdeepHash());
+        appFile.setEntropy(signature.getEntropy());
+        appFile.setTextTokens(signature.getTextTokens());
+        appFile.setAudioFingerprint(signature.getAudioFingerprint());
+        appFile.setVideoHash(signature.getVideoHash());
+        appFile.setImageHash(signature.getImageHash());
+        appFile.setArchiveMembers(signature.getArchiveMembers());
+        appFile.setChunkCount(signature.getChunkCount());
+        return appFile;
+    }
+
+    // Single sequential pass: every buffer feeds SHA-256, the entropy histogram, ssdeep, the content-defined
+    // chunker and, for text, the content
+    private StreamingDigest readOnce(File file, boolean retainContent, Ssdeep fuzzyHash, ScanProgress progress)
+            throws IOException, NoSuchAlgorithmException {
+        return readOnce(file, retainContent, fuzzyHash, null, progress);
+    }
+
+    private StreamingDigest readOnce(File file, boolean retainContent, Ssdeep fuzzyHash, ContentChunker chunker,
+                                     ScanProgress progress) throws IOException, NoSuchAlgorithmException {
+        StreamingDigest digest = new StreamingDigest(retainContent, fuzzyHash, chunker);
+        ByteBuffer buffer = READ_BUFFER.get();
+        try (FileChannel channel = FileChannel.open(file.toPath(), StandardOpenOption.READ)) {
+            buffer.clear();
+            while (channel.read(buffer) != -1) {
+                buffer.flip();
+                progress.bytesRead(buffer.remaining());
+                digest.update(buffer);
+                buffer.clear();
             }
         }
-        return entropy;
+        return digest;
     }
 
-    private String computeNormalizedTextHash(File file) throws IOException, NoSuchAlgorithmException {
-        String content = new String(java.nio.file.Files.readAllBytes(file.toPath()));
+    private boolean isText(File file) {
+        return getFileExtension(file).equals("txt");
+    }
+
+    private String getFileExtension(File file) {
+        String name = file.getName();
+        int lastDot = name.lastIndexOf('.');
+        return (lastDot == -1) ? "unknown" : name.substring(lastDot + 1).toLowerCase();
+    }
+
+    private String computeNormalizedTextHash(byte[] bytes) throws NoSuchAlgorithmException {
+        String content = new String(bytes);
         String[] words = content.toLowerCase().replaceAll("[^a-z0-9 ]", " ").split("\\s+");
         java.util.Arrays.sort(words);
         String normalized = String.join(" ", words).trim();
         MessageDigest digest = MessageDigest.getInstance("SHA-256");
-        byte[] hash = digest.digest(normalized.getBytes());
-        StringBuilder sb = new StringBuilder();
-        for (byte b : hash) sb.append(String.format("%02x", b));
-        return sb.toString();
+        return StreamingDigest.toHex(digest.digest(normalized.getBytes()));
+    }
+
+    private void verifySsdeepHash(File file, String hash) {
+        String expected = computeExternalSsdeepHash(file);
+        if (!expected.isEmpty() && !expected.equals(hash)) {
+            System.err.println("ssdeep mismatch for " + file.getName() + ": in-process " + hash + ", binary " + expected);
+        }
     }
 
-    private String computeSsdeepHash(File file) {
+    private String computeExternalSsdeepHash(File file) {
         try {
             ProcessBuilder pb = new ProcessBuilder("ssdeep", "-b", file.getAbsolutePath());
             pb.redirectErrorStream(true);
@@ -102,13 +545,11 @@ public class FileScannerService {
             String line;
             String hash = null;
             while ((line = reader.readLine()) != null) {
+                // ssdeep output format: header line "ssdeep,1.1--blocksize:hash:hash,filename", then "hash,filename"
+                if (line.startsWith("ssdeep,")) continue;
                 if (line.contains(",")) {
-                    String[] parts = line.split(",");
-                    if (parts.length >= 2) {
-                        // ssdeep output format: "filename,hash"
-                        hash = parts[1].trim();
-                        break;
-                    }
+                    hash = line.substring(0, line.indexOf(',')).trim();
+                    break;
                 }
             }
             process.waitFor();
@@ -118,4 +559,4 @@ public class FileScannerService {
             return "";
         }
     }
-}
\ No newline at end of file
+}
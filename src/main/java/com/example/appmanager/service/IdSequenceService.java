@@ -0,0 +1,34 @@
+package com.example.appmanager.service;
+
+import jakarta.persistence.EntityManager;
+import jakarta.persistence.PersistenceContext;
+import org.springframework.stereotype.Service;
+import org.springframework.transaction.annotation.Transactional;
+
+import java.util.Map;
+
+// application_file and file_signature were numbered by IDENTITY before their ids came from a sequence.
+// In a database created back then, ddl-auto adds the sequence starting at 1, below the existing rows.
+// Each sequence is moved past the largest id in its table before the first scan inserts anything.
+@Service
+public class IdSequenceService {
+    // Table to sequence; the restart leaves room for one allocation block below the new value
+    private static final Map<String, String> SEQUENCES = Map.of(
+            "application_file", "application_file_seq",
+            "file_signature", "file_signature_seq");
+    private static final int ALLOCATION_SIZE = 50;
+
+    @PersistenceContext
+    private EntityManager entityManager;
+
+    @Transactional
+    public void realign() {
+        for (Map.Entry<String, String> entry : SEQUENCES.entrySet()) {
+            long maxId = ((Number) entityManager
+                    .createNativeQuery("SELECT COALESCE(MAX(id), 0) FROM " + entry.getKey())
+                    .getSingleResult()).longValue();
+            entityManager.createNativeQuery("ALTER SEQUENCE " + entry.getValue()
+                    + " RESTART WITH " + (maxId + ALLOCATION_SIZE + 1)).executeUpdate();
+        }
+    }
+}
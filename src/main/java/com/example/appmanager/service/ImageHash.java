@@ -0,0 +1,155 @@
+package com.example.appmanager.service;
+
+import javax.imageio.ImageIO;
+import javax.imageio.ImageReadParam;
+import javax.imageio.ImageReader;
+import javax.imageio.stream.ImageInputStream;
+import java.awt.image.BufferedImage;
+import java.io.File;
+import java.io.IOException;
+import java.util.Iterator;
+
+// Perceptual image hashes: average hash (8x8 brightness against the mean), difference hash (9x8
+// neighbouring brightness) and a DCT hash (low 8x8 frequencies of a 32x32 image against their median).
+// Together they survive resizing, re-encoding and small edits; the signature is three longs.
+public class ImageHash {
+    // Images are decoded at roughly this many pixels on their short side, never at full resolution
+    private static final int DECODE_SIZE = 128;
+    private static final int DCT_SIZE = 32;
+    // A mean of this many differing bits per hash scores 0 (half of 64, what unrelated images average)
+    private static final int ZERO_SCORE_BITS = 32;
+    private static final double[][] COSINES = new double[8][DCT_SIZE];
+
+    static {
+        for (int u = 0; u < 8; u++) {
+            for (int x = 0; x < DCT_SIZE; x++) {
+                COSINES[u][x] = Math.cos((2 * x + 1) * u * Math.PI / (2 * DCT_SIZE));
+            }
+        }
+    }
+
+    // Empty when ImageIO has no reader for the file (e.g. WebP), so the scan index does not retry it
+    public static long[] compute(File file) throws IOException {
+        int[][] grey = decodeGrey(file);
+        if (grey == null) return new long[0];
+        int[][] small = resize(grey, DCT_SIZE, DCT_SIZE);
+        return new long[] { averageHash(resize(small, 8, 8)), differenceHash(resize(grey, 9, 8)), dctHash(small) };
+    }
+
+    // Reads every n-th pixel and row so a large photo is never decoded at full size
+    private static int[][] decodeGrey(File file) throws IOException {
+        try (ImageInputStream in = ImageIO.createImageInputStream(file)) {
+            if (in == null) return null;
+            Iterator<ImageReader> readers = ImageIO.getImageReaders(in);
+            if (!readers.hasNext()) return null;
+            ImageReader reader = readers.next();
+            try {
+                reader.setInput(in, true, true);
+                int shortSide = Math.min(reader.getWidth(0), reader.getHeight(0));
+                int step = Math.max(1, shortSide / DECODE_SIZE);
+                ImageReadParam param = reader.getDefaultReadParam();
+                param.setSourceSubsampling(step, step, 0, 0);
+                BufferedImage image = reader.read(0, param);
+                int[][] grey = new int[image.getHeight()][image.getWidth()];
+                for (int y = 0; y < image.getHeight(); y++) {
+                    for (int x = 0; x < image.getWidth(); x++) {
+                        int rgb = image.getRGB(x, y);
+                        grey[y][x] = (((rgb >> 16) & 0xFF) * 299 + ((rgb >> 8) & 0xFF) * 587 + (rgb & 0xFF) * 114) / 1000;
+                    }
+                }
+                return grey;
+            } catch (IOException | RuntimeException e) {
+                // Corrupt or unsupported variants of a known format
+                return null;
+            } finally {
+                reader.dispose();
+            }
+        }
+    }
+
+    // Box-filter resize: every target pixel is the mean of the source pixels it covers
+    private static int[][] resize(int[][] source, int width, int height) {
+        int sourceHeight = source.length;
+        int sourceWidth = source[0].length;
+        int[][] target = new int[height][width];
+        for (int y = 0; y < height; y++) {
+            int y0 = y * sourceHeight / height;
+            int y1 = Math.max(y0 + 1, (y + 1) * sourceHeight / height);
+            for (int x = 0; x < width; x++) {
+                int x0 = x * sourceWidth / width;
+                int x1 = Math.max(x0 + 1, (x + 1) * sourceWidth / width);
+                long sum = 0;
+                for (int sy = y0; sy < y1; sy++) {
+                    for (int sx = x0; sx < x1; sx++) {
+                        sum += source[sy][sx];
+                    }
+                }
+                target[y][x] = (int) (sum / ((long) (y1 - y0) * (x1 - x0)));
+            }
+        }
+        return target;
+    }
+
+    private static long averageHash(int[][] pixels) {
+        long sum = 0;
+        for (int[] row : pixels) for (int p : row) sum += p;
+        double mean = sum / 64.0;
+        long hash = 0;
+        for (int[] row : pixels) for (int p : row) hash = (hash << 1) | (p > mean ? 1 : 0);
+        return hash;
+    }
+
+    private static long differenceHash(int[][] pixels) {
+        long hash = 0;
+        for (int[] row : pixels) {
+            for (int x = 0; x < 8; x++) hash = (hash << 1) | (row[x] > row[x + 1] ? 1 : 0);
+        }
+        return hash;
+    }
+
+    private static long dctHash(int[][] pixels) {
+        // Separable DCT-II, lowest 8 frequencies only: rows first, then columns
+        double[][] rows = new double[DCT_SIZE][8];
+        for (int y = 0; y < DCT_SIZE; y++) {
+            for (int v = 0; v < 8; v++) {
+                double sum = 0;
+                for (int x = 0; x < DCT_SIZE; x++) sum += pixels[y][x] * COSINES[v][x];
+                rows[y][v] = sum;
+            }
+        }
+        double[][] coefficients = new double[8][8];
+        for (int u = 0; u < 8; u++) {
+            for (int v = 0; v < 8; v++) {
+                double sum = 0;
+                for (int y = 0; y < DCT_SIZE; y++) sum += rows[y][v] * COSINES[u][y];
+                coefficients[u][v] = sum;
+            }
+        }
+        // Median of the AC coefficients; the DC term only tracks overall brightness
+        double[] ac = new double[63];
+        for (int i = 1; i < 64; i++) ac[i - 1] = coefficients[i / 8][i % 8];
+        java.util.Arrays.sort(ac);
+        double median = ac[31];
+        long hash = 0;
+        for (int i = 0; i < 64; i++) hash = (hash << 1) | (coefficients[i / 8][i % 8] > median ? 1 : 0);
+        return hash;
+    }
+
+    public static int distance(long[] a, long[] b) {
+        int distance = 0;
+        for (int i = 0; i < a.length; i++) distance += Long.bitCount(a[i] ^ b[i]);
+        return distance;
+    }
+
+    // Similarity 0-100 from the mean Hamming distance of the three hashes
+    public static double compare(long[] a, long[] b) {
+        if (a == null || b == null || a.length == 0 || a.length != b.length) return 0.0;
+        return Math.max(0.0, 100.0 - 100.0 * distance(a, b) / ((double) ZERO_SCORE_BITS * a.length));
+    }
+
+    // Largest distance that still scores above minScore
+    public static int radius(double minScore, int hashes) {
+        double limit = (100.0 - minScore) / 100.0 * ZERO_SCORE_BITS * hashes;
+        return (int) Math.ceil(limit) - 1;
+    }
+}
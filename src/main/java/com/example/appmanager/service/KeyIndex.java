@@ -0,0 +1,63 @@
+package com.example.appmanager.service;
+
+import java.util.Arrays;
+import java.util.function.IntConsumer;
+
+// Inverted index from blocking keys to file indices, held as one sorted long per (key, file): the top 32
+// bits are a hash of the key, the low 32 bits the file index. Two keys that share a hash only add pairs that
+// scoring then rejects. Keys held by a single file cannot pair anything and are dropped by build().
+public class KeyIndex {
+    private long[] entries = new long[64];
+    private int count;
+
+    public void add(long key, int id) {
+        if (count == entries.length) {
+            entries = Arrays.copyOf(entries, count * 2);
+        }
+        entries[count++] = entry(hash(key), id);
+    }
+
+    // Call once after the last add and before the first lookup
+    public void build() {
+        Arrays.sort(entries, 0, count);
+        int kept = 0;
+        for (int start = 0; start < count; ) {
+            int end = start + 1;
+            while (end < count && (int) (entries[end] >> 32) == (int) (entries[start] >> 32)) end++;
+            int first = kept;
+            for (int k = start; k < end; k++) {
+                // The same key added twice for one file
+                if (kept == first || entries[kept - 1] != entries[k]) entries[kept++] = entries[k];
+            }
+            if (kept - first < 2) kept = first;
+            start = end;
+        }
+        entries = Arrays.copyOf(entries, kept);
+        count = kept;
+    }
+
+    // Reports, in ascending order, every file above id that holds key
+    public void after(long key, int id, IntConsumer matches) {
+        int h = hash(key);
+        int lo = 0, hi = count;
+        long from = entry(h, id + 1);
+        while (lo < hi) {
+            int mid = (lo + hi) >>> 1;
+            if (entries[mid] < from) lo = mid + 1; else hi = mid;
+        }
+        for (int k = lo; k < count && (int) (entries[k] >> 32) == h; k++) {
+            matches.accept((int) entries[k]);
+        }
+    }
+
+    private static long entry(int hash, int id) {
+        return ((long) hash << 32) | (id & 0xFFFFFFFFL);
+    }
+
+    // SplitMix64 finaliser, top half
+    private static int hash(long z) {
+        z = (z ^ (z >>> 30)) * 0xbf58476d1ce4e5b9L;
+        z = (z ^ (z >>> 27)) * 0x94d049bb133111ebL;
+        return (int) ((z ^ (z >>> 31)) >>> 32);
+    }
+}
@@ -0,0 +1,43 @@
+package com.example.appmanager.service;
+
+import java.util.Arrays;
+
+// MinHash signatures over TextShingles word hashes. Two files agree on any one signature position
+// with probability equal to the Jaccard similarity of their word sets.
+public class MinHash {
+    public static long[] signature(long[] tokens, int numHashes) {
+        long[] signature = new long[numHashes];
+        Arrays.fill(signature, Long.MAX_VALUE);
+        for (int i = 0; i < numHashes; i++) {
+            long seed = seed(i);
+            long min = Long.MAX_VALUE;
+            for (long token : tokens) {
+                long h = mix(token ^ seed);
+                if (h < min) min = h;
+            }
+            signature[i] = min;
+        }
+        return signature;
+    }
+
+    // Bucket key of one LSH band: rows consecutive signature values hashed together
+    public static long bandKey(long[] signature, int band, int rows) {
+        long h = mix(band + 1L);
+        for (int i = band * rows; i < (band + 1) * rows; i++) {
+            h = mix(h ^ signature[i]);
+        }
+        return h;
+    }
+
+    // Fixed per-position seeds, so signatures are comparable across runs
+    private static long seed(int index) {
+        return mix(0x9e3779b97f4a7c15L * (index + 1));
+    }
+
+    // SplitMix64 finaliser
+    private static long mix(long z) {
+        z = (z ^ (z >>> 30)) * 0xbf58476d1ce4e5b9L;
+        z = (z ^ (z >>> 27)) * 0x94d049bb133111ebL;
+        return z ^ (z >>> 31);
+    }
+}
@@ -0,0 +1,17 @@
+package com.example.appmanager.service;
+
+import java.util.List;
+
+// One page of a result list and the cursor for the next one (null on the last page)
+public class ResultPage<T> {
+    private final List<T> items;
+    private final String next;
+
+    public ResultPage(List<T> items, String next) {
+        this.items = items;
+        this.next = next;
+    }
+
+    public List<T> getItems() { return items; }
+    public String getNext() { return next; }
+}
@@ -0,0 +1,184 @@
+package com.example.appmanager.service;
+
+import com.example.appmanager.model.ApplicationFile;
+import com.example.appmanager.repository.ApplicationFileRepository;
+import com.example.appmanager.repository.FileRowView;
+import com.fasterxml.jackson.core.JsonProcessingException;
+import com.fasterxml.jackson.core.type.TypeReference;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.data.domain.KeysetScrollPosition;
+import org.springframework.data.domain.Limit;
+import org.springframework.data.domain.ScrollPosition;
+import org.springframework.data.domain.Sort;
+import org.springframework.data.domain.Window;
+import org.springframework.stereotype.Service;
+
+import java.nio.charset.StandardCharsets;
+import java.util.ArrayList;
+import java.util.Base64;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.Set;
+
+// Pages of the scan results and of the duplicate report for the lazily loading result views. Cursors are
+// opaque to clients: they carry the sort keys of the last item served, so a page never depends on how
+// many items came before it.
+@Service
+public class ResultPageService {
+    private static final Set<String> FILE_SORTS = Set.of("path", "name", "size", "fileType");
+
+    @Autowired
+    private ApplicationFileRepository applicationFileRepository;
+    @Autowired
+    private DuplicateReportCache duplicateReportCache;
+    @Autowired
+    private ObjectMapper objectMapper;
+
+    // Largest page a client may ask for
+    @Value("${fileguard.results.max-page-size:500}")
+    private int maxPageSize;
+
+    // Groups of the last report paged through in page order, re-sorted when the report or the order changes.
+    // They refer to the cached report's lists, so this adds one entry per group, not per file.
+    private Map<String, List<ApplicationFile>> sortedReport;
+    private String sortedBy;
+    private List<SortedGroup> sortedGroups;
+
+    public ResultPage<FileRow> files(String sort, boolean descending, String after, int limit) {
+        String property = FILE_SORTS.contains(sort) ? sort : "path";
+        Sort.Direction direction = descending ? Sort.Direction.DESC : Sort.Direction.ASC;
+        // The id makes the keys unique, so files with equal sort values are neither skipped nor repeated
+        Sort order = Sort.by(direction, property).and(Sort.by(direction, "id"));
+        ScrollPosition position = after == null || after.isEmpty()
+                ? ScrollPosition.keyset() : ScrollPosition.forward(fileKeys(decode(after), property));
+        Window<FileRowView> window = applicationFileRepository.findByScanJobIsNull(position, order, Limit.of(pageSize(limit)));
+        List<FileRow> rows = new ArrayList<>(window.size());
+        for (FileRowView file : window) {
+            rows.add(new FileRow(file));
+        }
+        String next = null;
+        if (window.hasNext() && !window.isEmpty()) {
+            next = encode(((KeysetScrollPosition) window.positionAt(window.size() - 1)).getKeys());
+        }
+        return new ResultPage<>(rows, next);
+    }
+
+    // Groups by key, by number of files or by total size (both largest first). Only the served page is
+    // turned into result rows.
+    public ResultPage<DuplicateGroup> duplicates(String sort, String after, int limit) {
+        String order = "files".equals(sort) || "size".equals(sort) ? sort : "key";
+        List<SortedGroup> groups = sortedGroups(order);
+        int from = 0;
+        if (after != null && !after.isEmpty()) {
+            // First group after the cursor; groups removed since the last page do not shift the rest
+            Map<String, Object> keys = decode(after);
+            long value = keys.get("value") instanceof Number ? ((Number) keys.get("value")).longValue() : 0;
+            String key = String.valueOf(keys.get("key"));
+            int lo = 0, hi = groups.size();
+            while (lo < hi) {
+                int mid = (lo + hi) >>> 1;
+                SortedGroup group = groups.get(mid);
+                if (compare(group.value, group.key, value, key) <= 0) lo = mid + 1;
+                else hi = mid;
+            }
+            from = lo;
+        }
+        int to = Math.min(groups.size(), from + pageSize(limit));
+        String next = null;
+        if (to < groups.size() && to > from) {
+            SortedGroup lastServed = groups.get(to - 1);
+            Map<String, Object> keys = new HashMap<>();
+            keys.put("key", lastServed.key);
+            keys.put("value", lastServed.value);
+            next = encode(keys);
+        }
+        List<DuplicateGroup> page = new ArrayList<>(to - from);
+        for (SortedGroup group : groups.subList(from, to)) {
+            List<FileRow> rows = new ArrayList<>(group.files.size());
+            long totalSize = 0;
+            for (ApplicationFile file : group.files) {
+                rows.add(new FileRow(file));
+                totalSize += file.getSize();
+            }
+            page.add(new DuplicateGroup(group.key, rows, totalSize));
+        }
+        return new ResultPage<>(page, next);
+    }
+
+    private synchronized List<SortedGroup> sortedGroups(String order) {
+        Map<String, List<ApplicationFile>> report = duplicateReportCache.get();
+        if (report != sortedReport || !order.equals(sortedBy)) {
+            List<SortedGroup> groups = new ArrayList<>(report.size());
+            for (Map.Entry<String, List<ApplicationFile>> entry : report.entrySet()) {
+                groups.add(new SortedGroup(entry.getKey(), entry.getValue(), sortValue(entry.getValue(), order)));
+            }
+            groups.sort((a, b) -> compare(a.value, a.key, b.value, b.key));
+            sortedReport = report;
+            sortedBy = order;
+            sortedGroups = groups;
+        }
+        return sortedGroups;
+    }
+
+    private static long sortValue(List<ApplicationFile> files, String order) {
+        if ("files".equals(order)) return files.size();
+        if (!"size".equals(order)) return 0;
+        long totalSize = 0;
+        for (ApplicationFile file : files) {
+            totalSize += file.getSize();
+        }
+        return totalSize;
+    }
+
+    // Largest sort value first, then by key
+    private static int compare(long valueA, String keyA, long valueB, String keyB) {
+        int byValue = Long.compare(valueB, valueA);
+        return byValue != 0 ? byValue : keyA.compareTo(keyB);
+    }
+
+    private int pageSize(int limit) {
+        return Math.max(1, Math.min(limit, maxPageSize));
+    }
+
+    // Cursor values come back from JSON as plain numbers and strings; restore the entity's types
+    private static Map<String, Object> fileKeys(Map<String, Object> keys, String property) {
+        Map<String, Object> typed = new HashMap<>();
+        Object value = keys.get(property);
+        typed.put(property, "size".equals(property) && value instanceof Number ? ((Number) value).longValue() : value);
+        Object id = keys.get("id");
+        typed.put("id", id instanceof Number ? ((Number) id).longValue() : id);
+        return typed;
+    }
+
+    private String encode(Map<String, ?> keys) {
+        try {
+            return Base64.getUrlEncoder().withoutPadding().encodeToString(objectMapper.writeValueAsBytes(keys));
+        } catch (JsonProcessingException e) {
+            throw new IllegalStateException(e);
+        }
+    }
+
+    private Map<String, Object> decode(String cursor) {
+        try {
+            byte[] json = Base64.getUrlDecoder().decode(cursor);
+            return objectMapper.readValue(new String(json, StandardCharsets.UTF_8), new TypeReference<Map<String, Object>>() {});
+        } catch (IllegalArgumentException | JsonProcessingException e) {
+            throw new IllegalArgumentException("Invalid cursor " + cursor);
+        }
+    }
+
+    private static final class SortedGroup {
+        private final String key;
+        private final List<ApplicationFile> files;
+        private final long value;
+
+        SortedGroup(String key, List<ApplicationFile> files, long value) {
+            this.key = key;
+            this.files = files;
+            this.value = value;
+        }
+    }
+}
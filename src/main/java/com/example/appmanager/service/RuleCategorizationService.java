@@ -8,7 +8,11 @@ import com.example.appmanager.repository.RuleRepository;
 import org.springframework.beans.factory.annotation.Autowired;
 import org.springframework.stereotype.Service;
 
+import java.io.File;
+import java.util.Arrays;
+import java.util.HashMap;
 import java.util.List;
+import java.util.Map;
 
 @Service
 public class RuleCategorizationService {
@@ -33,4 +37,53 @@ public class RuleCategorizationService {
             }
         }
     }
-}
\ No newline at end of file
+
+    // Moves each file into <baseDirectory>/<category> for the selected extension categories
+    public void organizeIntoFolders(List<ApplicationFile> files, String baseDirectory, List<String> categories) {
+        // Define file extensions for each category
+        Map<String, List<String>> categoryExtensions = new HashMap<>();
+        categoryExtensions.put("photos", Arrays.asList("jpg", "jpeg", "png", "gif", "bmp", "tiff", "webp"));
+        categoryExtensions.put("documents", Arrays.asList("doc", "docx", "pdf", "txt", "rtf", "odt", "pages"));
+        categoryExtensions.put("videos", Arrays.asList("mp4", "avi", "mov", "mkv", "wmv", "flv", "webm"));
+        categoryExtensions.put("music", Arrays.asList("mp3", "wav", "flac", "aac", "ogg", "wma"));
+        categoryExtensions.put("archives", Arrays.asList("zip", "rar", "7z", "tar", "gz", "bz2"));
+        categoryExtensions.put("applications", Arrays.asList("exe", "msi", "apk", "jar", "dmg", "deb", "rpm"));
+
+        // Create category folders and move files
+        for (String category : categories) {
+            if (categoryExtensions.containsKey(category)) {
+                String categoryFolder = baseDirectory + File.separator + category;
+                File folder = new File(categoryFolder);
+                if (!folder.exists()) {
+                    folder.mkdirs();
+                }
+
+                List<String> extensions = categoryExtensions.get(category);
+                for (ApplicationFile file : files) {
+                    String fileExtension = getFileExtension(file.getName()).toLowerCase();
+                    if (extensions.contains(fileExtension)) {
+                        try {
+                            File sourceFile = new File(file.getPath());
+                            File destFile = new File(categoryFolder + File.separator + file.getName());
+                            
+                            // Only move if file exists and destination doesn't exist
+                            if (sourceFile.exists() && !destFile.exists()) {
+                                java.nio.file.Files.move(sourceFile.toPath(), destFile.toPath());
+                                // Update the file path in our model
+                                file.setPath(destFile.getAbsolutePath());
+                            }
+                        } catch (Exception e) {
+                            // Log error but continue with other files
+                            System.err.println("Error moving file " + file.getName() + ": " + e.getMessage());
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+    private String getFileExtension(String fileName) {
+        int lastDot = fileName.lastIndexOf('.');
+        return (lastDot == -1) ? "" : fileName.substring(lastDot + 1);
+    }
+}
@@ -0,0 +1,137 @@
+package com.example.appmanager.service;
+
+import com.example.appmanager.model.ApplicationFile;
+import com.example.appmanager.model.FileSignature;
+import com.example.appmanager.repository.FileStampView;
+
+import java.io.File;
+import java.nio.file.attribute.BasicFileAttributes;
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.Objects;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.function.Consumer;
+import java.util.function.Function;
+import java.util.function.Predicate;
+
+// One scan's view of the persistent signature index. Safe to use from several scan workers. Only the
+// stamps (path, size, mtime, file key) of the indexed files are held for the whole scan; full signatures
+// are loaded a directory at a time, when the scan reaches the directory, and dropped as their files are
+// looked up. New and changed signatures are handed to writeBatch every batchSize files, so they are not
+// all held until the end of the scan.
+public class ScanIndex {
+    private final Map<String, FileStampView> unseen;
+    private final Map<String, List<FileStampView>> byDirectory = new HashMap<>();
+    private final Map<String, Map<String, FileSignature>> loaded = new ConcurrentHashMap<>();
+    private final Map<String, FileStampView> stale = new ConcurrentHashMap<>();
+    private final int batchSize;
+    private final Function<List<Long>, List<FileSignature>> load;
+    private final Consumer<List<FileSignature>> writeBatch;
+    private List<FileSignature> changed;
+
+    // load returns the full signatures of the given ids
+    public ScanIndex(Map<String, FileStampView> known, int batchSize, Function<List<Long>, List<FileSignature>> load,
+                     Consumer<List<FileSignature>> writeBatch) {
+        this.unseen = new ConcurrentHashMap<>(known);
+        for (FileStampView stamp : known.values()) {
+            byDirectory.computeIfAbsent(directory(stamp.getPath()), k -> new ArrayList<>()).add(stamp);
+        }
+        this.batchSize = Math.max(1, batchSize);
+        this.load = load;
+        this.writeBatch = writeBatch;
+        this.changed = new ArrayList<>(this.batchSize);
+    }
+
+    // Returns the stored signature if path, size, mtime and file key are all unchanged and the signature
+    // carries everything the scan needs (see FileScannerService.isComplete), otherwise null.
+    public FileSignature lookup(String path, BasicFileAttributes attrs, Predicate<FileSignature> complete) {
+        FileStampView stamp = unseen.get(path);
+        if (stamp == null) return null;
+        // Loads the directory's signatures on its first lookup, this one included
+        FileSignature signature = loaded.computeIfAbsent(directory(path), this::loadDirectory).remove(path);
+        unseen.remove(path);
+        if (signature != null && complete.test(signature)
+                && stamp.getSize() == attrs.size()
+                && stamp.getLastModified() == attrs.lastModifiedTime().toMillis()
+                && Objects.equals(stamp.getFileKey(), fileKey(attrs))) {
+            return signature;
+        }
+        stale.put(path, stamp);
+        return null;
+    }
+
+    public void record(ApplicationFile file, BasicFileAttributes attrs) {
+        // A changed file keeps its row: saving a signature with the stored id updates it
+        FileStampView previous = stale.remove(file.getPath());
+        FileSignature signature = new FileSignature();
+        signature.setId(previous != null ? previous.getId() : null);
+        signature.setPath(file.getPath());
+        signature.setSize(attrs.size());
+        signature.setLastModified(attrs.lastModifiedTime().toMillis());
+        signature.setFileKey(fileKey(attrs));
+        signature.setHash(file.getHash());
+        signature.setSsdeepHash(file.getSsdeepHash());
+        signature.setEntropy(file.getEntropy());
+        signature.setTextTokens(file.getTextTokens());
+        signature.setAudioFingerprint(file.getAudioFingerprint());
+        signature.setVideoHash(file.getVideoHash());
+        signature.setImageHash(file.getImageHash());
+        signature.setArchiveMembers(file.getArchiveMembers());
+        signature.setChunkCount(file.getChunkCount());
+        List<FileSignature> full = null;
+        synchronized (this) {
+            changed.add(signature);
+            if (changed.size() >= batchSize) {
+                full = changed;
+                changed = new ArrayList<>(batchSize);
+            }
+        }
+        // Written outside the lock, so workers only wait for each other's database round trips when
+        // their batches fill up at the same time
+        if (full != null) {
+            writeBatch.accept(full);
+        }
+    }
+
+    // Writes the signatures recorded since the last full batch
+    public void flush() {
+        List<FileSignature> rest;
+        synchronized (this) {
+            rest = changed;
+            changed = new ArrayList<>(batchSize);
+        }
+        if (!rest.isEmpty()) {
+            writeBatch.accept(rest);
+        }
+    }
+
+    // Stamps of the indexed files this scan did not find
+    public List<FileStampView> getUnseen() {
+        return new ArrayList<>(unseen.values());
+    }
+
+    // Signatures of the directory's files not looked up yet; deleted files among them stay until the scan ends
+    private Map<String, FileSignature> loadDirectory(String directory) {
+        List<Long> ids = new ArrayList<>();
+        for (FileStampView stamp : byDirectory.getOrDefault(directory, List.of())) {
+            if (unseen.containsKey(stamp.getPath())) ids.add(stamp.getId());
+        }
+        Map<String, FileSignature> signatures = new ConcurrentHashMap<>();
+        if (!ids.isEmpty()) {
+            for (FileSignature signature : load.apply(ids)) {
+                signatures.put(signature.getPath(), signature);
+            }
+        }
+        return signatures;
+    }
+
+    private static String directory(String path) {
+        return path.substring(0, Math.max(0, path.lastIndexOf(File.separatorChar)));
+    }
+
+    private static String fileKey(BasicFileAttributes attrs) {
+        return attrs.fileKey() != null ? attrs.fileKey().toString() : null;
+    }
+}
@@ -0,0 +1,77 @@
+package com.example.appmanager.service;
+
+import com.example.appmanager.model.FileSignature;
+import com.example.appmanager.repository.FileSignatureRepository;
+import com.example.appmanager.repository.FileStampView;
+import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.stereotype.Service;
+import org.springframework.transaction.annotation.Transactional;
+
+import java.io.File;
+import java.nio.file.Path;
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.stream.Collectors;
+
+@Service
+public class ScanIndexService {
+    private static final int DELETE_BATCH_SIZE = 1000;
+    private static final int LOAD_BATCH_SIZE = 1000;
+
+    @Autowired
+    private FileSignatureRepository fileSignatureRepository;
+    @Autowired
+    private ChunkIndexService chunkIndexService;
+
+    // Signatures are written while the scan runs, this many per transaction
+    @Value("${fileguard.persist.batch-size:500}")
+    private int batchSize;
+
+    public ScanIndex open(Path root) {
+        String prefix = root.toAbsolutePath().toString();
+        if (!prefix.endsWith(File.separator)) {
+            prefix = prefix + File.separator;
+        }
+        Map<String, FileStampView> known = new HashMap<>();
+        for (FileStampView stamp : fileSignatureRepository.findByPathStartingWith(prefix)) {
+            known.put(stamp.getPath(), stamp);
+        }
+        return new ScanIndex(known, batchSize, this::load, fileSignatureRepository::saveAll);
+    }
+
+    // Full signatures, at most LOAD_BATCH_SIZE ids per query
+    private List<FileSignature> load(List<Long> ids) {
+        List<FileSignature> signatures = new ArrayList<>(ids.size());
+        for (int i = 0; i < ids.size(); i += LOAD_BATCH_SIZE) {
+            signatures.addAll(fileSignatureRepository.findAllById(ids.subList(i, Math.min(i + LOAD_BATCH_SIZE, ids.size()))));
+        }
+        return signatures;
+    }
+
+    // Stores the last new and changed signatures; prunes files that have disappeared only after a complete walk
+    @Transactional
+    public void commit(ScanIndex index, boolean complete) {
+        index.flush();
+        if (complete) {
+            List<FileStampView> removed = index.getUnseen();
+            List<Long> ids = removed.stream().map(FileStampView::getId).collect(Collectors.toList());
+            for (int i = 0; i < ids.size(); i += DELETE_BATCH_SIZE) {
+                fileSignatureRepository.deleteAllByIdInBatch(ids.subList(i, Math.min(i + DELETE_BATCH_SIZE, ids.size())));
+            }
+            chunkIndexService.remove(removed.stream().map(FileStampView::getPath).collect(Collectors.toList()));
+        }
+    }
+
+    // Follows files moved after the scan (old path to new path), so the next scan finds them unchanged
+    @Transactional
+    public void moved(Map<String, String> paths) {
+        if (paths.isEmpty()) return;
+        for (FileSignature signature : fileSignatureRepository.findByPathIn(paths.keySet())) {
+            signature.setPath(paths.get(signature.getPath()));
+        }
+        chunkIndexService.moved(paths);
+    }
+}
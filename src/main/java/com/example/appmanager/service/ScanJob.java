@@ -0,0 +1,84 @@
+package com.example.appmanager.service;
+
+import java.util.List;
+import java.util.UUID;
+
+// One background scan. Serialized as the status returned by the scan job API.
+public class ScanJob {
+    public enum Status { QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED }
+
+    private final String id = UUID.randomUUID().toString();
+    private final String directory;
+    private final boolean categorizationEnabled;
+    private final List<String> categories;
+    private final ScanProgress progress = new ScanProgress();
+    private final long createdAt = System.currentTimeMillis();
+    private volatile Status status = Status.QUEUED;
+    private volatile long startedAt;
+    private volatile long finishedAt;
+    private volatile String error;
+
+    public ScanJob(String directory, boolean categorizationEnabled, List<String> categories) {
+        this.directory = directory;
+        this.categorizationEnabled = categorizationEnabled;
+        this.categories = categories;
+    }
+
+    void markRunning() {
+        startedAt = System.currentTimeMillis();
+        status = Status.RUNNING;
+    }
+
+    void finish(Status status, String error) {
+        this.error = error;
+        this.finishedAt = System.currentTimeMillis();
+        this.status = status;
+    }
+
+    void cancel() {
+        progress.cancel();
+    }
+
+    ScanProgress getProgress() { return progress; }
+
+    public boolean isFinished() {
+        return status == Status.COMPLETED || status == Status.FAILED || status == Status.CANCELLED;
+    }
+
+    public long getElapsedMillis() {
+        if (startedAt == 0) return 0;
+        return (finishedAt != 0 ? finishedAt : System.currentTimeMillis()) - startedAt;
+    }
+
+    public long getBytesPerSecond() {
+        long elapsed = getElapsedMillis();
+        return elapsed > 0 ? progress.getBytesRead() * 1000 / elapsed : 0;
+    }
+
+    public double getFilesPerSecond() {
+        long elapsed = getElapsedMillis();
+        return elapsed > 0 ? progress.getFilesHashed() * 1000.0 / elapsed : 0;
+    }
+
+    // Insert throughput of the result rows
+    public double getRowsPerSecond() {
+        long elapsed = getElapsedMillis();
+        return elapsed > 0 ? progress.getFilesSaved() * 1000.0 / elapsed : 0;
+    }
+
+    // Getters
+    public String getId() { return id; }
+    public String getDirectory() { return directory; }
+    public boolean isCategorizationEnabled() { return categorizationEnabled; }
+    public List<String> getCategories() { return categories; }
+    public long getCreatedAt() { return createdAt; }
+    public Status getStatus() { return status; }
+    public String getError() { return error; }
+    public boolean isCancelRequested() { return progress.isCancelled(); }
+    public long getFilesDiscovered() { return progress.getFilesDiscovered(); }
+    public long getFilesHashed() { return progress.getFilesHashed(); }
+    public long getBytesRead() { return progress.getBytesRead(); }
+    public long getFilesSaved() { return progress.getFilesSaved(); }
+    // Files and directories that could not be read and were left out of the results
+    public long getFilesSkipped() { return progress.getFilesSkipped(); }
+}
@@ -0,0 +1,211 @@
+package com.example.appmanager.service;
+
+import com.example.appmanager.model.ApplicationFile;
+import com.example.appmanager.repository.ApplicationFileRepository;
+import jakarta.annotation.PostConstruct;
+import jakarta.annotation.PreDestroy;
+import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.beans.factory.annotation.Value;
+import org.springframework.data.domain.Limit;
+import org.springframework.stereotype.Service;
+
+import java.io.IOException;
+import java.security.NoSuchAlgorithmException;
+import java.util.ArrayList;
+import java.util.HashMap;
+import java.util.Iterator;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.concurrent.CancellationException;
+import java.util.concurrent.ExecutorService;
+import java.util.concurrent.Executors;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicInteger;
+
+// Runs scans in the background so no HTTP request has to wait for one. Jobs keep running when the
+// browser goes away; clients poll the job by id for progress and open the results once it completes.
+@Service
+public class ScanJobService {
+    @Autowired
+    private FileScannerService fileScannerService;
+    @Autowired
+    private RuleCategorizationService ruleCategorizationService;
+    @Autowired
+    private ApplicationFileRepository applicationFileRepository;
+    @Autowired
+    private DuplicateReportCache duplicateReportCache;
+    @Autowired
+    private ScanResultService scanResultService;
+    @Autowired
+    private ScanIndexService scanIndexService;
+    @Autowired
+    private IdSequenceService idSequenceService;
+
+    // Scans run at the same time; each one replaces the stored files, so more than one rarely makes sense
+    @Value("${fileguard.jobs.concurrency:1}")
+    private int concurrency;
+    // Finished jobs kept for status queries before the oldest are forgotten
+    @Value("${fileguard.jobs.retained:50}")
+    private int retained;
+    // Results are saved while the scan runs, this many rows per transaction
+    @Value("${fileguard.persist.batch-size:500}")
+    private int batchSize;
+
+    private final Map<String, ScanJob> jobs = new LinkedHashMap<>();
+    private ExecutorService executor;
+
+    @PostConstruct
+    void startExecutor() {
+        idSequenceService.realign();
+        scanResultService.discardAbandoned();
+        AtomicInteger jobThreads = new AtomicInteger();
+        executor = Executors.newFixedThreadPool(Math.max(1, concurrency),
+                r -> new Thread(r, "scan-job-" + jobThreads.incrementAndGet()));
+    }
+
+    @PreDestroy
+    void stopExecutor() throws InterruptedException {
+        synchronized (jobs) {
+            jobs.values().forEach(ScanJob::cancel);
+        }
+        executor.shutdown();
+        executor.awaitTermination(30, TimeUnit.SECONDS);
+    }
+
+    public ScanJob submit(String directory, boolean categorizationEnabled, List<String> categories) {
+        ScanJob job = new ScanJob(directory, categorizationEnabled, categories);
+        synchronized (jobs) {
+            jobs.put(job.getId(), job);
+            evictFinishedJobs();
+        }
+        executor.execute(() -> run(job));
+        return job;
+    }
+
+    public ScanJob get(String id) {
+        synchronized (jobs) {
+            return jobs.get(id);
+        }
+    }
+
+    public List<ScanJob> list() {
+        synchronized (jobs) {
+            return new ArrayList<>(jobs.values());
+        }
+    }
+
+    // Queued jobs never start; running ones stop walking and finish the files already being read
+    public ScanJob cancel(String id) {
+        ScanJob job = get(id);
+        if (job != null && !job.isFinished()) {
+            job.cancel();
+        }
+        return job;
+    }
+
+    private void run(ScanJob job) {
+        if (job.isCancelRequested()) {
+            job.finish(ScanJob.Status.CANCELLED, null);
+            return;
+        }
+        job.markRunning();
+        List<String> categories = job.getCategories();
+        boolean organize = job.isCategorizationEnabled() && categories != null && !categories.isEmpty();
+        ScanResultWriter writer = new ScanResultWriter(batchSize, batch -> {
+            // Staged under the job id: the previous results stay in place until this scan completes
+            for (ApplicationFile file : batch) {
+                file.setScanJob(job.getId());
+            }
+            // Rules match on the path, so files that will be moved are categorized after the move
+            if (!organize) {
+                ruleCategorizationService.categorize(batch);
+            }
+            applicationFileRepository.saveAll(batch);
+            job.getProgress().filesSaved(batch.size());
+        }, job::cancel);
+        boolean published = false;
+        try {
+            fileScannerService.scanDirectory(job.getDirectory(), writer, job.getProgress());
+            writer.close();
+            if (organize) {
+                organize(job, categories);
+            }
+            scanResultService.publish(job.getId());
+            published = true;
+            duplicateReportCache.invalidate();
+            job.finish(ScanJob.Status.COMPLETED, null);
+        } catch (CancellationException e) {
+            RuntimeException failure = writer.getFailure();
+            if (failure != null) {
+                System.err.println("Scan job " + job.getId() + " failed: " + failure.getMessage());
+                job.finish(ScanJob.Status.FAILED, failure.getMessage() != null ? failure.getMessage() : failure.toString());
+            } else {
+                job.finish(ScanJob.Status.CANCELLED, null);
+            }
+        } catch (IOException | NoSuchAlgorithmException | RuntimeException e) {
+            System.err.println("Scan job " + job.getId() + " failed: " + e.getMessage());
+            job.finish(ScanJob.Status.FAILED, e.getMessage() != null ? e.getMessage() : e.toString());
+        } finally {
+            if (!published) {
+                discard(job);
+            }
+        }
+    }
+
+    // Files are moved only once the walk has finished and the last batch is stored, so the walker never
+    // finds a moved file a second time. The staged rows, the signature index and the chunk index follow
+    // each move.
+    private void organize(ScanJob job, List<String> categories) {
+        Long lastId = 0L;
+        List<ApplicationFile> page;
+        while (!(page = applicationFileRepository.findByScanJobAndIdGreaterThanOrderById(
+                job.getId(), lastId, Limit.of(Math.max(1, batchSize)))).isEmpty()) {
+            lastId = page.get(page.size() - 1).getId();
+            List<String> before = new ArrayList<>(page.size());
+            for (ApplicationFile file : page) {
+                before.add(file.getPath());
+            }
+            ruleCategorizationService.organizeIntoFolders(page, job.getDirectory(), categories);
+            ruleCategorizationService.categorize(page);
+
+            Map<String, String> moved = new HashMap<>();
+            List<ApplicationFile> changed = new ArrayList<>();
+            for (int i = 0; i < page.size(); i++) {
+                ApplicationFile file = page.get(i);
+                boolean wasMoved = !file.getPath().equals(before.get(i));
+                if (wasMoved) {
+                    moved.put(before.get(i), file.getPath());
+                }
+                if (wasMoved || file.getCategory() != null) {
+                    changed.add(file);
+                }
+            }
+            applicationFileRepository.saveAll(changed);
+            scanIndexService.moved(moved);
+        }
+    }
+
+    private void discard(ScanJob job) {
+        try {
+            scanResultService.discard(job.getId());
+        } catch (RuntimeException e) {
+            // Left for discardAbandoned at the next start; staged rows are never shown
+            System.err.println("Could not discard the rows of scan job " + job.getId() + ": " + e.getMessage());
+        }
+    }
+
+    private void evictFinishedJobs() {
+        int finished = 0;
+        for (ScanJob job : jobs.values()) {
+            if (job.isFinished()) finished++;
+        }
+        Iterator<ScanJob> it = jobs.values().iterator();
+        while (finished > retained && it.hasNext()) {
+            if (it.next().isFinished()) {
+                it.remove();
+                finished--;
+            }
+        }
+    }
+}
@@ -0,0 +1,27 @@
+package com.example.appmanager.service;
+
+import java.util.concurrent.atomic.AtomicLong;
+
+// Live counters for one scan, updated by the walker and the hashing workers
+public class ScanProgress {
+    private final AtomicLong filesDiscovered = new AtomicLong();
+    private final AtomicLong filesHashed = new AtomicLong();
+    private final AtomicLong bytesRead = new AtomicLong();
+    private final AtomicLong filesSaved = new AtomicLong();
+    private final AtomicLong filesSkipped = new AtomicLong();
+    private volatile boolean cancelled;
+
+    public void fileDiscovered() { filesDiscovered.incrementAndGet(); }
+    public void fileHashed() { filesHashed.incrementAndGet(); }
+    public void bytesRead(long bytes) { bytesRead.addAndGet(bytes); }
+    public void filesSaved(long files) { filesSaved.addAndGet(files); }
+    public void fileSkipped() { filesSkipped.incrementAndGet(); }
+    public void cancel() { cancelled = true; }
+
+    public long getFilesDiscovered() { return filesDiscovered.get(); }
+    public long getFilesHashed() { return filesHashed.get(); }
+    public long getBytesRead() { return bytesRead.get(); }
+    public long getFilesSaved() { return filesSaved.get(); }
+    public long getFilesSkipped() { return filesSkipped.get(); }
+    public boolean isCancelled() { return cancelled; }
+}
@@ -0,0 +1,32 @@
+package com.example.appmanager.service;
+
+import com.example.appmanager.repository.ApplicationFileRepository;
+import org.springframework.beans.factory.annotation.Autowired;
+import org.springframework.stereotype.Service;
+import org.springframework.transaction.annotation.Transactional;
+
+// Scans write their rows staged under the scan job id. They replace the published results only once the
+// scan has completed, so a failed or cancelled scan leaves the previous results as they were.
+@Service
+public class ScanResultService {
+    @Autowired
+    private ApplicationFileRepository applicationFileRepository;
+
+    // One transaction: readers see either the old results or the new ones, never a mix
+    @Transactional
+    public void publish(String scanJob) {
+        applicationFileRepository.deletePublished();
+        applicationFileRepository.publish(scanJob);
+    }
+
+    @Transactional
+    public void discard(String scanJob) {
+        applicationFileRepository.deleteStaged(scanJob);
+    }
+
+    // Rows left behind by scans that were running when the application stopped
+    @Transactional
+    public void discardAbandoned() {
+        applicationFileRepository.deleteAllStaged();
+    }
+}
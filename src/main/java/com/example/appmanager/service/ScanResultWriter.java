@@ -0,0 +1,56 @@
+package com.example.appmanager.service;
+
+import com.example.appmanager.model.ApplicationFile;
+
+import java.util.ArrayList;
+import java.util.List;
+import java.util.function.Consumer;
+
+// Sink for the hashing threads that hands results on in fixed-size batches, so a scan holds at most
+// one batch in memory however many files it finds. The first failed batch stops further writes.
+public class ScanResultWriter implements Consumer<ApplicationFile> {
+    private final int batchSize;
+    private final Consumer<List<ApplicationFile>> writeBatch;
+    private final Runnable onFailure;
+    private List<ApplicationFile> batch;
+    private RuntimeException failure;
+
+    public ScanResultWriter(int batchSize, Consumer<List<ApplicationFile>> writeBatch, Runnable onFailure) {
+        this.batchSize = Math.max(1, batchSize);
+        this.writeBatch = writeBatch;
+        this.onFailure = onFailure;
+        this.batch = new ArrayList<>(this.batchSize);
+    }
+
+    // Called concurrently by the workers; a full batch is written while the others wait, which
+    // throttles hashing to the speed of the database
+    @Override
+    public synchronized void accept(ApplicationFile appFile) {
+        if (failure != null) return;
+        batch.add(appFile);
+        if (batch.size() >= batchSize) {
+            flush();
+        }
+    }
+
+    // Writes the last partial batch and rethrows the first write failure, if any
+    public synchronized void close() {
+        if (failure == null && !batch.isEmpty()) {
+            flush();
+        }
+        if (failure != null) throw failure;
+    }
+
+    public synchronized RuntimeException getFailure() { return failure; }
+
+    private void flush() {
+        List<ApplicationFile> full = batch;
+        batch = new ArrayList<>(batchSize);
+        try {
+            writeBatch.accept(full);
+        } catch (RuntimeException e) {
+            failure = e;
+            onFailure.run();
+        }
+    }
+}
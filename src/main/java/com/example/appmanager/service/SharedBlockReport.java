@@ -0,0 +1,55 @@
+package com.example.appmanager.service;
+
+import java.util.List;
+
+// Block-level overlap under one directory, from the chunk index. Serialized by the shared block API.
+public class SharedBlockReport {
+    private final String directory;
+    private final long totalBytes;
+    private final long uniqueBytes;
+    private final List<Pair> pairs;
+
+    public SharedBlockReport(String directory, long totalBytes, long uniqueBytes, List<Pair> pairs) {
+        this.directory = directory;
+        this.totalBytes = totalBytes;
+        this.uniqueBytes = uniqueBytes;
+        this.pairs = pairs;
+    }
+
+    public String getDirectory() { return directory; }
+    public long getTotalBytes() { return totalBytes; }
+    public long getUniqueBytes() { return uniqueBytes; }
+    public List<Pair> getPairs() { return pairs; }
+
+    // What block-level deduplication of the directory would save
+    public long getSavableBytes() {
+        return totalBytes - uniqueBytes;
+    }
+
+    public double getSavingsPercent() {
+        return totalBytes > 0 ? 100.0 * getSavableBytes() / totalBytes : 0.0;
+    }
+
+    // Two files and the bytes they have in common, also as a share of each file
+    public static class Pair {
+        private final String pathA;
+        private final String pathB;
+        private final long sharedBytes;
+        private final long bytesA;
+        private final long bytesB;
+
+        public Pair(String pathA, String pathB, long sharedBytes, long bytesA, long bytesB) {
+            this.pathA = pathA;
+            this.pathB = pathB;
+            this.sharedBytes = sharedBytes;
+            this.bytesA = bytesA;
+            this.bytesB = bytesB;
+        }
+
+        public String getPathA() { return pathA; }
+        public String getPathB() { return pathB; }
+        public long getSharedBytes() { return sharedBytes; }
+        public double getSharedRatioA() { return bytesA > 0 ? (double) sharedBytes / bytesA : 0.0; }
+        public double getSharedRatioB() { return bytesB > 0 ? (double) sharedBytes / bytesB : 0.0; }
+    }
+}
@@ -0,0 +1,278 @@
+package com.example.appmanager.service;
+
+import java.nio.ByteBuffer;
+import java.util.HashSet;
+import java.util.Set;
+
+// In-process context-triggered piecewise hashing (CTPH). Hashes and scores are compatible with
+// the ssdeep command line tool (libfuzzy), so no process has to be forked per file or per pair.
+public class Ssdeep {
+    private static final int ROLLING_WINDOW = 7;
+    private static final int MIN_BLOCKSIZE = 3;
+    private static final int HASH_PRIME = 0x01000193;
+    private static final int HASH_INIT = 0x28021967;
+    private static final int NUM_BLOCKHASHES = 31;
+    private static final int SPAMSUM_LENGTH = 64;
+    private static final char[] B64 =
+            "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/".toCharArray();
+
+    // Rolling hash over the last ROLLING_WINDOW bytes
+    private final int[] window = new int[ROLLING_WINDOW];
+    private int h1, h2, h3, n;
+
+    // One piecewise hash per candidate block size, [bhStart, bhEnd) are live
+    private final int[] blockHash = new int[NUM_BLOCKHASHES];
+    private final int[] halfHash = new int[NUM_BLOCKHASHES];
+    private final char[][] digest = new char[NUM_BLOCKHASHES][SPAMSUM_LENGTH];
+    private final char[] halfDigest = new char[NUM_BLOCKHASHES];
+    private final int[] digestIndex = new int[NUM_BLOCKHASHES];
+    private int bhStart = 0;
+    private int bhEnd = 1;
+    private final int bhEndLimit;
+    private final long fixedSize;
+    private long totalSize;
+
+    public Ssdeep(long totalLength) {
+        this.fixedSize = totalLength;
+        int bi = 0;
+        while (blockSize(bi) * SPAMSUM_LENGTH < totalLength) {
+            ++bi;
+            if (bi == NUM_BLOCKHASHES - 2) break;
+        }
+        this.bhEndLimit = bi + 1;
+        blockHash[0] = HASH_INIT;
+        halfHash[0] = HASH_INIT;
+    }
+
+    public static String hash(byte[] data) {
+        Ssdeep ssdeep = new Ssdeep(data.length);
+        ssdeep.update(ByteBuffer.wrap(data));
+        return ssdeep.digest();
+    }
+
+    // Consumes the chunk's remaining bytes without moving its position
+    public void update(ByteBuffer chunk) {
+        int end = chunk.limit();
+        totalSize += end - chunk.position();
+        for (int i = chunk.position(); i < end; i++) {
+            step(chunk.get(i) & 0xFF);
+        }
+    }
+
+    public String digest() {
+        int bi = bhStart;
+        long rolling = rollSum();
+        while (blockSize(bi) * SPAMSUM_LENGTH < totalSize) {
+            ++bi;
+            if (bi >= NUM_BLOCKHASHES) {
+                throw new IllegalStateException("Input too large for ssdeep: " + totalSize + " bytes");
+            }
+        }
+        if (bi >= bhEnd) bi = bhEnd - 1;
+        while (bi > bhStart && digestIndex[bi] < SPAMSUM_LENGTH / 2) --bi;
+
+        StringBuilder sb = new StringBuilder(16 + SPAMSUM_LENGTH + SPAMSUM_LENGTH / 2);
+        sb.append(blockSize(bi)).append(':');
+        sb.append(digest[bi], 0, digestIndex[bi]);
+        if (rolling != 0) {
+            sb.append(B64[blockHash[bi] & 63]);
+        } else if (digest[bi][digestIndex[bi]] != 0) {
+            sb.append(digest[bi][digestIndex[bi]]);
+        }
+        sb.append(':');
+        if (bi < bhEnd - 1) {
+            ++bi;
+            sb.append(digest[bi], 0, Math.min(digestIndex[bi], SPAMSUM_LENGTH / 2 - 1));
+            if (rolling != 0) {
+                sb.append(B64[halfHash[bi] & 63]);
+            } else if (halfDigest[bi] != 0) {
+                sb.append(halfDigest[bi]);
+            }
+        } else if (rolling != 0) {
+            sb.append(B64[(bi == 0 ? blockHash[bi] : halfHash[bi]) & 63]);
+        }
+        return sb.toString();
+    }
+
+    private void step(int c) {
+        h2 -= h1;
+        h2 += ROLLING_WINDOW * c;
+        int slot = Integer.remainderUnsigned(n, ROLLING_WINDOW);
+        h1 += c;
+        h1 -= window[slot];
+        window[slot] = c;
+        n++;
+        h3 = (h3 << 5) ^ c;
+        long rolling = rollSum();
+
+        for (int i = bhStart; i < bhEnd; i++) {
+            blockHash[i] = (blockHash[i] * HASH_PRIME) ^ c;
+            halfHash[i] = (halfHash[i] * HASH_PRIME) ^ c;
+        }
+        for (int i = bhStart; i < bhEnd; i++) {
+            long bs = blockSize(i);
+            // If this is not a trigger point for bs it is not one for any larger block size either
+            if (rolling % bs != bs - 1) break;
+            if (digestIndex[i] == 0) tryForkBlockHash();
+            digest[i][digestIndex[i]] = B64[blockHash[i] & 63];
+            halfDigest[i] = B64[halfHash[i] & 63];
+            if (digestIndex[i] < SPAMSUM_LENGTH - 1) {
+                digest[i][++digestIndex[i]] = 0;
+                blockHash[i] = HASH_INIT;
+                if (digestIndex[i] < SPAMSUM_LENGTH / 2) {
+                    halfHash[i] = HASH_INIT;
+                    halfDigest[i] = 0;
+                }
+            } else {
+                tryReduceBlockHash();
+            }
+        }
+    }
+
+    private long rollSum() {
+        return (h1 + h2 + h3) & 0xFFFFFFFFL;
+    }
+
+    private void tryForkBlockHash() {
+        if (bhEnd > bhEndLimit) return;
+        blockHash[bhEnd] = blockHash[bhEnd - 1];
+        halfHash[bhEnd] = halfHash[bhEnd - 1];
+        digest[bhEnd][0] = 0;
+        halfDigest[bhEnd] = 0;
+        digestIndex[bhEnd] = 0;
+        ++bhEnd;
+    }
+
+    private void tryReduceBlockHash() {
+        if (bhEnd - bhStart < 2) return;
+        // The initial block size estimate would still select this or a smaller block size
+        if (blockSize(bhStart) * SPAMSUM_LENGTH >= fixedSize) return;
+        // The digest-length adjustment would still select this block size
+        if (digestIndex[bhStart + 1] < SPAMSUM_LENGTH / 2) return;
+        ++bhStart;
+    }
+
+    private static long blockSize(int index) {
+        return ((long) MIN_BLOCKSIZE) << index;
+    }
+
+    // Similarity score 0-100 between two ssdeep hashes, same semantics as fuzzy_compare()
+    public static int compare(String hashA, String hashB) {
+        String[] a = parse(hashA);
+        String[] b = parse(hashB);
+        if (a == null || b == null) return 0;
+        long bsA = Long.parseLong(a[0]);
+        long bsB = Long.parseLong(b[0]);
+        if (bsA != bsB && bsA * 2 != bsB && (bsA % 2 == 1 || bsA / 2 != bsB)) return 0;
+
+        String a1 = eliminateSequences(a[1]);
+        String a2 = eliminateSequences(a[2]);
+        String b1 = eliminateSequences(b[1]);
+        String b2 = eliminateSequences(b[2]);
+        if (bsA == bsB && a1.equals(b1) && a2.equals(b2)) return 100;
+
+        if (bsA == bsB) {
+            return (int) Math.max(scoreStrings(a1, b1, bsA), scoreStrings(a2, b2, bsA * 2));
+        } else if (bsA * 2 == bsB) {
+            return (int) scoreStrings(b1, a2, bsB);
+        } else {
+            return (int) scoreStrings(a1, b2, bsA);
+        }
+    }
+
+    // compare() is non-zero only if two hashes share one of these keys: a ROLLING_WINDOW-gram of a
+    // signature at the same block size, or the whole sequence-eliminated hash
+    public static Set<String> blockingKeys(String hash) {
+        Set<String> keys = new HashSet<>();
+        String[] parts = parse(hash);
+        if (parts == null) return keys;
+        long blockSize = Long.parseLong(parts[0]);
+        String first = eliminateSequences(parts[1]);
+        String second = eliminateSequences(parts[2]);
+        keys.add("=" + blockSize + ":" + first + ":" + second);
+        for (int i = 0; i + ROLLING_WINDOW <= first.length(); i++) {
+            keys.add(blockSize + ":" + first.substring(i, i + ROLLING_WINDOW));
+        }
+        for (int i = 0; i + ROLLING_WINDOW <= second.length(); i++) {
+            keys.add(blockSize * 2 + ":" + second.substring(i, i + ROLLING_WINDOW));
+        }
+        return keys;
+    }
+
+    public static long blockSizeOf(String hash) {
+        String[] parts = parse(hash);
+        return parts == null ? 0 : Long.parseLong(parts[0]);
+    }
+
+    // Splits "blocksize:part1:part2[,filename]" into its three fields
+    private static String[] parse(String hash) {
+        if (hash == null) return null;
+        int comma = hash.indexOf(',');
+        String body = comma == -1 ? hash : hash.substring(0, comma);
+        String[] parts = body.split(":", -1);
+        if (parts.length != 3 || parts[0].isEmpty()) return null;
+        for (int i = 0; i < parts[0].length(); i++) {
+            if (!Character.isDigit(parts[0].charAt(i))) return null;
+        }
+        if (parts[1].length() > SPAMSUM_LENGTH || parts[2].length() > SPAMSUM_LENGTH) return null;
+        return parts;
+    }
+
+    // Runs of more than three identical characters carry no extra information
+    private static String eliminateSequences(String s) {
+        StringBuilder sb = new StringBuilder(s.length());
+        for (int i = 0; i < s.length(); i++) {
+            char c = s.charAt(i);
+            if (i < 3 || c != s.charAt(i - 1) || c != s.charAt(i - 2) || c != s.charAt(i - 3)) {
+                sb.append(c);
+            }
+        }
+        return sb.toString();
+    }
+
+    private static long scoreStrings(String s1, String s2, long blockSize) {
+        if (!hasCommonSubstring(s1, s2)) return 0;
+        long score = editDistance(s1, s2);
+        // Scale to the proportion of the message that changed, then to a 0-100 "higher is better" score
+        score = (score * SPAMSUM_LENGTH) / (s1.length() + s2.length());
+        score = (100 * score) / SPAMSUM_LENGTH;
+        if (score >= 100) return 0;
+        score = 100 - score;
+        // Small block sizes should not exaggerate the match size
+        if (blockSize >= (99 + ROLLING_WINDOW) / ROLLING_WINDOW * MIN_BLOCKSIZE) return score;
+        long cap = blockSize / MIN_BLOCKSIZE * Math.min(s1.length(), s2.length());
+        return Math.min(score, cap);
+    }
+
+    private static boolean hasCommonSubstring(String s1, String s2) {
+        if (s1.length() < ROLLING_WINDOW || s2.length() < ROLLING_WINDOW) return false;
+        Set<String> windows = new HashSet<>();
+        for (int i = 0; i + ROLLING_WINDOW <= s1.length(); i++) {
+            windows.add(s1.substring(i, i + ROLLING_WINDOW));
+        }
+        for (int i = 0; i + ROLLING_WINDOW <= s2.length(); i++) {
+            if (windows.contains(s2.substring(i, i + ROLLING_WINDOW))) return true;
+        }
+        return false;
+    }
+
+    // Levenshtein distance with insert/delete cost 1 and substitution cost 2
+    private static int editDistance(String s1, String s2) {
+        int[] previous = new int[s2.length() + 1];
+        int[] current = new int[s2.length() + 1];
+        for (int j = 0; j <= s2.length(); j++) previous[j] = j;
+        for (int i = 0; i < s1.length(); i++) {
+            current[0] = i + 1;
+            for (int j = 0; j < s2.length(); j++) {
+                int insert = previous[j + 1] + 1;
+                int delete = current[j] + 1;
+                int replace = previous[j] + (s1.charAt(i) == s2.charAt(j) ? 0 : 2);
+                current[j + 1] = Math.min(Math.min(insert, delete), replace);
+            }
+            int[] swap = previous;
+            previous = current;
+            current = swap;
+        }
+        return previous[s2.length()];
+    }
+}
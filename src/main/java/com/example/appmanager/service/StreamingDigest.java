@@ -0,0 +1,89 @@
+package com.example.appmanager.service;
+
+import java.io.ByteArrayOutputStream;
+import java.nio.ByteBuffer;
+import java.security.MessageDigest;
+import java.security.NoSuchAlgorithmException;
+
+// Accumulates everything the scanner needs from one sequential read of a file:
+// the SHA-256 digest, the byte histogram for entropy, the ssdeep rolling state, the content-defined chunks
+// and (for text) the raw content.
+public class StreamingDigest {
+    private final MessageDigest sha256;
+    private final long[] frequencies = new long[256];
+    private long total;
+    private final ByteArrayOutputStream content;
+    private final Ssdeep fuzzyHash;
+    private final ContentChunker chunker;
+
+    public StreamingDigest(boolean retainContent, Ssdeep fuzzyHash) throws NoSuchAlgorithmException {
+        this(retainContent, fuzzyHash, null);
+    }
+
+    public StreamingDigest(boolean retainContent, Ssdeep fuzzyHash, ContentChunker chunker) throws NoSuchAlgorithmException {
+        this.sha256 = MessageDigest.getInstance("SHA-256");
+        this.content = retainContent ? new ByteArrayOutputStream() : null;
+        this.fuzzyHash = fuzzyHash;
+        this.chunker = chunker;
+    }
+
+    public void update(ByteBuffer chunk) {
+        int start = chunk.position();
+        int end = chunk.limit();
+        for (int i = start; i < end; i++) {
+            frequencies[chunk.get(i) & 0xFF]++;
+        }
+        total += end - start;
+        if (content != null) {
+            byte[] bytes = new byte[end - start];
+            chunk.get(start, bytes);
+            content.write(bytes, 0, bytes.length);
+        }
+        if (fuzzyHash != null) {
+            fuzzyHash.update(chunk);
+        }
+        if (chunker != null) {
+            chunker.update(chunk);
+        }
+        sha256.update(chunk);
+    }
+
+    public String sha256Hex() {
+        return toHex(sha256.digest());
+    }
+
+    public double entropy() {
+        double entropy = 0.0;
+        for (long f : frequencies) {
+            if (f > 0) {
+                double p = (double) f / total;
+                entropy -= p * (Math.log(p) / Math.log(2));
+            }
+        }
+        return entropy;
+    }
+
+    public String fuzzyHash() {
+        return fuzzyHash != null ? fuzzyHash.digest() : "";
+    }
+
+    // Distinct chunks as (hash, size, occurrences) triples, null when the file was not chunked
+    public long[] chunks() {
+        return chunker != null ? chunker.finish() : null;
+    }
+
+    public long getTotal() { return total; }
+
+    public byte[] getContent() {
+        return content != null ? content.toByteArray() : new byte[0];
+    }
+
+    static String toHex(byte[] bytes) {
+        StringBuilder sb = new StringBuilder(bytes.length * 2);
+        for (byte b : bytes) {
+            sb.append(Character.forDigit((b >> 4) & 0xF, 16));
+            sb.append(Character.forDigit(b & 0xF, 16));
+        }
+        return sb.toString();
+    }
+}
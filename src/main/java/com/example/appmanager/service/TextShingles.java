@@ -0,0 +1,60 @@
+package com.example.appmanager.service;
+
+import java.util.Arrays;
+
+// Word-set fingerprint of a text file: the sorted, distinct 64-bit hashes of its normalised words.
+// Computed once at scan time, so Jaccard similarity is a merge of two arrays instead of two file reads.
+public class TextShingles {
+    private static final long FNV_OFFSET = 0xcbf29ce484222325L;
+    private static final long FNV_PRIME = 0x100000001b3L;
+
+    // Same normalisation as the normalised text hash: lower case, non-alphanumerics to spaces
+    public static long[] tokenHashes(byte[] content) {
+        String[] words = new String(content).toLowerCase().replaceAll("[^a-z0-9 ]", " ").split("\\s+");
+        long[] hashes = new long[words.length];
+        for (int i = 0; i < words.length; i++) {
+            hashes[i] = hash(words[i]);
+        }
+        Arrays.sort(hashes);
+        int distinct = 0;
+        for (int i = 0; i < hashes.length; i++) {
+            if (i == 0 || hashes[i] != hashes[distinct - 1]) {
+                hashes[distinct++] = hashes[i];
+            }
+        }
+        return Arrays.copyOf(hashes, distinct);
+    }
+
+    // |A n B| / |A u B| over two sorted, distinct arrays
+    public static double jaccard(long[] a, long[] b) {
+        int i = 0, j = 0, common = 0;
+        while (i < a.length && j < b.length) {
+            if (a[i] == b[j]) {
+                common++;
+                i++;
+                j++;
+            } else if (a[i] < b[j]) {
+                i++;
+            } else {
+                j++;
+            }
+        }
+        int union = a.length + b.length - common;
+        return union == 0 ? 0.0 : (double) common / union;
+    }
+
+    // FNV-1a over the UTF-16 code units, then a 64-bit finaliser so that similar words spread out
+    static long hash(String word) {
+        long h = FNV_OFFSET;
+        for (int i = 0; i < word.length(); i++) {
+            h ^= word.charAt(i);
+            h *= FNV_PRIME;
+        }
+        h ^= h >>> 33;
+        h *= 0xff51afd7ed558ccdL;
+        h ^= h >>> 33;
+        h *= 0xc4ceb9fe1a85ec53L;
+        h ^= h >>> 33;
+        return h;
+    }
+}
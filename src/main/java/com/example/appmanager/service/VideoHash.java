@@ -0,0 +1,142 @@
+package com.example.appmanager.service;
+
+import java.io.File;
+import java.io.IOException;
+import java.io.InputStream;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.concurrent.TimeUnit;
+
+// Perceptual video signature: a fixed number of frames, sampled evenly over the duration, each reduced
+// to 64 bits. 40 bits are a difference hash of a 9x5 grey thumbnail (structure), 24 bits are the mean
+// red, green and blue as 8-bit thermometer codes (colour). Hamming distance between two signatures
+// grows with how different the sampled frames look, whatever container, codec or bitrate was used.
+// Frames are decoded by ffmpeg, which seeks to each sample point and decodes only from the keyframe
+// before it up to that point.
+public class VideoHash {
+    private static final int THUMB_WIDTH = 9;
+    private static final int THUMB_HEIGHT = 5;
+    private static final int FRAME_BYTES = THUMB_WIDTH * THUMB_HEIGHT * 3;
+    // Neighbouring grey values closer than this count as equal, so flat areas do not flicker with noise
+    private static final int EDGE_MARGIN = 3;
+    // A mean of this many differing bits per sampled frame scores 0
+    private static final int ZERO_SCORE_BITS = 12;
+    private static final long TIMEOUT_SECONDS = 60;
+
+    // Empty when the video cannot be decoded or ffmpeg/ffprobe cannot be run, so the scan index does not
+    // retry it every time; such videos keep the ssdeep and size/entropy rules
+    public static long[] compute(File file, int frames, String ffmpeg, String ffprobe) {
+        try {
+            double duration = probeDuration(file, ffprobe);
+            if (duration <= 0) return new long[0];
+            long[] signature = new long[frames];
+            for (int i = 0; i < frames; i++) {
+                byte[] rgb = grabFrame(file, duration * (i + 0.5) / frames, ffmpeg);
+                if (rgb == null) return new long[0];
+                signature[i] = frameHash(rgb);
+            }
+            return signature;
+        } catch (IOException e) {
+            System.err.println("Cannot run ffmpeg for " + file.getName() + ": " + e.getMessage());
+            return new long[0];
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            return new long[0];
+        }
+    }
+
+    private static double probeDuration(File file, String ffprobe) throws IOException, InterruptedException {
+        ProcessBuilder pb = new ProcessBuilder(ffprobe, "-v", "error", "-show_entries", "format=duration",
+                "-of", "default=noprint_wrappers=1:nokey=1", file.getAbsolutePath());
+        byte[] output = run(pb, 256);
+        if (output == null) return 0;
+        try {
+            return Double.parseDouble(new String(output).trim());
+        } catch (NumberFormatException e) {
+            return 0;
+        }
+    }
+
+    // One frame at the given time, area-averaged down to the thumbnail as packed RGB
+    private static byte[] grabFrame(File file, double seconds, String ffmpeg) throws IOException, InterruptedException {
+        ProcessBuilder pb = new ProcessBuilder(ffmpeg, "-v", "error", "-ss", String.format(java.util.Locale.ROOT, "%.3f", seconds),
+                "-i", file.getAbsolutePath(), "-frames:v", "1", "-an",
+                "-vf", "scale=" + THUMB_WIDTH + ":" + THUMB_HEIGHT + ":flags=area,format=rgb24",
+                "-f", "rawvideo", "pipe:1");
+        byte[] rgb = run(pb, FRAME_BYTES);
+        return rgb != null && rgb.length == FRAME_BYTES ? rgb : null;
+    }
+
+    // Runs the command with its output sent to a temporary file, so nothing reads a pipe that a hung process
+    // keeps open; it is killed after TIMEOUT_SECONDS. Returns the first limit bytes of the output, or null
+    // on timeout.
+    private static byte[] run(ProcessBuilder pb, int limit) throws IOException, InterruptedException {
+        Path output = Files.createTempFile("videohash", ".out");
+        try {
+            pb.redirectError(ProcessBuilder.Redirect.DISCARD);
+            pb.redirectOutput(output.toFile());
+            Process process = pb.start();
+            try {
+                if (!process.waitFor(TIMEOUT_SECONDS, TimeUnit.SECONDS)) return null;
+            } finally {
+                // Also on interrupt
+                if (process.isAlive()) process.destroyForcibly();
+            }
+            try (InputStream in = Files.newInputStream(output)) {
+                return in.readNBytes(limit);
+            }
+        } finally {
+            Files.deleteIfExists(output);
+        }
+    }
+
+    private static long frameHash(byte[] rgb) {
+        int[] grey = new int[THUMB_WIDTH * THUMB_HEIGHT];
+        long red = 0, green = 0, blue = 0;
+        for (int p = 0; p < grey.length; p++) {
+            int r = rgb[3 * p] & 0xFF, g = rgb[3 * p + 1] & 0xFF, b = rgb[3 * p + 2] & 0xFF;
+            grey[p] = (r * 299 + g * 587 + b * 114) / 1000;
+            red += r;
+            green += g;
+            blue += b;
+        }
+        long hash = 0;
+        for (int y = 0; y < THUMB_HEIGHT; y++) {
+            for (int x = 0; x < THUMB_WIDTH - 1; x++) {
+                int left = grey[y * THUMB_WIDTH + x];
+                int right = grey[y * THUMB_WIDTH + x + 1];
+                hash = (hash << 1) | (left > right + EDGE_MARGIN ? 1 : 0);
+            }
+        }
+        hash = (hash << 8) | thermometer(red / grey.length);
+        hash = (hash << 8) | thermometer(green / grey.length);
+        hash = (hash << 8) | thermometer(blue / grey.length);
+        return hash;
+    }
+
+    // 0-255 as 0-8 set bits, so the Hamming distance between two codes is the difference in level
+    private static long thermometer(long value) {
+        int level = (int) Math.round(value * 8 / 255.0);
+        return (1L << level) - 1;
+    }
+
+    public static int distance(long[] a, long[] b) {
+        int distance = 0;
+        for (int i = 0; i < a.length; i++) {
+            distance += Long.bitCount(a[i] ^ b[i]);
+        }
+        return distance;
+    }
+
+    // Similarity 0-100; signatures sampled at a different number of frames are not comparable
+    public static double compare(long[] a, long[] b) {
+        if (a == null || b == null || a.length == 0 || a.length != b.length) return 0.0;
+        return Math.max(0.0, 100.0 - 100.0 * distance(a, b) / ((double) ZERO_SCORE_BITS * a.length));
+    }
+
+    // Largest distance that still scores above minScore
+    public static int radius(double minScore, int frames) {
+        double limit = (100.0 - minScore) / 100.0 * ZERO_SCORE_BITS * frames;
+        return (int) Math.ceil(limit) - 1;
+    }
+}
@@ -0,0 +1,91 @@
+package com.example.appmanager.service;
+
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.io.TempDir;
+
+import java.io.File;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.Random;
+import java.util.zip.CRC32;
+import java.util.zip.ZipEntry;
+import java.util.zip.ZipOutputStream;
+
+import static org.junit.jupiter.api.Assertions.assertArrayEquals;
+import static org.junit.jupiter.api.Assertions.assertEquals;
+
+class ArchiveManifestTest {
+    private static final byte[] SMALL = random(1, 3000);
+    private static final byte[] MEDIUM = random(2, 5000);
+    private static final byte[] LARGE = random(3, 7000);
+
+    @TempDir
+    Path dir;
+
+    @Test
+    void namesOrderAndCompressionDoNotMatter() throws IOException {
+        long[] deflated = ArchiveManifest.compute(zip("a.zip", ZipEntry.DEFLATED,
+                new String[] { "lib/a.bin", "lib/b.bin", "lib/c.bin" }, SMALL, MEDIUM, LARGE));
+        long[] stored = ArchiveManifest.compute(zip("b.zip", ZipEntry.STORED,
+                new String[] { "x", "y", "z" }, LARGE, SMALL, MEDIUM));
+        assertArrayEquals(deflated, stored);
+        assertEquals(1.0, ArchiveManifest.overlap(deflated, stored));
+        assertEquals(3001 + 5001 + 7001, ArchiveManifest.totalWeight(deflated));
+    }
+
+    @Test
+    void overlapIsWeightedBySize() throws IOException {
+        byte[] changed = LARGE.clone();
+        changed[100] ^= 1;
+        long[] a = ArchiveManifest.compute(zip("a.zip", ZipEntry.DEFLATED,
+                new String[] { "a", "b", "c" }, SMALL, MEDIUM, LARGE));
+        long[] b = ArchiveManifest.compute(zip("b.zip", ZipEntry.DEFLATED,
+                new String[] { "a", "b", "c" }, SMALL, MEDIUM, changed));
+        assertEquals((double) (3001 + 5001) / (3001 + 5001 + 7001 + 7001), ArchiveManifest.overlap(a, b));
+        assertEquals(ArchiveManifest.overlap(a, b), ArchiveManifest.overlap(b, a));
+    }
+
+    @Test
+    void repeatedMembersAddUpAndDirectoriesAreSkipped() throws IOException {
+        long[] manifest = ArchiveManifest.compute(zip("a.zip", ZipEntry.DEFLATED,
+                new String[] { "dir/", "one", "two" }, new byte[0], SMALL, SMALL));
+        assertEquals(2, manifest.length);
+        assertEquals(2 * 3001, manifest[1]);
+    }
+
+    @Test
+    void nonZipFileGivesEmptyManifest() throws IOException {
+        Path file = dir.resolve("not.zip");
+        Files.write(file, MEDIUM);
+        assertEquals(0, ArchiveManifest.compute(file.toFile()).length);
+    }
+
+    private File zip(String name, int method, String[] names, byte[]... contents) throws IOException {
+        File file = dir.resolve(name).toFile();
+        try (ZipOutputStream out = new ZipOutputStream(new FileOutputStream(file))) {
+            out.setMethod(method);
+            for (int i = 0; i < names.length; i++) {
+                ZipEntry entry = new ZipEntry(names[i]);
+                if (method == ZipEntry.STORED) {
+                    // Stored entries must carry their size and CRC up front
+                    CRC32 crc = new CRC32();
+                    crc.update(contents[i]);
+                    entry.setSize(contents[i].length);
+                    entry.setCrc(crc.getValue());
+                }
+                out.putNextEntry(entry);
+                out.write(contents[i]);
+                out.closeEntry();
+            }
+        }
+        return file;
+    }
+
+    private static byte[] random(long seed, int length) {
+        byte[] data = new byte[length];
+        new Random(seed).nextBytes(data);
+        return data;
+    }
+}
@@ -0,0 +1,103 @@
+package com.example.appmanager.service;
+
+import org.junit.jupiter.api.Test;
+import org.junit.jupiter.api.io.TempDir;
+
+import javax.sound.sampled.AudioFileFormat;
+import javax.sound.sampled.AudioFormat;
+import javax.sound.sampled.AudioInputStream;
+import javax.sound.sampled.AudioSystem;
+import java.io.ByteArrayInputStream;
+import java.io.File;
+import java.io.IOException;
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.util.Arrays;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertFalse;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+
+class AudioFingerprintTest {
+    // MIDI notes of four major and minor triads; each chord lasts 0.5 s, i.e. five frames
+    private static final int[][] C_F_G_AM = { { 60, 64, 67 }, { 65, 69, 72 }, { 67, 71, 74 }, { 69, 72, 76 } };
+    private static final int[][] D_E_BM_FS = { { 62, 66, 69 }, { 64, 68, 71 }, { 71, 74, 78 }, { 66, 70, 73 } };
+    // Pitch-class masks of those chords, C = bit 0
+    private static final int[] C_F_G_AM_CODES = { 0x091, 0x221, 0x884, 0x211 };
+
+    @TempDir
+    Path dir;
+
+    @Test
+    void framesCarryTheChordPitchClasses() throws IOException {
+        byte[] fingerprint = AudioFingerprint.compute(wav("a.wav", C_F_G_AM, 44100));
+        ByteBuffer codes = ByteBuffer.wrap(fingerprint);
+        assertEquals(2 * 40, fingerprint.length);
+        for (int frame = 0; frame < 40; frame++) {
+            int code = codes.getShort() & 0xFFFF;
+            assertEquals(1, code >>> 12);
+            assertEquals(C_F_G_AM_CODES[frame / 5 % 4], code & 0xFFF);
+        }
+        assertTrue(AudioFingerprint.isCurrent(fingerprint));
+        assertTrue(AudioFingerprint.blockingKeys(fingerprint).contains((0x091L << 24) | (0x221L << 12) | 0x884L));
+    }
+
+    @Test
+    void sampleRateDoesNotChangeTheFingerprint() throws IOException {
+        byte[] a = AudioFingerprint.compute(wav("a.wav", C_F_G_AM, 44100));
+        assertEquals(100, AudioFingerprint.compare(a, AudioFingerprint.compute(wav("b.wav", C_F_G_AM, 48000))));
+        assertEquals(100, AudioFingerprint.compare(a, AudioFingerprint.compute(wav("c.wav", C_F_G_AM, 22050))));
+    }
+
+    @Test
+    void differentMusicScoresLow() throws IOException {
+        byte[] a = AudioFingerprint.compute(wav("a.wav", C_F_G_AM, 44100));
+        byte[] b = AudioFingerprint.compute(wav("b.wav", D_E_BM_FS, 44100));
+        assertEquals(18, AudioFingerprint.compare(a, b));
+    }
+
+    @Test
+    void olderFingerprintsAreNotCurrent() {
+        assertFalse(AudioFingerprint.isCurrent(new byte[] { 0x00, (byte) 0x91, 0x02, 0x21 }));
+        assertTrue(AudioFingerprint.isCurrent(new byte[0]));
+    }
+
+    @Test
+    void undecodableFileGivesEmptyFingerprint() throws IOException {
+        Path file = dir.resolve("not-audio.wav");
+        Files.writeString(file, "not a wave file");
+        assertEquals(0, AudioFingerprint.compute(file.toFile()).length);
+    }
+
+    @Test
+    void truncatedOrUnreadableFileGivesEmptyFingerprint() throws IOException {
+        Path truncated = dir.resolve("truncated.wav");
+        Files.write(truncated, Arrays.copyOf(Files.readAllBytes(wav("a.wav", C_F_G_AM, 44100).toPath()), 30));
+        assertEquals(0, AudioFingerprint.compute(truncated.toFile()).length);
+        // Opening a directory fails with an IOException
+        assertEquals(0, AudioFingerprint.compute(dir.toFile()).length);
+    }
+
+    // 16-bit mono WAV of the chords played twice, each note a sine at a quarter of full scale
+    private File wav(String name, int[][] chords, int sampleRate) throws IOException {
+        int samplesPerChord = Math.round(sampleRate * 0.5f);
+        int total = 2 * chords.length * samplesPerChord;
+        ByteBuffer pcm = ByteBuffer.allocate(total * 2).order(ByteOrder.LITTLE_ENDIAN);
+        for (int n = 0; n < total; n++) {
+            double t = (double) n / sampleRate;
+            double x = 0;
+            for (int note : chords[n / samplesPerChord % chords.length]) {
+                x += 0.25 * Math.sin(2 * Math.PI * 440 * Math.pow(2, (note - 69) / 12.0) * t);
+            }
+            pcm.putShort((short) Math.round(x * 32767));
+        }
+        AudioFormat format = new AudioFormat(sampleRate, 16, 1, true, false);
+        File file = dir.resolve(name).toFile();
+        try (AudioInputStream in = new AudioInputStream(new ByteArrayInputStream(pcm.array()), format, total)) {
+            AudioSystem.write(in, AudioFileFormat.Type.WAVE, file);
+        }
+        return file;
+    }
+}
@@ -0,0 +1,74 @@
+package com.example.appmanager.service;
+
+import org.junit.jupiter.api.Test;
+
+import java.util.ArrayList;
+import java.util.HashSet;
+import java.util.List;
+import java.util.Random;
+import java.util.Set;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+
+class BkTreeTest {
+    private static final int FRAMES = 8;
+
+    @Test
+    void radiusQueriesMatchBruteForce() {
+        Random random = new Random(12);
+        List<long[]> signatures = new ArrayList<>();
+        // Clusters of near copies around random centres, with some exact duplicates
+        for (int cluster = 0; cluster < 40; cluster++) {
+            long[] centre = new long[FRAMES];
+            for (int i = 0; i < FRAMES; i++) centre[i] = random.nextLong();
+            for (int copy = 0; copy < 10; copy++) {
+                long[] signature = centre.clone();
+                int flips = copy == 0 ? 0 : random.nextInt(30);
+                for (int f = 0; f < flips; f++) {
+                    signature[random.nextInt(FRAMES)] ^= 1L << random.nextInt(64);
+                }
+                signatures.add(signature);
+            }
+        }
+
+        BkTree<long[]> tree = new BkTree<>(VideoHash::distance);
+        for (int id = 0; id < signatures.size(); id++) {
+            tree.add(signatures.get(id), id);
+        }
+        for (int radius : new int[] { 0, 3, 10, 25, 60, 300 }) {
+            for (int q = 0; q < signatures.size(); q += 7) {
+                long[] query = signatures.get(q);
+                Set<Integer> expected = new HashSet<>();
+                for (int id = 0; id < signatures.size(); id++) {
+                    if (VideoHash.distance(query, signatures.get(id)) <= radius) expected.add(id);
+                }
+                Set<Integer> found = new HashSet<>();
+                tree.query(query, radius, id -> assertTrue(found.add(id), "reported twice: " + id));
+                assertEquals(expected, found, "radius " + radius + ", query " + q);
+            }
+        }
+    }
+
+    @Test
+    void emptyTreeFindsNothing() {
+        BkTree<long[]> tree = new BkTree<>(VideoHash::distance);
+        tree.query(new long[FRAMES], 100, id -> { throw new AssertionError("matched " + id); });
+    }
+
+    @Test
+    void radiusIsTheLargestDistanceAboveTheScore() {
+        for (double minScore : new double[] { 75, 90 }) {
+            int radius = VideoHash.radius(minScore, FRAMES);
+            assertTrue(VideoHash.compare(new long[FRAMES], withBits(radius)) > minScore);
+            assertTrue(VideoHash.compare(new long[FRAMES], withBits(radius + 1)) <= minScore);
+        }
+    }
+
+    // A signature at the given Hamming distance from all zeros
+    private static long[] withBits(int bits) {
+        long[] signature = new long[FRAMES];
+        for (int b = 0; b < bits; b++) signature[b % FRAMES] |= 1L << (b / FRAMES);
+        return signature;
+    }
+}
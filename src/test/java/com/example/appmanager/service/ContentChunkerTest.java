@@ -0,0 +1,117 @@
+package com.example.appmanager.service;
+
+import org.junit.jupiter.api.Test;
+
+import java.nio.ByteBuffer;
+import java.nio.charset.StandardCharsets;
+import java.util.Arrays;
+import java.util.HashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.Random;
+
+import static org.junit.jupiter.api.Assertions.assertArrayEquals;
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+
+class ContentChunkerTest {
+    private static final int AVERAGE = 4096;
+
+    @Test
+    void shortInputIsOneChunk() {
+        assertArrayEquals(new long[] { -7071483606217937516L, 3, 1 },
+                chunks("abc".getBytes(StandardCharsets.US_ASCII)));
+        assertEquals(0, chunks(new byte[0]).length);
+    }
+
+    @Test
+    void chunkSizesStayWithinBounds() {
+        byte[] data = random(15, 1 << 20);
+        long[] chunks = chunks(data);
+        assertEquals(205 * 3, chunks.length);
+        long total = 0;
+        int undersized = 0;
+        for (int i = 0; i < chunks.length; i += 3) {
+            assertTrue(chunks[i + 1] <= 4 * AVERAGE);
+            if (chunks[i + 1] < AVERAGE / 4) undersized++;
+            total += chunks[i + 1] * chunks[i + 2];
+        }
+        assertEquals(data.length, total);
+        // Only the tail can be shorter than the minimum
+        assertTrue(undersized <= 1);
+    }
+
+    @Test
+    void streamingInPiecesGivesTheSameChunks() {
+        byte[] data = random(15, 1 << 20);
+        ContentChunker chunker = new ContentChunker(AVERAGE);
+        for (int offset = 0; offset < data.length; offset += 1000) {
+            chunker.update(ByteBuffer.wrap(data, offset, Math.min(1000, data.length - offset)));
+        }
+        assertEquals(asMap(chunks(data)), asMap(chunker.finish()));
+    }
+
+    @Test
+    void boundariesSurviveAnInsertedPrefix() {
+        byte[] data = random(15, 1 << 20);
+        byte[] inserted = random(16, 100);
+        assertStable(data, concat(inserted, data));
+        assertStable(data, concat(concat(slice(data, 0, 500000), inserted), slice(data, 500000, data.length)));
+    }
+
+    @Test
+    void repeatedContentIsCounted() {
+        byte[] block = random(15, 1 << 18);
+        Map<Long, List<Long>> chunks = asMap(chunks(concat(block, block)));
+        assertEquals(52, chunks.size());
+        assertEquals(48, chunks.values().stream().filter(c -> c.get(1) == 2).count());
+    }
+
+    // The edit changes only the chunk it falls into: every other chunk of the original reappears
+    private static void assertStable(byte[] original, byte[] edited) {
+        Map<Long, List<Long>> before = asMap(chunks(original));
+        Map<Long, List<Long>> after = asMap(chunks(edited));
+        int lost = 0;
+        long sharedBytes = 0;
+        for (Map.Entry<Long, List<Long>> chunk : before.entrySet()) {
+            if (after.containsKey(chunk.getKey())) {
+                sharedBytes += chunk.getValue().get(0);
+            } else {
+                lost++;
+            }
+        }
+        assertEquals(1, lost);
+        assertTrue(sharedBytes >= 0.99 * original.length);
+    }
+
+    private static long[] chunks(byte[] data) {
+        ContentChunker chunker = new ContentChunker(AVERAGE);
+        chunker.update(ByteBuffer.wrap(data));
+        return chunker.finish();
+    }
+
+    // hash -> (size, occurrences)
+    private static Map<Long, List<Long>> asMap(long[] chunks) {
+        Map<Long, List<Long>> map = new HashMap<>();
+        for (int i = 0; i < chunks.length; i += 3) {
+            map.put(chunks[i], List.of(chunks[i + 1], chunks[i + 2]));
+        }
+        return map;
+    }
+
+    private static byte[] random(long seed, int length) {
+        byte[] data = new byte[length];
+        new Random(seed).nextBytes(data);
+        return data;
+    }
+
+    private static byte[] slice(byte[] data, int from, int to) {
+        return Arrays.copyOfRange(data, from, to);
+    }
+
+    private static byte[] concat(byte[] a, byte[] b) {
+        byte[] joined = Arrays.copyOf(a, a.length + b.length);
+        System.arraycopy(b, 0, joined, a.length, b.length);
+        return joined;
+    }
+}
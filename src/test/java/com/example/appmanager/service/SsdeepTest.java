@@ -0,0 +1,112 @@
+package com.example.appmanager.service;
+
+import org.junit.jupiter.api.Test;
+
+import java.nio.ByteBuffer;
+import java.nio.charset.StandardCharsets;
+import java.util.Arrays;
+import java.util.HashSet;
+import java.util.Random;
+import java.util.Set;
+
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertFalse;
+
+// Known answers from libfuzzy 2.13 (fuzzy_hash_buf / fuzzy_compare) over the same inputs
+class SsdeepTest {
+    private static final String LINES_2000 =
+            "384:WmlvrjKs5GnM9qrwBIa+O0xzPEGzz149l:W6jjKs5GnM9qrwBIaZ0xzP7zZEl";
+    private static final String RANDOM_SEED_2 =
+            "1536:JrR7cROOrzTqxWuSqNHhDX3WAkF5LdGkpBC2KhyVBRVa7N6fUtutT38NqlCqruSQ:JF7cnziNHJmzFe2KsHEhwV3Sqr9Lk";
+
+    @Test
+    void hashMatchesLibfuzzy() {
+        assertEquals("3::", Ssdeep.hash(new byte[0]));
+        assertEquals("3:FJKKIUKact:FHIGi",
+                Ssdeep.hash("The quick brown fox jumps over the lazy dog".getBytes(StandardCharsets.US_ASCII)));
+        assertEquals(LINES_2000, Ssdeep.hash(lines(2000, -1, -1)));
+        assertEquals("96:Mn+BwsvnIH2hMPxzQ7SOpZWFaPgqi1uy1CPavoucqh2iO:TB1vnfMPxSiQgDB1CyvoucqA",
+                Ssdeep.hash(random(1, 4096)));
+        assertEquals(RANDOM_SEED_2, Ssdeep.hash(random(2, 100000)));
+        assertEquals("3072:2cj91OGqkOyndedvOIHmw9WIeAN+7AZ4gcSwuoa:V91OGqkOyde5O5gb4C0a",
+                Ssdeep.hash(random(3, 100000)));
+    }
+
+    @Test
+    void compareMatchesLibfuzzy() {
+        String linesWithoutFirst400 = Ssdeep.hash(lines(2000, 0, 400));
+        String linesWithoutMiddle = Ssdeep.hash(lines(2000, 1000, 1200));
+        assertEquals("192:f+dzkL4HI75G/8tqTARM8ePXVmGie0gQQZxMKzzzB/2ZgsVb/B5SNmB:f+O0xzPEGzz149l", linesWithoutFirst400);
+        assertEquals(60, Ssdeep.compare(LINES_2000, linesWithoutFirst400));
+        assertEquals(97, Ssdeep.compare(LINES_2000, linesWithoutMiddle));
+        assertEquals(97, Ssdeep.compare(linesWithoutMiddle, LINES_2000));
+
+        byte[] data = random(2, 100000);
+        assertEquals(72, Ssdeep.compare(RANDOM_SEED_2, Ssdeep.hash(flipEvery(data, 5000))));
+        assertEquals(0, Ssdeep.compare(RANDOM_SEED_2, Ssdeep.hash(flipEvery(data, 1000))));
+        assertEquals(69, Ssdeep.compare(RANDOM_SEED_2, Ssdeep.hash(Arrays.copyOf(data, 50000))));
+        assertEquals(0, Ssdeep.compare(RANDOM_SEED_2, Ssdeep.hash(random(3, 100000))));
+        assertEquals(0, Ssdeep.compare(RANDOM_SEED_2, LINES_2000));
+    }
+
+    @Test
+    void compareIgnoresFilenameAndRejectsMalformedHashes() {
+        assertEquals(100, Ssdeep.compare(LINES_2000, LINES_2000 + ",\"/tmp/sample.txt\""));
+        assertEquals(0, Ssdeep.compare(LINES_2000, "not a hash"));
+        assertEquals(0, Ssdeep.compare(LINES_2000, null));
+        assertEquals(384, Ssdeep.blockSizeOf(LINES_2000));
+    }
+
+    @Test
+    void streamingMatchesOneShot() {
+        byte[] data = random(2, 100000);
+        Ssdeep ssdeep = new Ssdeep(data.length);
+        for (int offset = 0; offset < data.length; offset += 777) {
+            ssdeep.update(ByteBuffer.wrap(data, offset, Math.min(777, data.length - offset)));
+        }
+        assertEquals(RANDOM_SEED_2, ssdeep.digest());
+    }
+
+    @Test
+    void pairsWithNonZeroScoreShareABlockingKey() {
+        byte[] data = random(2, 100000);
+        String[] hashes = {
+                RANDOM_SEED_2,
+                Ssdeep.hash(flipEvery(data, 5000)),
+                Ssdeep.hash(Arrays.copyOf(data, 50000)),
+                LINES_2000,
+                Ssdeep.hash(lines(2000, 0, 400)),
+                Ssdeep.hash(lines(2000, 1000, 1200)),
+        };
+        for (String a : hashes) {
+            for (String b : hashes) {
+                if (Ssdeep.compare(a, b) == 0) continue;
+                Set<String> shared = new HashSet<>(Ssdeep.blockingKeys(a));
+                shared.retainAll(Ssdeep.blockingKeys(b));
+                assertFalse(shared.isEmpty(), a + " / " + b);
+            }
+        }
+    }
+
+    // "line i of the sample text\n" for i in [0, count), leaving out [skipFrom, skipTo)
+    private static byte[] lines(int count, int skipFrom, int skipTo) {
+        StringBuilder text = new StringBuilder();
+        for (int i = 0; i < count; i++) {
+            if (i >= skipFrom && i < skipTo) continue;
+            text.append("line ").append(i).append(" of the sample text\n");
+        }
+        return text.toString().getBytes(StandardCharsets.US_ASCII);
+    }
+
+    private static byte[] random(long seed, int length) {
+        byte[] data = new byte[length];
+        new Random(seed).nextBytes(data);
+        return data;
+    }
+
+    private static byte[] flipEvery(byte[] data, int step) {
+        byte[] copy = data.clone();
+        for (int i = 0; i < copy.length; i += step) copy[i] ^= (byte) 0xFF;
+        return copy;
+    }
+}
@@ -0,0 +1,40 @@
+package com.example.appmanager.service;
+
+import org.junit.jupiter.api.Test;
+
+import java.nio.charset.StandardCharsets;
+
+import static org.junit.jupiter.api.Assertions.assertArrayEquals;
+import static org.junit.jupiter.api.Assertions.assertEquals;
+import static org.junit.jupiter.api.Assertions.assertTrue;
+
+class TextShinglesTest {
+
+    @Test
+    void wordHashIsFnv1aWithFinaliser() {
+        assertEquals(0xe9c562c0fdb23244L, TextShingles.hash("hello"));
+    }
+
+    @Test
+    void tokensAreNormalisedSortedAndDistinct() {
+        long[] hashes = shingles("The cat, the HAT.\nthe cat");
+        assertEquals(3, hashes.length);
+        for (int i = 1; i < hashes.length; i++) {
+            assertTrue(hashes[i - 1] < hashes[i]);
+        }
+        assertArrayEquals(hashes, shingles("hat cat the"));
+    }
+
+    @Test
+    void jaccardOfKnownWordSets() {
+        assertEquals(1.0, TextShingles.jaccard(shingles("Hello, World!"), shingles("world hello")));
+        assertEquals(0.5, TextShingles.jaccard(shingles("a b c"), shingles("b c d")));
+        assertEquals(0.6, TextShingles.jaccard(shingles("a b c d"), shingles("b c d e")));
+        assertEquals(0.0, TextShingles.jaccard(shingles("a b"), shingles("c d")));
+        assertEquals(0.0, TextShingles.jaccard(new long[0], new long[0]));
+    }
+
+    private static long[] shingles(String text) {
+        return TextShingles.tokenHashes(text.getBytes(StandardCharsets.UTF_8));
+    }
+}
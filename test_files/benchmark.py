@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+End-to-end FileGuard benchmark: scans generated corpora of increasing size through the HTTP endpoints
+and records how long each step takes, how much memory and CPU the server used and how well the
+reported duplicates match the corpus manifest.
+
+For every corpus size it
+  1. creates the corpus with create_scale_corpus.py (reused if one with the same settings exists)
+  2. POSTs /scan and polls /api/scan-jobs/<id> until the job finishes
+  3. times the first (report building) and a repeated walk over all pages of /api/duplicates
+  4. scores the reported groups against the manifest: pairwise precision/recall, recall per mutation
+  5. POSTs /remove for one file of some duplicate groups and times the next /api/duplicates walk
+Server RSS and CPU are sampled from /proc (or psutil where installed) throughout.
+
+Results are written as JSON; pass an earlier results file to --compare to print the differences.
+
+Examples:
+  # Against a running server, sampling its JVM
+  python3 benchmark.py --pid $(pgrep -f appmanager) --sizes 1000,10000,100000
+
+  # Starting the server from the repository root
+  python3 benchmark.py --start "java -jar target/appmanager-0.0.1-SNAPSHOT.jar" --compare results/old.json
+
+/remove deletes files from disk, so a corpus used for removals is regenerated on the next run.
+"""
+
+import argparse
+import json
+import os
+import shlex
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import zlib
+from collections import Counter, defaultdict
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PAGE_SIZE = 500
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class Server:
+    """HTTP access to one FileGuard instance"""
+
+    def __init__(self, url):
+        self.url = url.rstrip("/")
+        self.opener = urllib.request.build_opener(NoRedirect)
+
+    def get_json(self, path, **params):
+        query = "?" + urllib.parse.urlencode(params) if params else ""
+        with urllib.request.urlopen(self.url + path + query, timeout=3600) as response:
+            return json.load(response)
+
+    def post_form(self, path, fields):
+        """POSTs a form without following the redirect; returns the Location header"""
+        data = urllib.parse.urlencode(fields, doseq=True).encode()
+        try:
+            response = self.opener.open(urllib.request.Request(self.url + path, data=data), timeout=3600)
+            return response.headers.get("Location")
+        except urllib.error.HTTPError as e:
+            if e.code in (301, 302, 303, 307, 308):
+                return e.headers.get("Location")
+            raise
+
+    def is_up(self):
+        try:
+            with urllib.request.urlopen(self.url + "/", timeout=2):
+                return True
+        except (urllib.error.URLError, OSError):
+            return False
+
+
+# ---------------------------------------------------------------------------
+# Resource sampling
+# ---------------------------------------------------------------------------
+
+def process_tree(pid):
+    """pid and all its descendants (a server started through a wrapper such as mvn runs in a child)"""
+    children = defaultdict(list)
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    stat = f.read()
+                children[int(stat[stat.rindex(")") + 2:].split()[1])].append(int(entry))
+            except (OSError, ValueError):
+                continue
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        pending.extend(children.get(current, []))
+    return tree
+
+
+def read_usage(pid):
+    """(resident bytes, CPU seconds) of the process tree rooted at pid"""
+    try:
+        import psutil
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+            rss = cpu = 0
+            for p in processes:
+                try:
+                    rss += p.memory_info().rss
+                    times = p.cpu_times()
+                    cpu += times.user + times.system
+                except psutil.NoSuchProcess:
+                    pass
+            return rss, cpu
+        except psutil.NoSuchProcess:
+            return 0, 0.0
+    except ImportError:
+        pass
+    page = os.sysconf("SC_PAGE_SIZE")
+    ticks = os.sysconf("SC_CLK_TCK")
+    rss = cpu = 0
+    for p in process_tree(pid):
+        try:
+            with open(f"/proc/{p}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            # Fields after the command name: utime and stime are the 12th and 13th, rss the 22nd
+            cpu += (int(fields[11]) + int(fields[12])) / ticks
+            rss += int(fields[21]) * page
+        except (OSError, IndexError, ValueError):
+            continue
+    return rss, cpu
+
+
+class Sampler:
+    """Samples server RSS and CPU in the background while a benchmark step runs"""
+
+    def __init__(self, pid, interval):
+        self.pid = pid
+        self.interval = interval
+        self.samples = []
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def __enter__(self):
+        if self.pid:
+            self.samples.append((time.time(), *read_usage(self.pid)))
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+        return self
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            self.samples.append((time.time(), *read_usage(self.pid)))
+
+    def __exit__(self, *exc):
+        if self.thread:
+            self.stop_event.set()
+            self.thread.join()
+            self.samples.append((time.time(), *read_usage(self.pid)))
+
+    def summary(self):
+        if len(self.samples) < 2:
+            return {}
+        elapsed = self.samples[-1][0] - self.samples[0][0]
+        cpu = self.samples[-1][2] - self.samples[0][2]
+        return {
+            "peak_rss_mb": round(max(s[1] for s in self.samples) / 2 ** 20, 1),
+            "end_rss_mb": round(self.samples[-1][1] / 2 ** 20, 1),
+            "cpu_seconds": round(cpu, 2),
+            "mean_cpu_cores": round(cpu / elapsed, 2) if elapsed > 0 else 0,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Benchmark steps
+# ---------------------------------------------------------------------------
+
+def prepare_corpus(args, files):
+    """Creates (or reuses) the corpus for one size and returns its directory"""
+    # Corpora made with other generator options get directories of their own
+    options = zlib.crc32(args.corpus_args.encode()) if args.corpus_args else 0
+    directory = os.path.abspath(os.path.join(args.corpus_root, f"corpus_{files}_seed{args.seed}_{options:08x}"))
+    summary_path = os.path.join(directory, "corpus.json")
+    if os.path.exists(summary_path):
+        with open(summary_path) as f:
+            settings = json.load(f)["settings"]
+        if settings.get("files") == files and settings.get("seed") == args.seed and not os.path.exists(
+                os.path.join(directory, "removed.json")):
+            print(f"📁 Reusing corpus {directory}")
+            return directory
+    print(f"📁 Creating corpus of {files} files in {directory}")
+    command = [sys.executable, os.path.join(SCRIPT_DIR, "create_scale_corpus.py"), "--output", directory,
+               "--files", str(files), "--seed", str(args.seed)] + shlex.split(args.corpus_args)
+    if os.path.exists(directory):
+        # Files from an earlier, different corpus would not be in the manifest
+        subprocess.run(["rm", "-rf", directory], check=True)
+    subprocess.run(command, check=True)
+    return directory
+
+
+def run_scan(server, args, directory):
+    location = server.post_form("/scan", {"directory": directory})
+    if not location or "/scan-jobs/" not in location:
+        raise RuntimeError(f"/scan did not redirect to a scan job (Location: {location})")
+    job_id = location.rstrip("/").rsplit("/", 1)[1]
+    started = time.time()
+    with Sampler(args.pid, args.sample_interval) as sampler:
+        while True:
+            job = server.get_json(f"/api/scan-jobs/{job_id}")
+            if job["status"] in ("COMPLETED", "FAILED", "CANCELLED"):
+                break
+            time.sleep(args.poll_interval)
+    seconds = time.time() - started
+    if job["status"] != "COMPLETED":
+        raise RuntimeError(f"Scan job {job_id} ended {job['status']}: {job.get('error')}")
+    result = {
+        "seconds": round(seconds, 3),
+        "server_seconds": round(job.get("elapsedMillis", 0) / 1000, 3),
+        "files_hashed": job.get("filesHashed"),
+        "bytes_read": job.get("bytesRead"),
+        "files_per_second": round(job.get("filesPerSecond", 0), 1),
+        "mb_per_second": round(job.get("bytesPerSecond", 0) / 2 ** 20, 1),
+    }
+    result.update(sampler.summary())
+    return result
+
+
+def fetch_duplicates(server, args):
+    """All duplicate groups, page by page; returns (groups, timings)"""
+    groups = []
+    first_page = None
+    after = None
+    with Sampler(args.pid, args.sample_interval) as sampler:
+        started = time.time()
+        while True:
+            params = {"limit": PAGE_SIZE}
+            if after:
+                params["after"] = after
+            page = server.get_json("/api/duplicates", **params)
+            if first_page is None:
+                first_page = time.time() - started
+            groups.extend(page["items"])
+            after = page.get("next")
+            if not after:
+                break
+        seconds = time.time() - started
+    result = {"first_page_seconds": round(first_page, 3), "all_pages_seconds": round(seconds, 3), "groups": len(groups)}
+    result.update(sampler.summary())
+    return groups, result
+
+
+def load_manifest(directory):
+    """path relative to the corpus -> (group id, mutation, type)"""
+    files = {}
+    with open(os.path.join(directory, "manifest.jsonl")) as f:
+        for line in f:
+            record = json.loads(line)
+            for entry in record["files"]:
+                files[entry["path"]] = (record["group"], entry["mutation"], record["type"])
+    return files
+
+
+def score(groups, manifest, directory):
+    """Pairwise precision and recall of the reported groups, and recall of each mutation"""
+    pairs = lambda n: n * (n - 1) // 2
+    true_pairs = sum(pairs(n) for n in Counter(group for group, _, _ in manifest.values()).values())
+    reported_pairs = correct_pairs = unknown = 0
+    found = set()
+    for group in groups:
+        members = []
+        for row in group["files"]:
+            entry = manifest.get(os.path.relpath(row["path"], directory))
+            if entry is None:
+                unknown += 1
+            else:
+                members.append(entry)
+        reported_pairs += pairs(len(group["files"]))
+        by_truth = Counter(truth_group for truth_group, _, _ in members)
+        correct_pairs += sum(pairs(n) for n in by_truth.values())
+        # A variant counts as found when it is reported together with its original
+        with_original = {g for g, mutation, _ in members if mutation == "original"}
+        found.update((g, m, t) for g, m, t in members if g in with_original and m != "original")
+
+    # Variants are identified by (group, mutation, type), so repeated mutations in a group count once
+    expected = {(g, m, t) for g, m, t in manifest.values() if m != "original"}
+    by_mutation = defaultdict(lambda: [0, 0])
+    for g, m, t in expected:
+        by_mutation[f"{t}/{m}"][1] += 1
+        if (g, m, t) in found:
+            by_mutation[f"{t}/{m}"][0] += 1
+    precision = correct_pairs / reported_pairs if reported_pairs else 1.0
+    recall = correct_pairs / true_pairs if true_pairs else 1.0
+    return {
+        "true_pairs": true_pairs,
+        "reported_pairs": reported_pairs,
+        "correct_pairs": correct_pairs,
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+        "f1": round(2 * precision * recall / (precision + recall), 4) if precision + recall else 0.0,
+        "files_not_in_manifest": unknown,
+        "recall_by_mutation": {k: round(v[0] / v[1], 4) for k, v in sorted(by_mutation.items())},
+    }
+
+
+def run_remove(server, args, groups, directory):
+    """Removes the last file of up to --remove groups, then times the next full duplicate walk"""
+    chosen = [group["files"][-1] for group in groups[:args.remove] if len(group["files"]) > 1]
+    if not chosen:
+        return {"files": 0}
+    with open(os.path.join(directory, "removed.json"), "w") as f:
+        json.dump([row["path"] for row in chosen], f)
+    with Sampler(args.pid, args.sample_interval) as sampler:
+        started = time.time()
+        server.post_form("/remove", {"fileIds": [row["id"] for row in chosen]})
+        seconds = time.time() - started
+    _, after = fetch_duplicates(server, args)
+    result = {"files": len(chosen), "seconds": round(seconds, 3),
+              "duplicates_after_seconds": after["all_pages_seconds"], "groups_after": after["groups"]}
+    result.update(sampler.summary())
+    return result
+
+
+# ---------------------------------------------------------------------------
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPT_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def start_server(args, server):
+    print(f"🚀 Starting server: {args.start}")
+    process = subprocess.Popen(args.start, shell=True, cwd=args.start_dir, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, start_new_session=True)
+    deadline = time.time() + args.start_timeout
+    while not server.is_up():
+        if process.poll() is not None:
+            sys.exit(f"❌ Server exited with code {process.returncode}")
+        if time.time() > deadline:
+            process.terminate()
+            sys.exit(f"❌ Server not up after {args.start_timeout}s")
+        time.sleep(1)
+    return process
+
+
+FLAT_METRICS = [
+    ("scan", "seconds"), ("scan", "files_per_second"), ("scan", "peak_rss_mb"), ("scan", "mean_cpu_cores"),
+    ("duplicates", "first_page_seconds"), ("duplicates", "all_pages_seconds"), ("duplicates_cached", "all_pages_seconds"),
+    ("remove", "seconds"), ("remove", "duplicates_after_seconds"), ("accuracy", "precision"), ("accuracy", "recall"),
+]
+
+
+def compare(previous_path, results):
+    with open(previous_path) as f:
+        previous = {run["files"]: run for run in json.load(f)["runs"]}
+    print(f"\n📊 Compared with {previous_path}")
+    for run in results["runs"]:
+        old = previous.get(run["files"])
+        if not old:
+            continue
+        print(f"  {run['files']} files")
+        for section, metric in FLAT_METRICS:
+            before = old.get(section, {}).get(metric)
+            now = run.get(section, {}).get(metric)
+            if isinstance(before, (int, float)) and isinstance(now, (int, float)):
+                change = f"{(now - before) / before * 100:+.1f}%" if before else "n/a"
+                print(f"    {section + '.' + metric:<38} {before:>12} -> {now:<12} {change}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8080", help="server URL (default: %(default)s)")
+    parser.add_argument("--start", help="command that starts the server; it is stopped when the benchmark ends")
+    parser.add_argument("--start-dir", default=os.path.dirname(SCRIPT_DIR), help="working directory for --start")
+    parser.add_argument("--start-timeout", type=int, default=180, help="seconds to wait for a started server")
+    parser.add_argument("--pid", type=int, help="server process to sample (default: the --start process)")
+    parser.add_argument("--sizes", default="1000,10000", help="corpus sizes in files (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed (default: %(default)s)")
+    parser.add_argument("--corpus-root", default=os.path.join(SCRIPT_DIR, "scale_corpora"),
+                        help="where corpora are created (default: %(default)s)")
+    parser.add_argument("--corpus-args", default="",
+                        help='extra create_scale_corpus.py options, e.g. "--mix text=50,binary=50 --jobs 8"')
+    parser.add_argument("--remove", type=int, default=100, help="duplicate groups to remove a file from (0 to skip)")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="seconds between scan job polls")
+    parser.add_argument("--sample-interval", type=float, default=0.5, help="seconds between RSS/CPU samples")
+    parser.add_argument("--label", help="name for this run (default: the git commit)")
+    parser.add_argument("--output", help="results file (default: benchmark_results/<time>_<label>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    server = Server(args.url)
+    process = start_server(args, server) if args.start else None
+    if process and not args.pid:
+        args.pid = process.pid
+    if not server.is_up():
+        sys.exit(f"❌ No server at {args.url}; start one or pass --start")
+    if not args.pid:
+        print("⚠️  No --pid given: memory and CPU are not sampled")
+
+    commit = git_commit()
+    results = {
+        "label": args.label or commit,
+        "commit": commit,
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "url": args.url,
+        "seed": args.seed,
+        "corpus_args": args.corpus_args,
+        "runs": [],
+    }
+    try:
+        for files in [int(s) for s in args.sizes.split(",")]:
+            directory = prepare_corpus(args, files)
+            manifest = load_manifest(directory)
+            run = {"files": files, "corpus": directory}
+            print(f"🔍 Scanning {files} files")
+            run["scan"] = run_scan(server, args, directory)
+            print(f"   {run['scan']['seconds']}s, {run['scan']['files_per_second']} files/s")
+            groups, run["duplicates"] = fetch_duplicates(server, args)
+            _, run["duplicates_cached"] = fetch_duplicates(server, args)
+            print(f"🔁 {run['duplicates']['groups']} duplicate groups in {run['duplicates']['all_pages_seconds']}s "
+                  f"(cached {run['duplicates_cached']['all_pages_seconds']}s)")
+            run["accuracy"] = score(groups, manifest, directory)
+            print(f"🎯 precision {run['accuracy']['precision']}, recall {run['accuracy']['recall']}")
+            if args.remove > 0:
+                run["remove"] = run_remove(server, args, groups, directory)
+                print(f"🗑️  Removed {run['remove']['files']} files in {run['remove'].get('seconds', 0)}s")
+            results["runs"].append(run)
+    finally:
+        if process:
+            os.killpg(process.pid, 15)
+            process.wait()
+
+    output = args.output or os.path.join(SCRIPT_DIR, "benchmark_results",
+                                         f"{time.strftime('%Y%m%d-%H%M%S')}_{results['label'] or 'run'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Results written to {output}")
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
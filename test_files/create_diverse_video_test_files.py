@@ -4,78 +4,66 @@ Create diverse video test files with different content for duplicate detection t
 This script creates videos with different colors, patterns, and animations
 """
 
+import argparse
 import os
 import random
+import time
 import numpy as np
 import imageio
 
-def create_color_gradient_video(output_path, duration=3, width=320, height=240, start_color=(255,0,0), end_color=(0,0,255)):
-    """Create a video with color gradient animation"""
-    frames = []
-    for i in range(duration * 10):  # 10 fps
-        # Create gradient from start_color to end_color
-        progress = i / (duration * 10)
-        color = [
-            int(start_color[0] * (1 - progress) + end_color[0] * progress),
-            int(start_color[1] * (1 - progress) + end_color[1] * progress),
-            int(start_color[2] * (1 - progress) + end_color[2] * progress)
-        ]
-        
-        frame = np.zeros((height, width, 3), dtype=np.uint8)
-        frame[:, :] = color
-        frames.append(frame)
-    
-    imageio.mimsave(output_path, frames, fps=10)
-    print(f"✅ Created gradient video: {output_path}")
+FPS = 10
 
-def create_pattern_video(output_path, duration=3, width=320, height=240, pattern_type="stripes"):
-    """Create a video with moving patterns"""
-    frames = []
-    for i in range(duration * 10):  # 10 fps
-        frame = np.zeros((height, width, 3), dtype=np.uint8)
-        
+def write_video(output_path, frames, fps=FPS):
+    """Stream frames into the encoder one at a time, so only the current frame is held in memory"""
+    writer = imageio.get_writer(output_path, fps=fps)
+    try:
+        for frame in frames:
+            writer.append_data(frame)
+    finally:
+        writer.close()
+
+def pixel_grid(width, height):
+    """Column and row indices shaped (1, width) and (height, 1), which broadcast to a full frame"""
+    return np.arange(width)[np.newaxis, :], np.arange(height)[:, np.newaxis]
+
+def two_colour_frame(mask, colour_on, colour_off):
+    """Frame showing colour_on where mask is set and colour_off elsewhere"""
+    return np.where(mask[..., np.newaxis], np.array(colour_on, dtype=np.uint8), np.array(colour_off, dtype=np.uint8))
+
+def gradient_frames(frame_count, width, height, start_color, end_color):
+    start = np.array(start_color, dtype=np.float64)
+    end = np.array(end_color, dtype=np.float64)
+    for i in range(frame_count):
+        progress = i / frame_count
+        color = (start * (1 - progress) + end * progress).astype(np.uint8)
+        yield np.full((height, width, 3), color, dtype=np.uint8)
+
+def pattern_frames(frame_count, width, height, pattern_type):
+    x, y = pixel_grid(width, height)
+    center_x, center_y = width // 2, height // 2
+    squared_distance = (x - center_x) ** 2 + (y - center_y) ** 2
+    for i in range(frame_count):
         if pattern_type == "stripes":
             # Moving vertical stripes
             stripe_width = 20
             offset = (i * 2) % stripe_width
-            for x in range(width):
-                if (x + offset) % stripe_width < stripe_width // 2:
-                    frame[:, x] = [255, 255, 0]  # Yellow
-                else:
-                    frame[:, x] = [0, 0, 255]    # Blue
-                    
+            columns = (x + offset) % stripe_width < stripe_width // 2
+            yield two_colour_frame(np.broadcast_to(columns, (height, width)), [255, 255, 0], [0, 0, 255])  # Yellow / Blue
         elif pattern_type == "circles":
             # Expanding circles
-            center_x, center_y = width // 2, height // 2
             radius = (i * 3) % (min(width, height) // 2)
-            for y in range(height):
-                for x in range(width):
-                    distance = np.sqrt((x - center_x)**2 + (y - center_y)**2)
-                    if distance < radius:
-                        frame[y, x] = [255, 0, 255]  # Magenta
-                    else:
-                        frame[y, x] = [0, 255, 255]  # Cyan
-                        
+            yield two_colour_frame(squared_distance < radius ** 2, [255, 0, 255], [0, 255, 255])  # Magenta / Cyan
         elif pattern_type == "checkerboard":
             # Moving checkerboard
             square_size = 15
             offset = (i * 2) % square_size
-            for y in range(height):
-                for x in range(width):
-                    if ((x + offset) // square_size + (y + offset) // square_size) % 2 == 0:
-                        frame[y, x] = [255, 128, 0]  # Orange
-                    else:
-                        frame[y, x] = [128, 0, 255]  # Purple
-        
-        frames.append(frame)
-    
-    imageio.mimsave(output_path, frames, fps=10)
-    print(f"✅ Created {pattern_type} pattern video: {output_path}")
+            squares = ((x + offset) // square_size + (y + offset) // square_size) % 2 == 0
+            yield two_colour_frame(squares, [255, 128, 0], [128, 0, 255])  # Orange / Purple
+        else:
+            yield np.zeros((height, width, 3), dtype=np.uint8)
 
-def create_text_video(output_path, duration=3, width=320, height=240, text="Hello World"):
-    """Create a video with animated text"""
-    frames = []
-    for i in range(duration * 10):  # 10 fps
+def text_frames(frame_count, width, height, text):
+    for i in range(frame_count):
         frame = np.zeros((height, width, 3), dtype=np.uint8)
         
         # Animate text position
@@ -93,34 +81,43 @@ def create_text_video(output_path, duration=3, width=320, height=240, text="Hell
         end_y = min(height, y_pos + text_height // 2)
         
         frame[start_y:end_y, start_x:end_x] = [255, 255, 255]  # White background
-        
-        frames.append(frame)
-    
-    imageio.mimsave(output_path, frames, fps=10)
-    print(f"✅ Created text video: {output_path}")
+        yield frame
 
-def create_noise_video(output_path, duration=3, width=320, height=240, noise_type="random"):
-    """Create a video with different types of noise"""
-    frames = []
-    for i in range(duration * 10):  # 10 fps
+def noise_frames(frame_count, width, height, noise_type, seed=None):
+    x, y = pixel_grid(width, height)
+    rng = np.random.default_rng(seed)
+    for i in range(frame_count):
         if noise_type == "random":
             # Random noise
-            frame = np.random.randint(0, 256, (height, width, 3), dtype=np.uint8)
+            yield rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
         elif noise_type == "static":
             # Static noise (same pattern moving)
-            np.random.seed(i)
-            frame = np.random.randint(0, 256, (height, width, 3), dtype=np.uint8)
+            yield np.random.RandomState(i).randint(0, 256, (height, width, 3)).astype(np.uint8)
         elif noise_type == "wave":
-            # Wave-like noise
-            frame = np.zeros((height, width, 3), dtype=np.uint8)
-            for y in range(height):
-                for x in range(width):
-                    wave = int(128 + 127 * np.sin(x * 0.1 + i * 0.2) * np.cos(y * 0.1 + i * 0.3))
-                    frame[y, x] = [wave, wave//2, wave//4]
-        
-        frames.append(frame)
-    
-    imageio.mimsave(output_path, frames, fps=10)
+            # Wave-like noise: one sine per column times one cosine per row
+            wave = (128 + 127 * np.sin(x * 0.1 + i * 0.2) * np.cos(y * 0.1 + i * 0.3)).astype(np.uint8)
+            yield np.stack([wave, wave // 2, wave // 4], axis=-1)
+        else:
+            yield np.zeros((height, width, 3), dtype=np.uint8)
+
+def create_color_gradient_video(output_path, duration=3, width=320, height=240, start_color=(255,0,0), end_color=(0,0,255), fps=FPS):
+    """Create a video with color gradient animation"""
+    write_video(output_path, gradient_frames(duration * fps, width, height, start_color, end_color), fps)
+    print(f"✅ Created gradient video: {output_path}")
+
+def create_pattern_video(output_path, duration=3, width=320, height=240, pattern_type="stripes", fps=FPS):
+    """Create a video with moving patterns"""
+    write_video(output_path, pattern_frames(duration * fps, width, height, pattern_type), fps)
+    print(f"✅ Created {pattern_type} pattern video: {output_path}")
+
+def create_text_video(output_path, duration=3, width=320, height=240, text="Hello World", fps=FPS):
+    """Create a video with animated text"""
+    write_video(output_path, text_frames(duration * fps, width, height, text), fps)
+    print(f"✅ Created text video: {output_path}")
+
+def create_noise_video(output_path, duration=3, width=320, height=240, noise_type="random", fps=FPS, seed=None):
+    """Create a video with different types of noise"""
+    write_video(output_path, noise_frames(duration * fps, width, height, noise_type, seed), fps)
     print(f"✅ Created {noise_type} noise video: {output_path}")
 
 def create_diverse_video_files():
@@ -224,8 +221,47 @@ Content: Moving stripe pattern"""
     print("- video1_alt_metadata.txt (same video, different metadata)")
     print("- different_video_metadata.txt (different video)")
 
+def create_scale_corpus(output_dir, count, duration, width, height, fps, seed):
+    """Create count clips of the given size for scale benchmarks, cycling through every content type"""
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    kinds = ["gradient", "stripes", "circles", "checkerboard", "text", "random", "wave"]
+    started = time.time()
+    for n in range(count):
+        kind = kinds[n % len(kinds)]
+        path = os.path.join(output_dir, f"clip_{n:06d}_{kind}.mp4")
+        if kind == "gradient":
+            start_color = tuple(rng.randrange(256) for _ in range(3))
+            end_color = tuple(rng.randrange(256) for _ in range(3))
+            create_color_gradient_video(path, duration, width, height, start_color, end_color, fps)
+        elif kind == "text":
+            create_text_video(path, duration, width, height, f"Clip {n}", fps)
+        elif kind in ("random", "wave"):
+            create_noise_video(path, duration, width, height, kind, fps, seed=rng.randrange(2 ** 32))
+        else:
+            create_pattern_video(path, duration, width, height, kind, fps)
+    elapsed = time.time() - started
+    print(f"\nCreated {count} clips of {duration}s at {width}x{height} in {elapsed:.1f}s in '{output_dir}'")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=0,
+                        help="create this many clips for scale benchmarks instead of the fixed test set")
+    parser.add_argument("--output", default="diverse_video_scale_files", help="directory for --count clips")
+    parser.add_argument("--duration", type=int, default=3, help="clip length in seconds (--count only)")
+    parser.add_argument("--width", type=int, default=320, help="frame width (--count only)")
+    parser.add_argument("--height", type=int, default=240, help="frame height (--count only)")
+    parser.add_argument("--fps", type=int, default=FPS, help="frames per second (--count only)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for colours and noise (--count only)")
+    return parser.parse_args()
+
 def main():
     """Main function to create all diverse video test files"""
+    args = parse_args()
+    if args.count > 0:
+        create_scale_corpus(args.output, args.count, args.duration, args.width, args.height, args.fps, args.seed)
+        return
+
     print("=== Diverse Video File Similarity Detection Test Files Generator ===\n")
     
     try:
@@ -2,68 +2,101 @@
 """
 Create test music files for duplicate detection testing
 This script creates various music file formats with similar content
+
+With --count it instead creates a corpus of random melodies (and variants of some of them) for
+scale benchmarks; --minutes sets their length, so multi-minute tracks are cheap to produce.
 """
 
+import argparse
 import os
-import wave
-import struct
 import random
-import math
-from io import BytesIO
+import shutil
+import subprocess
+import time
+import wave
+import numpy as np
 
-def create_sine_wave(frequency, duration, sample_rate=44100, amplitude=0.3):
+SAMPLE_RATE = 44100
+# Samples synthesised and written at a time for long tracks
+BLOCK_SAMPLES = SAMPLE_RATE * 60
+
+def create_sine_wave(frequency, duration, sample_rate=SAMPLE_RATE, amplitude=0.3):
     """Create a sine wave audio signal"""
-    num_samples = int(sample_rate * duration)
-    samples = []
-    
-    for i in range(num_samples):
-        sample = amplitude * math.sin(2 * math.pi * frequency * i / sample_rate)
-        samples.append(sample)
-    
-    return samples
+    t = np.arange(int(sample_rate * duration)) / sample_rate
+    return amplitude * np.sin(2 * np.pi * frequency * t)
 
-def create_music_content():
+def create_music_content(sample_rate=SAMPLE_RATE):
     """Create a simple music-like content with multiple frequencies"""
-    sample_rate = 44100
     duration = 3.0  # 3 seconds
     
     # Create a simple melody (C major scale)
     frequencies = [261.63, 293.66, 329.63, 349.23, 392.00, 440.00, 493.88, 523.25]  # C4 to C5
-    samples = []
-    
-    for freq in frequencies:
-        note_samples = create_sine_wave(freq, duration / len(frequencies), sample_rate)
-        samples.extend(note_samples)
-    
-    return samples, sample_rate
+    notes = [create_sine_wave(freq, duration / len(frequencies), sample_rate) for freq in frequencies]
+    return np.concatenate(notes), sample_rate
+
+def melody_blocks(duration, sample_rate=SAMPLE_RATE, seed=0, note_length=0.25, amplitude=0.3):
+    """A random melody with a few harmonics, yielded a block of samples at a time so any length fits in memory"""
+    rng = np.random.default_rng(seed)
+    note_samples = int(sample_rate * note_length)
+    total = int(sample_rate * duration)
+    frequencies = 220.0 * 2 ** (rng.integers(0, 24, total // note_samples + 1) / 12)
+    # Short fade in and out per note, so note changes do not click
+    envelope = np.minimum(1.0, np.minimum(np.arange(note_samples), np.arange(note_samples)[::-1]) / (note_samples * 0.05))
+    for start in range(0, total, BLOCK_SAMPLES):
+        t = np.arange(start, min(total, start + BLOCK_SAMPLES))
+        frequency = frequencies[t // note_samples]
+        phase = 2 * np.pi * frequency * (t % note_samples) / sample_rate
+        yield amplitude * envelope[t % note_samples] * (np.sin(phase) + 0.3 * np.sin(2 * phase) + 0.1 * np.sin(3 * phase)) / 1.4
+
+def to_pcm16(samples):
+    """Little-endian 16-bit PCM bytes of samples in [-1, 1]"""
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2').tobytes()
 
 def create_wav_file(filename, samples, sample_rate):
-    """Create a WAV file from samples"""
+    """Create a WAV file from samples: an array, or an iterable of arrays written block by block"""
+    blocks = [samples] if isinstance(samples, np.ndarray) else samples
     with wave.open(filename, 'w') as wav_file:
         wav_file.setnchannels(1)  # Mono
         wav_file.setsampwidth(2)  # 16-bit
         wav_file.setframerate(sample_rate)
-        
-        # Convert samples to 16-bit integers
-        for sample in samples:
-            # Clamp sample to [-1, 1] and convert to 16-bit
-            sample = max(-1.0, min(1.0, sample))
-            sample_int = int(sample * 32767)
-            wav_file.writeframes(struct.pack('<h', sample_int))
-
-def create_mp3_like_file(filename, samples, sample_rate):
-    """Create a file that looks like MP3 (but is actually WAV with MP3 extension)"""
-    # For testing purposes, we'll create a WAV file with MP3 extension
-    # In a real scenario, you'd use a library like pydub to create actual MP3 files
-    create_wav_file(filename, samples, sample_rate)
-
-def create_flac_like_file(filename, samples, sample_rate):
-    """Create a file that looks like FLAC (but is actually WAV with FLAC extension)"""
-    # For testing purposes, we'll create a WAV file with FLAC extension
-    # In a real scenario, you'd use a library like pydub to create actual FLAC files
-    create_wav_file(filename, samples, sample_rate)
-
-def create_similar_music_files():
+        for block in blocks:
+            wav_file.writeframes(to_pcm16(block))
+
+def encode_audio(wav_path, filename, bitrate=None):
+    """Encode a WAV file with ffmpeg into the format given by filename's extension; False without ffmpeg"""
+    if shutil.which("ffmpeg") is None:
+        return False
+    command = ["ffmpeg", "-v", "error", "-y", "-i", wav_path]
+    if bitrate:
+        command += ["-b:a", bitrate]
+    subprocess.run(command + [filename], check=True)
+    return True
+
+def create_compressed_file(filename, samples, sample_rate, real=False, bitrate=None):
+    """Create an MP3/FLAC/OGG file; a WAV file with that extension unless real encoding was asked for"""
+    if not real:
+        # For testing purposes, we'll create a WAV file with the compressed format's extension
+        create_wav_file(filename, samples, sample_rate)
+        return
+    wav_path = filename + ".tmp.wav"
+    create_wav_file(wav_path, samples, sample_rate)
+    try:
+        if not encode_audio(wav_path, filename, bitrate):
+            print(f"⚠️  ffmpeg not found, {filename} is a WAV file")
+            os.replace(wav_path, filename)
+    finally:
+        if os.path.exists(wav_path):
+            os.remove(wav_path)
+
+def create_mp3_like_file(filename, samples, sample_rate, real=False):
+    """Create an MP3 file (a WAV file with MP3 extension unless real is set)"""
+    create_compressed_file(filename, samples, sample_rate, real, bitrate="192k")
+
+def create_flac_like_file(filename, samples, sample_rate, real=False):
+    """Create a FLAC file (a WAV file with FLAC extension unless real is set)"""
+    create_compressed_file(filename, samples, sample_rate, real)
+
+def create_similar_music_files(real_compressed=False):
     """Create music files with similar content but different names/formats"""
     print("Creating test music files...")
     
@@ -80,25 +113,25 @@ def create_similar_music_files():
     create_wav_file(f"{music_dir}/music_file_001.wav", samples, sample_rate)
     
     # Test Case 2: Same content, different formats
-    create_mp3_like_file(f"{music_dir}/song1.mp3", samples, sample_rate)
-    create_flac_like_file(f"{music_dir}/song1.flac", samples, sample_rate)
+    create_mp3_like_file(f"{music_dir}/song1.mp3", samples, sample_rate, real_compressed)
+    create_flac_like_file(f"{music_dir}/song1.flac", samples, sample_rate, real_compressed)
     
     # Test Case 3: Slightly modified content (should be detected as similar)
-    modified_samples = [s * 0.95 for s in samples]  # Slightly quieter
+    modified_samples = samples * 0.95  # Slightly quieter
     create_wav_file(f"{music_dir}/song1_quiet.wav", modified_samples, sample_rate)
     
     # Test Case 4: Different content (should not be detected as similar)
     different_samples, _ = create_music_content()
     # Reverse the samples to make it different
-    different_samples.reverse()
+    different_samples = different_samples[::-1]
     create_wav_file(f"{music_dir}/different_song.wav", different_samples, sample_rate)
     
     # Test Case 5: Create a longer version
-    long_samples = samples * 2  # Repeat the melody
+    long_samples = np.tile(samples, 2)  # Repeat the melody
     create_wav_file(f"{music_dir}/song1_extended.wav", long_samples, sample_rate)
     
     # Test Case 6: Create files with different sample rates (should still be detected)
-    samples_22k, _ = create_music_content()
+    samples_22k, _ = create_music_content(22050)
     create_wav_file(f"{music_dir}/song1_22k.wav", samples_22k, 22050)
     
     print(f"Created music test files in '{music_dir}' directory:")
@@ -209,13 +242,54 @@ Version=2"""
     print("- test_playlist.m3u8")
     print("- test_playlist.pls")
 
+def create_scale_corpus(output_dir, count, minutes, seed, variants, real_compressed):
+    """Create count random melodies of the given length; every variants-th one also gets a quieter copy, a
+    22 kHz copy and (with real_compressed) an MP3 encode, which fingerprinting should match to it"""
+    os.makedirs(output_dir, exist_ok=True)
+    rng = random.Random(seed)
+    started = time.time()
+    created = 0
+    for n in range(count):
+        track_seed = rng.randrange(2 ** 32)
+        path = os.path.join(output_dir, f"track_{n:06d}.wav")
+        create_wav_file(path, melody_blocks(minutes * 60, seed=track_seed), SAMPLE_RATE)
+        created += 1
+        if variants and n % variants == 0:
+            create_wav_file(os.path.join(output_dir, f"track_{n:06d}_quiet.wav"),
+                            (block * 0.7 for block in melody_blocks(minutes * 60, seed=track_seed)), SAMPLE_RATE)
+            create_wav_file(os.path.join(output_dir, f"track_{n:06d}_22k.wav"),
+                            melody_blocks(minutes * 60, 22050, seed=track_seed), 22050)
+            created += 2
+            if real_compressed and encode_audio(path, os.path.join(output_dir, f"track_{n:06d}.mp3"), "128k"):
+                created += 1
+    elapsed = time.time() - started
+    print(f"\nCreated {created} files ({count} tracks of {minutes} min) in {elapsed:.1f}s in '{output_dir}'")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--real-compressed", action="store_true",
+                        help="encode the MP3/FLAC files with ffmpeg instead of writing WAV data under their extension")
+    parser.add_argument("--count", type=int, default=0,
+                        help="create this many tracks for scale benchmarks instead of the fixed test set")
+    parser.add_argument("--output", default="music_scale_files", help="directory for --count tracks")
+    parser.add_argument("--minutes", type=float, default=3, help="track length in minutes (--count only)")
+    parser.add_argument("--variants", type=int, default=4,
+                        help="give every Nth track near-duplicate variants, 0 for none (--count only)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the melodies (--count only)")
+    return parser.parse_args()
+
 def main():
     """Main function to create all music test files"""
+    args = parse_args()
+    if args.count > 0:
+        create_scale_corpus(args.output, args.count, args.minutes, args.seed, args.variants, args.real_compressed)
+        return
+
     print("=== Music File Similarity Detection Test Files Generator ===\n")
     
     try:
         # Create music files
-        music_dir = create_similar_music_files()
+        music_dir = create_similar_music_files(args.real_compressed)
         
         # Create metadata files
         create_music_metadata_files()
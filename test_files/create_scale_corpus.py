@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+"""
+Create a large synthetic corpus for duplicate detection benchmarks, with a ground-truth manifest.
+
+Files are generated in groups: an original plus, for a share of the groups, exact copies and
+near-duplicate mutations of it (reworded text, re-levelled or resampled audio, re-encoded video,
+brightened or resized images, repacked archives, patched binaries). Every group is generated from
+its own seed, so the same --seed always gives the same corpus whatever the number of processes.
+
+Output:
+  <output>/<type>/<bucket>/g<group>_<n>.<ext>   the files, at most about 1000 per directory
+  <output>/manifest.jsonl                      one JSON line per group: type, files, mutation of each
+  <output>/corpus.json                         settings and totals
+
+Only the Python standard library is needed; video files are generated with the ffmpeg binary.
+
+Example: 100k files, mostly text and binaries, 8 processes
+  python3 create_scale_corpus.py --output /data/corpus --files 100000 --jobs 8 \\
+      --mix text=40,audio=10,video=2,image=20,archive=8,binary=20
+"""
+
+import argparse
+import array
+import json
+import math
+import os
+import random
+import shutil
+import struct
+import subprocess
+import sys
+import time
+import wave
+import zipfile
+import zlib
+from multiprocessing import Pool
+
+TYPES = ["text", "audio", "video", "image", "archive", "binary"]
+DEFAULT_MIX = "text=30,audio=10,video=5,image=20,archive=10,binary=25"
+FILES_PER_DIRECTORY = 1000
+GROUPS_PER_BATCH = 10000
+
+# Mutations per type; "exact" ones produce identical bytes (or, for text, the same normalised words)
+MUTATIONS = {
+    "text": {"copy": "exact", "shuffle": "exact", "edit": "near", "append": "near"},
+    "audio": {"copy": "exact", "gain": "near", "resample": "near", "trim": "near"},
+    "video": {"copy": "exact", "reencode": "near", "scale": "near", "remux": "near"},
+    "image": {"copy": "exact", "brightness": "near", "resize": "near", "noise": "near", "bmp": "near"},
+    "archive": {"copy": "exact", "rename": "near", "recompress": "near", "modify": "near"},
+    "binary": {"copy": "exact", "flip": "near", "append": "near"},
+}
+
+WORDS = ("time year people way day man thing woman life child world school state family student group "
+         "country problem hand part place case week company system program question work government number "
+         "night point home water room mother area money story fact month lot right study book eye job word "
+         "business issue side kind head house service friend father power hour game line end member law car "
+         "city community name president team minute idea kid body information back parent face others level "
+         "office door health person art war history party result change morning reason research girl guy "
+         "moment air teacher force education").split()
+
+
+def parse_size(text):
+    """Bytes from a size such as 512, 64K, 8M or 2G"""
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper()
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in TYPES:
+            raise argparse.ArgumentTypeError(f"unknown file type '{name}', expected one of {', '.join(TYPES)}")
+        mix[name] = float(weight)
+    return mix
+
+
+def jitter(rng, value):
+    """value scaled by a random factor between 0.5 and 1.5"""
+    return max(1, int(value * rng.uniform(0.5, 1.5)))
+
+
+# ---------------------------------------------------------------------------
+# Planning: which groups exist, how many files each has and how they differ
+# ---------------------------------------------------------------------------
+
+def plan_groups(args):
+    """Yields (group id, type, [mutation per file]) until the target file count is reached"""
+    rng = random.Random(f"{args.seed}-plan")
+    types = [t for t in TYPES if args.mix.get(t, 0) > 0]
+    weights = [args.mix[t] for t in types]
+    planned = 0
+    group_id = 0
+    while planned < args.files:
+        file_type = rng.choices(types, weights)[0]
+        mutations = ["original"]
+        if rng.random() < args.duplicate_rate:
+            choices = list(MUTATIONS[file_type])
+            for _ in range(rng.randint(1, args.max_copies)):
+                mutations.append(rng.choice(choices))
+        mutations = mutations[:args.files - planned]
+        yield group_id, file_type, mutations
+        planned += len(mutations)
+        group_id += 1
+
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ---------------------------------------------------------------------------
+# Content per type. Each generator gets the group's rng and returns the bytes of the original, or
+# writes it itself for types that are streamed.
+# ---------------------------------------------------------------------------
+
+def make_text(rng, settings):
+    return [rng.choice(WORDS) + (str(rng.randrange(1000)) if rng.random() < 0.3 else "")
+            for _ in range(jitter(rng, settings.text_words))]
+
+
+def write_text(path, words):
+    with open(path, "w") as f:
+        for start in range(0, len(words), 12):
+            f.write(" ".join(words[start:start + 12]) + "\n")
+
+
+def mutate_text(rng, words, mutation):
+    words = list(words)
+    if mutation == "shuffle":
+        rng.shuffle(words)
+    elif mutation == "edit":
+        for _ in range(max(1, len(words) // 20)):
+            words[rng.randrange(len(words))] = rng.choice(WORDS) + "x"
+    elif mutation == "append":
+        words += make_text(rng, argparse.Namespace(text_words=max(2, len(words) // 10)))
+    return words
+
+
+def make_audio(rng, settings):
+    """A random melody, one sine note after another"""
+    sample_rate = 22050
+    notes = [220.0 * 2 ** (rng.randrange(24) / 12) for _ in range(jitter(rng, settings.audio_seconds) * 4)]
+    samples = array.array("h")
+    note_samples = sample_rate // 4
+    for frequency in notes:
+        step = 2 * math.pi * frequency / sample_rate
+        samples.extend(int(9000 * math.sin(step * i)) for i in range(note_samples))
+    return sample_rate, samples
+
+
+def write_wav(path, sample_rate, samples):
+    if sys.byteorder == "big":
+        samples = array.array("h", samples)
+        samples.byteswap()
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+
+
+def mutate_audio(audio, mutation):
+    sample_rate, samples = audio
+    if mutation == "gain":
+        return sample_rate, array.array("h", (int(s * 0.6) for s in samples))
+    if mutation == "resample":
+        return sample_rate // 2, samples[::2]
+    if mutation == "trim":
+        return sample_rate, samples[int(sample_rate * 0.3):]
+    return audio
+
+
+def make_image(rng, settings):
+    """A smooth random field: a few low-frequency cosine waves per channel, as rows of RGB bytes"""
+    side = jitter(rng, settings.image_size)
+    width, height = side, max(16, int(side * rng.uniform(0.6, 1.0)))
+    waves = [[(rng.uniform(0.5, 4), rng.uniform(0.5, 4), rng.uniform(0, 2 * math.pi)) for _ in range(3)]
+             for _ in range(3)]
+    rows = []
+    for y in range(height):
+        row = bytearray(width * 3)
+        for x in range(width):
+            for c in range(3):
+                value = sum(math.cos(2 * math.pi * (fx * x / width + fy * y / height) + phase)
+                            for fx, fy, phase in waves[c])
+                row[3 * x + c] = int(127.5 + 127.5 * value / 3)
+        rows.append(bytes(row))
+    return width, height, rows
+
+
+def mutate_image(rng, image, mutation):
+    width, height, rows = image
+    if mutation == "brightness":
+        table = bytes(min(255, v + 12) for v in range(256))
+        return width, height, [row.translate(table) for row in rows]
+    if mutation == "resize":
+        # Every other pixel of every other row; an odd width keeps its last column
+        half = [bytes(b for x in range(0, width, 2) for b in row[3 * x:3 * x + 3]) for row in rows[::2]]
+        return (width + 1) // 2, len(half), half
+    if mutation == "noise":
+        return width, height, [bytes(max(0, min(255, v + rng.randint(-4, 4))) for v in row) for row in rows]
+    return image
+
+
+def write_png(path, image):
+    width, height, rows = image
+    raw = b"".join(b"\x00" + row for row in rows)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(raw, 6)))
+        f.write(chunk(b"IEND", b""))
+
+
+def write_bmp(path, image):
+    width, height, rows = image
+    stride = (width * 3 + 3) & ~3
+    with open(path, "wb") as f:
+        f.write(b"BM" + struct.pack("<IHHI", 54 + stride * height, 0, 0, 54))
+        f.write(struct.pack("<IiiHHIIiiII", 40, width, height, 1, 24, 0, stride * height, 2835, 2835, 0, 0))
+        for row in reversed(rows):
+            # BMP rows are bottom-up BGR
+            bgr = bytearray(row)
+            bgr[0::3], bgr[2::3] = row[2::3], row[0::3]
+            f.write(bytes(bgr) + b"\x00" * (stride - width * 3))
+
+
+def make_archive(rng, settings):
+    """Members as (name, bytes); a mix of compressible text and random data"""
+    members = []
+    for n in range(jitter(rng, settings.archive_members)):
+        size = jitter(rng, 16 * 1024)
+        if rng.random() < 0.5:
+            data = " ".join(rng.choice(WORDS) for _ in range(size // 6)).encode()
+        else:
+            data = rng.randbytes(size)
+        members.append((f"{rng.choice(['lib', 'res', 'assets', 'META-INF'])}/m{n}_{rng.randrange(10 ** 6)}.dat", data))
+    return members
+
+
+def mutate_archive(rng, members, mutation):
+    members = list(members)
+    if mutation == "rename":
+        members = [(f"renamed/{rng.randrange(10 ** 9)}_{n}.bin", data) for n, (name, data) in enumerate(members)]
+        rng.shuffle(members)
+    elif mutation == "modify":
+        # The smallest member changes, so most of the archive's bytes stay shared
+        index = min(range(len(members)), key=lambda i: len(members[i][1]))
+        name, data = members[index]
+        members[index] = (name, data + b"\x01")
+    return members
+
+
+def write_archive(path, members, compression=zipfile.ZIP_DEFLATED):
+    with zipfile.ZipFile(path, "w", compression) as archive:
+        for name, data in members:
+            # A fixed timestamp keeps the archive bytes identical between runs for the same seed
+            info = zipfile.ZipInfo(name, date_time=(1980, 1, 1, 0, 0, 0))
+            archive.writestr(info, data, compress_type=compression)
+
+
+def write_binary(path, seed, size, flips=(), extra=0):
+    """Streams size random bytes from seed, XOR-ing the byte at each offset in flips, then extra more"""
+    rng = random.Random(seed)
+    flips = sorted(flips)
+    written = 0
+    with open(path, "wb") as f:
+        while written < size:
+            block = bytearray(rng.randbytes(min(1 << 20, size - written)))
+            while flips and flips[0] < written + len(block):
+                block[flips.pop(0) - written] ^= 0xFF
+            f.write(block)
+            written += len(block)
+        if extra:
+            f.write(random.Random(f"{seed}-extra").randbytes(extra))
+
+
+def ffmpeg(settings, *arguments):
+    subprocess.run([settings.ffmpeg, "-v", "error", "-y", *arguments], check=True,
+                   stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL)
+
+
+def make_video(rng, settings, path):
+    """A Game of Life clip in random colours from a random seed, encoded as H.264"""
+    colour = lambda: "0x%06X" % rng.randrange(1 << 24)
+    source = (f"life=size={settings.video_width}x{settings.video_height}:rate={settings.video_fps}"
+              f":seed={rng.randrange(1 << 31)}:mold=10:life_color={colour()}:death_color={colour()}"
+              f":mold_color={colour()}")
+    ffmpeg(settings, "-f", "lavfi", "-i", source, "-t", str(jitter(rng, settings.video_seconds)),
+           "-pix_fmt", "yuv420p", "-c:v", "libx264", "-preset", "veryfast", "-crf", "23", path)
+
+
+def mutate_video(settings, source, path, mutation):
+    if mutation == "reencode":
+        ffmpeg(settings, "-i", source, "-c:v", "libx264", "-preset", "veryfast", "-crf", "35", path)
+    elif mutation == "scale":
+        ffmpeg(settings, "-i", source, "-vf", "scale=trunc(iw/4)*2:trunc(ih/4)*2", "-c:v", "libx264",
+               "-preset", "veryfast", "-crf", "23", path)
+    elif mutation == "remux":
+        ffmpeg(settings, "-i", source, "-c", "copy", path)
+    else:
+        shutil.copyfile(source, path)
+
+
+# ---------------------------------------------------------------------------
+# Generating one group (runs in the worker processes)
+# ---------------------------------------------------------------------------
+
+EXTENSIONS = {"text": ["txt"], "audio": ["wav"], "video": ["mp4"], "image": ["png"],
+              "archive": ["zip", "jar", "apk"], "binary": ["bin", "dat", "exe"]}
+
+
+def file_path(settings, file_type, group_id, index, extension, rng):
+    # Copies land in other directories than their original, as they would on a real disk
+    bucket = rng.randrange(settings.buckets[file_type])
+    relative = os.path.join(file_type, f"{bucket:05d}", f"g{group_id:08d}_{index}.{extension}")
+    os.makedirs(os.path.join(settings.output, os.path.dirname(relative)), exist_ok=True)
+    return relative
+
+
+def generate_group(task):
+    settings, group_id, file_type, mutations = task
+    rng = random.Random(f"{settings.seed}-{group_id}")
+    files = []
+    paths = []
+    # Variants keep the original's extension unless the mutation is a change of format
+    extension = rng.choice(EXTENSIONS[file_type])
+    for index, mutation in enumerate(mutations):
+        variant_extension = {"bmp": "bmp", "remux": "mkv"}.get(mutation, extension)
+        paths.append(file_path(settings, file_type, group_id, index, variant_extension, rng))
+
+    absolute = [os.path.join(settings.output, p) for p in paths]
+    if file_type == "text":
+        words = make_text(rng, settings)
+        for path, mutation in zip(absolute, mutations):
+            write_text(path, mutate_text(rng, words, mutation))
+    elif file_type == "audio":
+        audio = make_audio(rng, settings)
+        for path, mutation in zip(absolute, mutations):
+            write_wav(path, *mutate_audio(audio, mutation))
+    elif file_type == "image":
+        image = make_image(rng, settings)
+        for path, mutation in zip(absolute, mutations):
+            mutated = mutate_image(rng, image, mutation)
+            (write_bmp if mutation == "bmp" else write_png)(path, mutated)
+    elif file_type == "archive":
+        members = make_archive(rng, settings)
+        for path, mutation in zip(absolute, mutations):
+            compression = zipfile.ZIP_STORED if mutation == "recompress" else zipfile.ZIP_DEFLATED
+            write_archive(path, mutate_archive(rng, members, mutation), compression)
+    elif file_type == "binary":
+        seed = rng.randrange(1 << 62)
+        size = jitter(rng, settings.binary_size)
+        for path, mutation in zip(absolute, mutations):
+            flips = [rng.randrange(size) for _ in range(8)] if mutation == "flip" else ()
+            extra = max(1, size // 50) if mutation == "append" else 0
+            write_binary(path, seed, size, flips, extra)
+    elif file_type == "video":
+        make_video(rng, settings, absolute[0])
+        for path, mutation in zip(absolute[1:], mutations[1:]):
+            mutate_video(settings, absolute[0], path, mutation)
+
+    for path, full_path, mutation in zip(paths, absolute, mutations):
+        files.append({
+            "path": path,
+            "size": os.path.getsize(full_path),
+            "mutation": mutation,
+            "expect": "original" if mutation == "original" else MUTATIONS[file_type][mutation],
+        })
+    return {"group": group_id, "type": file_type, "files": files}
+
+
+# ---------------------------------------------------------------------------
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="scale_corpus", help="corpus directory (default: %(default)s)")
+    parser.add_argument("--files", type=int, default=1000, help="number of files to create (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed (default: %(default)s)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help="relative share of each type (default: %(default)s)".replace("%(default)s", DEFAULT_MIX))
+    parser.add_argument("--duplicate-rate", type=float, default=0.3,
+                        help="share of groups that get copies and mutations (default: %(default)s)")
+    parser.add_argument("--max-copies", type=int, default=3,
+                        help="most copies and mutations per group (default: %(default)s)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="worker processes (default: one per CPU)")
+    parser.add_argument("--text-words", type=int, default=400, help="mean words per text file")
+    parser.add_argument("--audio-seconds", type=int, default=3, help="mean audio length in seconds")
+    parser.add_argument("--image-size", type=int, default=128, help="mean image width in pixels")
+    parser.add_argument("--archive-members", type=int, default=12, help="mean members per archive")
+    parser.add_argument("--binary-size", type=parse_size, default=parse_size("256K"),
+                        help="mean binary file size, e.g. 256K, 64M, 2G")
+    parser.add_argument("--video-seconds", type=int, default=3, help="mean video length in seconds")
+    parser.add_argument("--video-width", type=int, default=320, help="video width in pixels")
+    parser.add_argument("--video-height", type=int, default=240, help="video height in pixels")
+    parser.add_argument("--video-fps", type=int, default=10, help="video frames per second")
+    parser.add_argument("--ffmpeg", default="ffmpeg", help="ffmpeg binary used for video")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.mix.get("video", 0) > 0 and shutil.which(args.ffmpeg) is None:
+        sys.exit(f"{args.ffmpeg} not found; install ffmpeg or pass --mix without video")
+    os.makedirs(args.output, exist_ok=True)
+    total_weight = sum(args.mix.values())
+    args.buckets = {t: max(1, math.ceil(args.files * args.mix.get(t, 0) / total_weight / FILES_PER_DIRECTORY))
+                    for t in TYPES}
+
+    started = time.time()
+    counts = {t: 0 for t in TYPES}
+    groups = duplicate_groups = total_bytes = 0
+    manifest_path = os.path.join(args.output, "manifest.jsonl")
+    with open(manifest_path, "w") as manifest, Pool(args.jobs) as pool:
+        # Groups are planned a batch at a time so the plan for millions of files never sits in memory
+        for batch in batched(plan_groups(args), GROUPS_PER_BATCH):
+            tasks = [(args, group_id, file_type, mutations) for group_id, file_type, mutations in batch]
+            for record in pool.imap(generate_group, tasks, chunksize=16):
+                manifest.write(json.dumps(record) + "\n")
+                groups += 1
+                duplicate_groups += len(record["files"]) > 1
+                counts[record["type"]] += len(record["files"])
+                total_bytes += sum(f["size"] for f in record["files"])
+            done = sum(counts.values())
+            elapsed = time.time() - started
+            print(f"{done}/{args.files} files, {total_bytes / 1e9:.2f} GB, {done / max(elapsed, 1e-9):.0f} files/s",
+                  flush=True)
+
+    settings = {k: v for k, v in vars(args).items() if k != "buckets"}
+    summary = {
+        "settings": settings,
+        "files": sum(counts.values()),
+        "files_by_type": counts,
+        "groups": groups,
+        "duplicate_groups": duplicate_groups,
+        "bytes": total_bytes,
+        "seconds": round(time.time() - started, 1),
+        "manifest": "manifest.jsonl",
+        "mutations": MUTATIONS,
+    }
+    with open(os.path.join(args.output, "corpus.json"), "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"Created {summary['files']} files ({total_bytes / 1e9:.2f} GB) in {summary['seconds']}s; "
+          f"{duplicate_groups} of {groups} groups have duplicates. Manifest: {manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,79 +1,187 @@
 #!/usr/bin/env python3
 """
 Test video file playback and properties for duplicate detection testing
+
+ffprobe runs on a process pool and its results are cached on disk, keyed by path, size and modification
+time, so probing a whole corpus again only probes the files that changed. Directories given on the
+command line are searched recursively and summarised as one compact table per file.
+
+Examples:
+  python test_video_playback.py                              # the diverse_video_test_files report
+  python test_video_playback.py scale_corpora/ --jobs 16     # table for a whole corpus
 """
 
+import argparse
 import os
 import subprocess
 import json
+import time
+from multiprocessing import Pool
 from pathlib import Path
 
-def test_video_file(file_path):
-    """Test if a video file can be played and get its properties"""
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+CACHE_FILE = ".probe_cache.json"
+# Per-file output above this many files is replaced by the table
+DETAIL_LIMIT = 50
+
+def parse_frame_rate(rate):
+    """Frames per second from an ffprobe rate such as '30000/1001'; None if unknown"""
+    try:
+        numerator, _, denominator = rate.partition('/')
+        value = float(numerator) / float(denominator or 1)
+        return round(value, 3) if value > 0 else None
+    except (AttributeError, ValueError, ZeroDivisionError):
+        return None
+
+def probe_file(file_path):
+    """ffprobe properties of one file as a dict with 'valid'; runs in the worker processes"""
     try:
-        # Try to get video information using ffprobe if available
         result = subprocess.run([
-            'ffprobe', '-v', 'quiet', '-print_format', 'json', 
-            '-show_format', '-show_streams', file_path
+            'ffprobe', '-v', 'quiet', '-print_format', 'json',
+            '-show_entries', 'format=duration,size:stream=codec_type,codec_name,width,height,r_frame_rate',
+            file_path
         ], capture_output=True, text=True)
-        
-        if result.returncode == 0:
-            try:
-                data = json.loads(result.stdout)
-                # Extract video properties
-                format_info = data.get('format', {})
-                streams = data.get('streams', [])
-                
-                duration = format_info.get('duration', 'Unknown')
-                size = format_info.get('size', 'Unknown')
-                
-                # Find video stream
-                video_stream = None
-                for stream in streams:
-                    if stream.get('codec_type') == 'video':
-                        video_stream = stream
-                        break
-                
-                if video_stream:
-                    width = video_stream.get('width', 'Unknown')
-                    height = video_stream.get('height', 'Unknown')
-                    codec = video_stream.get('codec_name', 'Unknown')
-                    fps = video_stream.get('r_frame_rate', 'Unknown')
-                    
-                    print(f"✅ {os.path.basename(file_path)} - Valid video file")
-                    print(f"   📏 Resolution: {width}x{height}")
-                    print(f"   🎬 Codec: {codec}")
-                    print(f"   ⏱️  Duration: {duration}s")
-                    print(f"   📊 Size: {size} bytes")
-                    print(f"   🎯 FPS: {fps}")
-                    return True, {
-                        'width': width,
-                        'height': height,
-                        'codec': codec,
-                        'duration': duration,
-                        'size': size,
-                        'fps': fps
-                    }
-                else:
-                    print(f"❌ {os.path.basename(file_path)} - No video stream found")
-                    return False, {}
-                    
-            except json.JSONDecodeError:
-                print(f"✅ {os.path.basename(file_path)} - Valid video file (JSON parsing failed)")
-                return True, {}
-        else:
-            print(f"❌ {os.path.basename(file_path)} - Not a valid video file")
-            return False, {}
-            
     except FileNotFoundError:
-        # Fallback: check file size and extension
-        if os.path.exists(file_path):
-            size = os.path.getsize(file_path)
-            print(f"📁 {os.path.basename(file_path)} - Size: {size} bytes (ffprobe not available)")
-            return size > 1000, {'size': size}  # Assume valid if > 1KB
+        # Fallback: check file size; not cached, so the file is probed properly once ffprobe is installed
+        size = os.path.getsize(file_path) if os.path.exists(file_path) else 0
+        return {'valid': size > 1000, 'size': size, 'error': 'ffprobe not available', 'cache': False}
+
+    if result.returncode != 0:
+        return {'valid': False, 'error': 'not a valid video file'}
+    try:
+        data = json.loads(result.stdout)
+    except json.JSONDecodeError:
+        return {'valid': True, 'error': 'JSON parsing failed'}
+    format_info = data.get('format', {})
+    video_stream = next((s for s in data.get('streams', []) if s.get('codec_type') == 'video'), None)
+    if video_stream is None:
+        return {'valid': False, 'error': 'no video stream found'}
+    duration = format_info.get('duration')
+    return {
+        'valid': True,
+        'width': video_stream.get('width'),
+        'height': video_stream.get('height'),
+        'codec': video_stream.get('codec_name'),
+        'duration': round(float(duration), 3) if duration not in (None, 'N/A') else None,
+        'size': int(format_info['size']) if format_info.get('size', '').isdigit() else None,
+        'fps': parse_frame_rate(video_stream.get('r_frame_rate')),
+    }
+
+class ProbeCache:
+    """Probe results on disk; an entry is used only while the file keeps its size and modification time"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.changed = False
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.entries = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                print(f"⚠️  Ignoring unreadable probe cache {path}")
+
+    @staticmethod
+    def key(file_path):
+        stat = os.stat(file_path)
+        return os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns
+
+    def get(self, key):
+        entry = self.entries.get(key[0])
+        if entry and entry['size'] == key[1] and entry['mtime_ns'] == key[2]:
+            return entry['result']
+        return None
+
+    def put(self, key, result):
+        self.entries[key[0]] = {'size': key[1], 'mtime_ns': key[2], 'result': result}
+        self.changed = True
+
+    def save(self):
+        if not self.path or not self.changed:
+            return
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump(self.entries, f)
+        os.replace(temporary, self.path)
+
+def probe_files(video_files, cache, jobs):
+    """Properties of every file, probing only those the cache has no current entry for"""
+    results = {}
+    missing = []
+    for file_path in video_files:
+        key = ProbeCache.key(file_path)
+        cached = cache.get(key)
+        if cached is not None:
+            results[file_path] = cached
         else:
-            print(f"❌ {os.path.basename(file_path)} - File not found")
-            return False, {}
+            missing.append((file_path, key))
+    if missing:
+        with Pool(jobs) as pool:
+            probed = pool.imap(probe_file, [file_path for file_path, _ in missing], chunksize=8)
+            for (file_path, key), result in zip(missing, probed):
+                if result.pop('cache', True):
+                    cache.put(key, result)
+                results[file_path] = result
+        cache.save()
+    return results, len(video_files) - len(missing)
+
+def test_video_file(file_path, properties=None):
+    """Print whether a video file can be played and its properties; probes it unless properties are given"""
+    properties = properties if properties is not None else probe_file(file_path)
+    name = os.path.basename(file_path)
+    if not properties.get('valid'):
+        print(f"❌ {name} - {properties.get('error', 'Not a valid video file').capitalize()}")
+        return False, {}
+    if properties.get('error') == 'ffprobe not available':
+        print(f"📁 {name} - Size: {properties['size']} bytes (ffprobe not available)")
+        return True, {'size': properties['size']}
+    if properties.get('error'):
+        print(f"✅ {name} - Valid video file ({properties['error']})")
+        return True, {}
+    print(f"✅ {name} - Valid video file")
+    print(f"   📏 Resolution: {properties['width']}x{properties['height']}")
+    print(f"   🎬 Codec: {properties['codec']}")
+    print(f"   ⏱️  Duration: {properties['duration']}s")
+    print(f"   📊 Size: {properties['size']} bytes")
+    print(f"   🎯 FPS: {properties['fps']}")
+    return True, properties
+
+def print_table(results, root):
+    """One line per file: codec, resolution, duration, fps and size; then totals per codec and resolution"""
+    print(f"{'file':<48} {'codec':<8} {'resolution':>10} {'duration':>9} {'fps':>7} {'size':>12}")
+    codecs, resolutions = {}, {}
+    invalid = []
+    for file_path in sorted(results):
+        props = results[file_path]
+        name = os.path.relpath(file_path, root) if root else file_path
+        if len(name) > 48:
+            name = "…" + name[-47:]
+        if not props.get('valid'):
+            invalid.append(file_path)
+            print(f"{name:<48} {'INVALID':<8} {props.get('error', '')}")
+            continue
+        resolution = f"{props.get('width')}x{props.get('height')}" if props.get('width') else "?"
+        codec = props.get('codec') or "?"
+        codecs[codec] = codecs.get(codec, 0) + 1
+        resolutions[resolution] = resolutions.get(resolution, 0) + 1
+        duration = props.get('duration')
+        print(f"{name:<48} {codec:<8} {resolution:>10} {duration if duration is not None else '?':>9} "
+              f"{props.get('fps') or '?':>7} {props.get('size') or '?':>12}")
+    print(f"\n📊 {len(results)} files, {len(invalid)} invalid")
+    print("   Codecs: " + ", ".join(f"{k} {v}" for k, v in sorted(codecs.items(), key=lambda kv: -kv[1])))
+    print("   Resolutions: " + ", ".join(f"{k} {v}" for k, v in sorted(resolutions.items(), key=lambda kv: -kv[1])))
+    return invalid
+
+def find_video_files(paths):
+    """Video files among paths, searching directories recursively"""
+    video_files = []
+    for path in paths:
+        if os.path.isfile(path):
+            video_files.append(path)
+            continue
+        for directory, _, files in os.walk(path):
+            video_files.extend(os.path.join(directory, f) for f in files if f.lower().endswith(VIDEO_EXTENSIONS))
+    return video_files
 
 def analyze_video_content(file_path):
     """Analyze video content for duplicate detection testing"""
@@ -113,20 +221,44 @@ def get_duplicate_groups():
         ]
     }
 
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", help="video files or directories (default: diverse_video_test_files)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="ffprobe processes (default: one per CPU)")
+    parser.add_argument("--cache", help=f"probe cache file (default: {CACHE_FILE} in the first directory)")
+    parser.add_argument("--no-cache", action="store_true", help="probe every file again and keep no cache")
+    parser.add_argument("--table", action="store_true", help="always print the compact table")
+    return parser.parse_args()
+
+def validate_corpus(args):
+    """Table of every video under args.paths; exit status 1 if any is invalid"""
+    root = args.paths[0] if len(args.paths) == 1 and os.path.isdir(args.paths[0]) else None
+    video_files = find_video_files(args.paths)
+    if not video_files:
+        print("❌ No video files found")
+        return 1
+    cache_path = None if args.no_cache else args.cache or os.path.join(root or os.path.dirname(video_files[0]) or ".", CACHE_FILE)
+    started = time.time()
+    results, cached = probe_files(video_files, ProbeCache(cache_path), args.jobs)
+    invalid = print_table(results, root)
+    print(f"   Probed {len(video_files) - cached} files, {cached} from cache, in {time.time() - started:.1f}s")
+    return 1 if invalid else 0
+
 def main():
     """Test all video files in the diverse_video_test_files directory"""
+    args = parse_args()
+    if args.paths and (args.table or len(find_video_files(args.paths)) > DETAIL_LIMIT):
+        raise SystemExit(validate_corpus(args))
+
     print("=== Video File Playback Test for Duplicate Detection ===\n")
     
-    video_dir = "diverse_video_test_files"
+    video_dir = args.paths[0] if args.paths else "diverse_video_test_files"
     if not os.path.exists(video_dir):
         print(f"❌ Directory '{video_dir}' not found")
         print("Please run 'python create_diverse_video_test_files.py' first")
         return
     
-    video_files = []
-    for file in os.listdir(video_dir):
-        if file.lower().endswith(('.mp4', '.avi', '.mov', '.mkv', '.webm')):
-            video_files.append(os.path.join(video_dir, file))
+    video_files = find_video_files(args.paths or [video_dir])
     
     if not video_files:
         print("❌ No video files found")
@@ -136,9 +268,12 @@ def main():
     
     valid_count = 0
     video_properties = {}
+    cache_dir = video_dir if os.path.isdir(video_dir) else os.path.dirname(video_dir) or "."
+    cache_path = None if args.no_cache else args.cache or os.path.join(cache_dir, CACHE_FILE)
+    probed, _ = probe_files(video_files, ProbeCache(cache_path), args.jobs)
     
     for video_file in sorted(video_files):
-        is_valid, properties = test_video_file(video_file)
+        is_valid, properties = test_video_file(video_file, probed[video_file])
         if is_valid:
             valid_count += 1
             video_properties[os.path.basename(video_file)] = properties